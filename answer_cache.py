@@ -0,0 +1,514 @@
+"""
+Local answer cache for screening questions.
+Matches questions against known answers with a TF-IDF/cosine index, so recurring questions are answered without the LLM.
+"""
+
+import contextlib
+import contextvars
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Any, Iterable
+import numpy as np
+from page_snapshot import PageSnapshot, PageElement
+from form_filler import TYPED_ROLES, SELECT_ROLES, build_value_index
+from form_cache import iter_filled_values
+from user_context import USER_DETAILS
+from logger_setup import get_system_logger
+from config import Config
+
+logger = get_system_logger()
+
+# Phrases rewritten before tokenizing, so spelling variants share terms
+SYNONYMS = [
+    (r"\bu\.?s\.?a?\.?(?=\s|$|\?)|\bunited states( of america)?\b|\bamerica\b", "us"),
+    (r"\bu\.?k\.?(?=\s|$|\?)|\bunited kingdom\b|\bbritain\b", "uk"),
+    (r"\bk8s\b", "kubernetes"),
+    (r"\byrs?\b", "years"),
+    (r"\bsponsor(ed|ing)?\b", "sponsorship"),
+    (r"\b(legally )?(authori[sz]ed|eligible|permitted)\b", "authorized"),
+    (r"\brelocat(e|ion|ing)\b", "relocate"),
+    (r"\bremote(ly)?\b", "remote"),
+    (r"\bwork(ing|s)?\b", "work"),
+    (r"\b(open|comfortable|happy) (to|with)\b", "willing to"),
+    (r"\bbachelor'?s\b", "bachelors"),
+    (r"\bmaster'?s\b", "masters"),
+    (r"\bartificial intelligence\b", "ai"),
+    (r"\bmachine learning\b", "ml"),
+]
+
+STOPWORDS = {
+    "a", "an", "the", "do", "does", "you", "your", "are", "is", "be", "to", "in", "of", "for",
+    "with", "have", "has", "will", "would", "now", "or", "and", "any", "this", "that", "on",
+    "at", "we", "our", "please", "currently", "future", "able", "what", "which", "if",
+}
+
+# Questions that want a number, e.g. 'How many years of Python experience do you have?'
+NUMERIC_QUESTION = re.compile(r"\b(how many|how much|number of|years)\b", re.I)
+
+# Country codes used in screening_answers keys
+COUNTRY_NAMES = {"us": "the United States", "uk": "the United Kingdom", "india": "India", "eu": "the EU"}
+
+# Learned free-text answers longer than this are treated as posting-specific and not cached
+MAX_LEARNED_ANSWER_CHARS = 60
+
+# Application whose model answers are being staged (see staged_answers)
+_application = contextvars.ContextVar("answer_cache_application", default=None)
+
+@contextlib.contextmanager
+def staged_answers(app_id: Optional[str]):
+    """
+    Stage the model answers remembered within this context for an application.
+    
+    Staged answers are only stored once settle_answers() reports that the
+    application completed; answers remembered outside this context are dropped.
+    
+    Args:
+        app_id: Application ID the answers belong to
+    """
+    token = _application.set(app_id)
+    try:
+        yield
+    finally:
+        _application.reset(token)
+
+def normalize_question(text: str) -> str:
+    """Lowercase a question, drop required markers and punctuation, and apply SYNONYMS."""
+    text = re.sub(r"\((required|optional)\)|\*", " ", text.lower())
+    for pattern, replacement in SYNONYMS:
+        text = re.sub(pattern, replacement, text)
+    text = re.sub(r"[^a-z0-9+#.\s]|(?<![a-z0-9])\.|\.(?![a-z0-9])", " ", text)
+    return " ".join(text.split())
+
+def tokenize(text: str) -> List[str]:
+    """Content words of a normalized question, plus adjacent-word bigrams."""
+    words = [word for word in normalize_question(text).split() if word not in STOPWORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+def format_answer(value: Any) -> str:
+    """Render a screening_answers value the way a form expects it."""
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+def question_for_key(key: str) -> str:
+    """
+    Turn a screening_answers key into the question it answers.
+    
+    Args:
+        key: Key such as 'years_of_python_experience' or 'require_visa_sponsorship_us'
+    
+    Returns:
+        Question text, e.g. 'How many years of python experience do you have?'
+    """
+    words = key.split("_")
+    country = COUNTRY_NAMES.get(words[-1])
+    if key.startswith("years_of_") and key.endswith("_experience"):
+        return f"How many years of {' '.join(words[2:-1])} experience do you have?"
+    if key.startswith("experience_with_"):
+        return f"Do you have experience with {' '.join(words[2:])}?"
+    if key.startswith("authorized_to_work") and country:
+        return f"Are you authorized to work in {country}?"
+    if key.startswith("require_visa_sponsorship") and country:
+        return f"Will you require visa sponsorship to work in {country}?"
+    if key.startswith("have_"):
+        return f"Do you have a {' '.join(words[1:])}?"
+    if key == "comfortable_with_remote":
+        return "Are you comfortable working remotely?"
+    if key.startswith(("willing_to_", "comfortable_with_")):
+        return f"Are you {' '.join(words)}?"
+    return f"{' '.join(words).capitalize()}?"
+
+def match_option(answer: str, options: List[str]) -> Optional[str]:
+    """
+    Pick the dropdown option that expresses an answer.
+    
+    Args:
+        answer: Cached answer text
+        options: Option labels offered by the field
+    
+    Returns:
+        The matching option label, or None if no option fits
+    """
+    lowered = answer.strip().lower()
+    for option in options:
+        if option.strip().lower() == lowered:
+            return option
+    if lowered in ("yes", "no"):
+        for option in options:
+            if re.match(rf"^{lowered}\b", option.strip().lower()):
+                return option
+        return None
+    try:
+        number = float(lowered)
+    except ValueError:
+        return None
+    # Ranges such as '1-2 years', '3+', '5 or more', 'Less than 1 year'
+    for option in options:
+        text = option.lower()
+        bounds = [float(value) for value in re.findall(r"\d+(?:\.\d+)?", text)]
+        if not bounds:
+            continue
+        if "less than" in text or "under" in text:
+            matched = number < bounds[0]
+        elif "+" in text or "more" in text or "above" in text:
+            matched = number >= bounds[0]
+        elif len(bounds) >= 2:
+            matched = bounds[0] <= number <= bounds[1]
+        else:
+            matched = number == bounds[0]
+        if matched:
+            return option
+    return None
+
+class AnswerCache:
+    """
+    Screening answers indexed by TF-IDF vectors of their questions.
+    
+    Seed answers come from USER_DETAILS['screening_answers']; answers
+    approved by the user are saved to disk. Answers a model gives while an
+    application runs are staged and only saved, as learned answers, once
+    the application completes. Every answer carries a confidence, and a
+    lookup only succeeds when similarity times confidence reaches the
+    threshold.
+    """
+    
+    def __init__(self, cache_file: Optional[Path] = None, threshold: float = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_file: JSON file holding stored answers (defaults to Config.ANSWER_CACHE_FILE)
+            threshold: Minimum similarity x confidence for a hit (defaults to Config.ANSWER_CACHE_THRESHOLD)
+        """
+        self.cache_file = Path(cache_file or Config.ANSWER_CACHE_FILE)
+        self.threshold = threshold if threshold is not None else Config.ANSWER_CACHE_THRESHOLD
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._stored = self._load()
+        self._pending: Dict[str, List[Tuple[str, str]]] = {}
+        self._entries: List[Dict] = []
+        self._matrix = None
+        self._vocabulary: Dict[str, int] = {}
+        self._idf = None
+    
+    def _load(self) -> Dict[str, Dict]:
+        """Load stored answers keyed by normalized question."""
+        if not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading answer cache: {e}")
+            return {}
+    
+    def save(self):
+        """Write stored answers to disk atomically."""
+        try:
+            with self._lock:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix(".json.tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._stored, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.error(f"Error saving answer cache: {e}")
+    
+    def _seed_entries(self) -> List[Dict]:
+        """Answers derived from USER_DETAILS; re-read on every rebuild so edits take effect."""
+        entries = []
+        for key, value in (USER_DETAILS.get("screening_answers") or {}).items():
+            if value is None or value == "":
+                continue
+            entries.append({
+                "question": question_for_key(key),
+                "answer": format_answer(value),
+                "confidence": 1.0,
+                "source": "user_details",
+            })
+        return entries
+    
+    def _build_index(self):
+        """
+        (Re)build the TF-IDF matrix over seed and stored questions.
+        
+        A stored answer approved by the user replaces the seed answer for the
+        same normalized question; a learned one is dropped in its favour, so
+        the two never compete in a lookup.
+        """
+        seeds = {normalize_question(entry["question"]): entry for entry in self._seed_entries()}
+        stored = []
+        for key, entry in self._stored.items():
+            if key in seeds:
+                if entry["source"] != "approved":
+                    continue
+                del seeds[key]
+            stored.append(entry)
+        entries = list(seeds.values()) + stored
+        documents = [Counter(tokenize(entry["question"])) for entry in entries]
+        vocabulary: Dict[str, int] = {}
+        for document in documents:
+            for term in document:
+                vocabulary.setdefault(term, len(vocabulary))
+        
+        document_frequency = np.zeros(len(vocabulary))
+        for document in documents:
+            for term in document:
+                document_frequency[vocabulary[term]] += 1
+        idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+        
+        matrix = np.zeros((len(documents), len(vocabulary)))
+        for row, document in enumerate(documents):
+            for term, count in document.items():
+                matrix[row, vocabulary[term]] = (1 + math.log(count)) * idf[vocabulary[term]]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        
+        self._entries, self._vocabulary, self._idf, self._matrix = entries, vocabulary, idf, matrix
+    
+    def _vectorize(self, question: str):
+        """TF-IDF vector of a question plus its norm; unseen terms count towards the norm only."""
+        vector = np.zeros(len(self._vocabulary))
+        unseen_weight = math.log(1 + len(self._entries)) + 1
+        norm_squared = 0.0
+        for term, count in Counter(tokenize(question)).items():
+            index = self._vocabulary.get(term)
+            weight = (1 + math.log(count)) * (self._idf[index] if index is not None else unseen_weight)
+            if index is not None:
+                vector[index] = weight
+            norm_squared += weight * weight
+        return vector, math.sqrt(norm_squared)
+    
+    def lookup(self, question: str, options: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find a confident answer for a question.
+        
+        Candidates whose answer type does not fit the question (a Yes/No
+        answer to a 'how many years' question) or that match none of the
+        field's options are ignored. Two close candidates with different
+        answers count as ambiguous and return no answer.
+        
+        Args:
+            question: Question text as shown on the form
+            options: Option labels if the field is a dropdown
+        
+        Returns:
+            Dictionary with 'answer' (an option label when options are given),
+            'score', 'question' (the matched question) and 'source', or None
+        """
+        with self._lock:
+            if self._matrix is None:
+                self._build_index()
+            if not self._entries:
+                self.misses += 1
+                return None
+            vector, norm = self._vectorize(question)
+            scores = (self._matrix @ vector) / norm if norm else np.zeros(len(self._entries))
+            # Rank by similarity x confidence, the score the threshold and margin apply to
+            scores = scores * np.array([entry["confidence"] for entry in self._entries])
+        
+        wants_number = bool(NUMERIC_QUESTION.search(question))
+        candidates = []
+        for index in np.argsort(-scores, kind="stable")[:5]:
+            entry = self._entries[index]
+            is_number = re.fullmatch(r"\d+(\.\d+)?", entry["answer"]) is not None
+            if wants_number != is_number:
+                continue
+            answer = match_option(entry["answer"], options) if options else entry["answer"]
+            if answer is None:
+                continue
+            candidates.append((float(scores[index]), answer, entry))
+        
+        if not candidates or candidates[0][0] < self.threshold:
+            self.misses += 1
+            return None
+        score, answer, entry = candidates[0]
+        for other_score, other_answer, _entry in candidates[1:]:
+            if score - other_score < Config.ANSWER_CACHE_MARGIN and other_answer != answer:
+                logger.info(f"Ambiguous cached answers for '{question}': {answer} / {other_answer}")
+                self.misses += 1
+                return None
+        
+        self.hits += 1
+        return {"answer": answer, "score": round(score, 3), "question": entry["question"], "source": entry["source"]}
+    
+    def add(self, question: str, answer: str, confidence: float = 1.0, source: str = "approved"):
+        """
+        Store an answer for a question, replacing any earlier one.
+        
+        Args:
+            question: Question text
+            answer: Answer to give
+            confidence: Weight applied to the similarity score (1.0 for user-approved answers)
+            source: Where the answer came from (e.g. 'approved', 'learned')
+        """
+        key = normalize_question(question)
+        if not key or not answer.strip():
+            return
+        with self._lock:
+            existing = self._stored.get(key)
+            # A learned answer never overrides one the user approved or gave in USER_DETAILS
+            if existing and existing["confidence"] > confidence:
+                return
+            if source != "approved" and any(
+                normalize_question(entry["question"]) == key for entry in self._seed_entries()
+            ):
+                return
+            self._stored[key] = {
+                "question": question.strip(),
+                "answer": answer.strip(),
+                "confidence": confidence,
+                "source": source,
+                "updated_at": datetime.now().isoformat(),
+            }
+            self._matrix = None
+        self.save()
+    
+    def stage(self, app_id: str, question: str, answer: str):
+        """
+        Hold a model's answer until the application it was given for is settled.
+        
+        Args:
+            app_id: Application ID the answer belongs to
+            question: Question text
+            answer: Answer the model gave
+        """
+        with self._lock:
+            self._pending.setdefault(app_id, []).append((question, answer))
+    
+    def settle(self, app_id: str, completed: bool) -> int:
+        """
+        Store or discard the answers staged for an application.
+        
+        Args:
+            app_id: Application ID
+            completed: True if the application completed, so its answers were accepted
+        
+        Returns:
+            Number of answers stored
+        """
+        with self._lock:
+            pending = self._pending.pop(app_id, [])
+        if not completed:
+            return 0
+        for question, answer in pending:
+            self.add(question, answer, Config.ANSWER_CACHE_LEARNED_CONFIDENCE, source="learned")
+        return len(pending)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return answer counts and hit/miss statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "seeded": len(self._seed_entries()),
+            "stored": len(self._stored),
+            "pending": sum(len(answers) for answers in self._pending.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+_answer_cache: Optional[AnswerCache] = None
+
+def get_answer_cache() -> AnswerCache:
+    """Get the shared answer cache."""
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = AnswerCache()
+    return _answer_cache
+
+def plan_cached_answers(
+    snapshot: PageSnapshot,
+    fields: List[PageElement]
+) -> Tuple[List[Tuple[PageElement, str]], List[PageElement]]:
+    """
+    Answer empty question fields from the answer cache.
+    
+    Args:
+        snapshot: Snapshot the fields come from (for dropdown options)
+        fields: Fields not yet planned by the form cache or a playbook
+    
+    Returns:
+        Tuple of ((field, answer) pairs, fields left unanswered)
+    """
+    cache = get_answer_cache()
+    plan, leftover = [], []
+    for field in fields:
+        match = None
+        if field.label and not field.is_filled and field.role in TYPED_ROLES | SELECT_ROLES:
+            options = snapshot.options_for(field) if field.role in SELECT_ROLES else None
+            match = cache.lookup(field.label, options)
+        if match:
+            logger.info(f"Cached answer for '{field.label}': {match['answer']} (score {match['score']})")
+            plan.append((field, match["answer"]))
+        else:
+            leftover.append(field)
+    return plan, leftover
+
+def remember_answers(answers: Iterable[Tuple[PageElement, str]]) -> int:
+    """
+    Stage answers given to question fields by a model for the current application.
+    
+    Values that equal a known user value are left to the form cache, and long
+    free-text answers are skipped as posting-specific. Dropdown choices
+    starting with Yes/No are stored as plain Yes/No so they fit other forms.
+    Nothing is stored until settle_answers() is called for the application
+    set by staged_answers().
+    
+    Args:
+        answers: (field, value) pairs
+    
+    Returns:
+        Number of answers staged
+    """
+    app_id = _application.get()
+    if app_id is None:
+        return 0
+    cache = get_answer_cache()
+    value_index = build_value_index()
+    learned = 0
+    for field, value in answers:
+        if not field.label or value.lower() in value_index or len(value) > MAX_LEARNED_ANSWER_CHARS:
+            continue
+        yes_no = re.match(r"^(yes|no)\b", value, re.I)
+        answer = yes_no.group(1).capitalize() if yes_no and field.role in SELECT_ROLES else value
+        cache.stage(app_id, field.label, answer)
+        learned += 1
+    return learned
+
+def learn_answers(fields: List[PageElement], steps: List[Tuple[Any, Any]]) -> int:
+    """
+    Stage the agent's answers to question fields it filled (see remember_answers).
+    
+    Args:
+        fields: Fields the agent was left to fill
+        steps: (AgentAction, observation) pairs from the agent run
+    
+    Returns:
+        Number of answers staged
+    """
+    return remember_answers(iter_filled_values(fields, steps))
+
+def settle_answers(app_id: str, completed: bool) -> int:
+    """
+    Store the answers staged for an application if it completed, otherwise drop them.
+    
+    Args:
+        app_id: Application ID
+        completed: True if the application reached COMPLETED
+    
+    Returns:
+        Number of answers stored
+    """
+    stored = get_answer_cache().settle(app_id, completed)
+    if stored:
+        logger.info(f"Stored {stored} screening answers from completed application {app_id}")
+    return stored
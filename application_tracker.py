@@ -3,13 +3,16 @@ Application tracking module for managing job application state and history.
 Tracks application status, prevents duplicates, and maintains history.
 """
 
-import json
+from collections import Counter
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Iterator
 from pathlib import Path
 from logger_setup import get_application_logger
 from config import Config
+from tracker_storage import StorageBackend, create_backend, completion_day
+from job_identity import canonicalize_job_url
+from metrics import APPLICATION_OUTCOMES, APPLICATION_DURATION
 
 logger = get_application_logger()
 
@@ -21,40 +24,47 @@ class ApplicationStatus(Enum):
     FAILED = "failed"
     REQUIRES_MANUAL = "requires_manual"
 
+# Statuses that end an application attempt
+FINAL_STATUSES = {ApplicationStatus.COMPLETED, ApplicationStatus.FAILED, ApplicationStatus.REQUIRES_MANUAL}
+
 class ApplicationTracker:
     """Tracks job applications and maintains history."""
     
-    def __init__(self, history_file: Optional[Path] = None):
+    def __init__(
+        self,
+        history_file: Optional[Path] = None,
+        storage: Optional[StorageBackend] = None
+    ):
         """
         Initialize the application tracker.
         
         Args:
             history_file: Path to the history file (defaults to Config.APPLICATION_HISTORY_FILE)
+            storage: Storage backend (defaults to the one selected by Config.TRACKER_BACKEND)
         """
-        self.history_file = history_file or Config.APPLICATION_HISTORY_FILE
-        self.applications = self._load_history()
-    
-    def _load_history(self) -> Dict:
-        """Load application history from file."""
-        if self.history_file.exists():
-            try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    logger.info(f"Loaded {len(data)} applications from history")
-                    return data
-            except Exception as e:
-                logger.error(f"Error loading history: {e}")
-                return {}
-        return {}
-    
-    def _save_history(self):
-        """Save application history to file."""
-        try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.applications, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved {len(self.applications)} applications to history")
-        except Exception as e:
-            logger.error(f"Error saving history: {e}")
+        self.history_file = Path(history_file or Config.APPLICATION_HISTORY_FILE)
+        self.storage = storage or create_backend(history_file=self.history_file)
+        # Batch workers share the tracker as tasks on one event loop, and no method
+        # here awaits, so each update runs to completion without a lock
+        self._rebuild_statistics()
+    
+    def _rebuild_statistics(self):
+        """Load the running aggregates from the storage backend."""
+        totals = self.storage.aggregate(ApplicationStatus.COMPLETED.value)
+        self._status_counts = Counter(totals["by_status"])
+        self._company_counts = Counter(totals["by_company"])
+        self._started_by_day = Counter(totals["started_by_day"])
+        self._completed_by_day = Counter(totals["completed_by_day"])
+        self._total_attempts = totals["total_attempts"]
+    
+    def _count_application(self, app: Dict, sign: int):
+        """Add (sign=1) or remove (sign=-1) a record's contribution to the aggregates."""
+        self._status_counts[app["status"]] += sign
+        self._company_counts[app.get("company", "")] += sign
+        self._started_by_day[(app.get("created_at") or "")[:10]] += sign
+        if app["status"] == ApplicationStatus.COMPLETED.value:
+            self._completed_by_day[completion_day(app)] += sign
+        self._total_attempts += sign * app.get("attempts", 0)
     
     def add_application(
         self,
@@ -77,33 +87,41 @@ class ApplicationTracker:
         Returns:
             Application ID
         """
+        job_key = canonicalize_job_url(url)
         app_id = self._generate_app_id(url)
         
         # Check for duplicates if enabled
-        if Config.PREVENT_DUPLICATE_APPLICATIONS and app_id in self.applications:
-            existing = self.applications[app_id]
+        existing = self.storage.find_by_job_key(job_key) if Config.PREVENT_DUPLICATE_APPLICATIONS else None
+        if existing:
             logger.warning(f"Duplicate application detected: {company} - {position}")
             logger.warning(f"Previous application on {existing['created_at']} with status {existing['status']}")
-            return app_id
+            return existing["id"]
         
         application = {
             "id": app_id,
             "url": url,
+            "job_key": job_key,
             "company": company,
             "position": position,
             "status": status.value,
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
+            "completed_at": datetime.now().isoformat() if status == ApplicationStatus.COMPLETED else None,
             "metadata": metadata or {},
             "attempts": 0,
             "errors": []
         }
         
-        self.applications[app_id] = application
+        # Without duplicate prevention the new record replaces the old one
+        if not Config.PREVENT_DUPLICATE_APPLICATIONS:
+            replaced = self.storage.get(app_id)
+            if replaced:
+                self._count_application(replaced, -1)
         
-        if Config.AUTO_SAVE_PROGRESS:
-            self._save_history()
+        self.storage.put(application)
+        self._count_application(application, 1)
         
+        APPLICATION_OUTCOMES.inc(status.value)
         logger.info(f"Added application: {company} - {position} (ID: {app_id})")
         return app_id
     
@@ -121,14 +139,18 @@ class ApplicationTracker:
             status: New status
             error_info: Error information if status is FAILED
         """
-        if app_id not in self.applications:
+        app = self.storage.get(app_id)
+        if app is None:
             logger.error(f"Application {app_id} not found")
             return
         
-        app = self.applications[app_id]
+        self._count_application(app, -1)
         old_status = app["status"]
         app["status"] = status.value
         app["updated_at"] = datetime.now().isoformat()
+        # Set once, so later metadata or attempt updates keep the completion day
+        if status == ApplicationStatus.COMPLETED and not app.get("completed_at"):
+            app["completed_at"] = app["updated_at"]
         
         if error_info:
             app["errors"].append({
@@ -136,48 +158,94 @@ class ApplicationTracker:
                 "error": error_info
             })
         
-        if Config.AUTO_SAVE_PROGRESS:
-            self._save_history()
+        self.storage.put(app)
+        self._count_application(app, 1)
         
+        APPLICATION_OUTCOMES.inc(status.value)
+        if status in FINAL_STATUSES:
+            started = datetime.fromisoformat(app["created_at"])
+            APPLICATION_DURATION.observe((datetime.now() - started).total_seconds())
         logger.info(f"Updated application {app_id}: {old_status} -> {status.value}")
     
     def increment_attempts(self, app_id: str):
         """Increment the number of attempts for an application."""
-        if app_id in self.applications:
-            self.applications[app_id]["attempts"] += 1
-            self.applications[app_id]["updated_at"] = datetime.now().isoformat()
-            
-            if Config.AUTO_SAVE_PROGRESS:
-                self._save_history()
+        app = self.storage.get(app_id)
+        if app is not None:
+            app["attempts"] += 1
+            app["updated_at"] = datetime.now().isoformat()
+            self.storage.put(app)
+            self._total_attempts += 1
+    
+    def update_metadata(self, app_id: str, updates: Dict):
+        """
+        Merge values into an application's metadata.
+        
+        Args:
+            app_id: Application ID
+            updates: Keys to set in the metadata dictionary
+        """
+        app = self.storage.get(app_id)
+        if app is None:
+            logger.error(f"Application {app_id} not found")
+            return
+        app.setdefault("metadata", {}).update(updates)
+        app["updated_at"] = datetime.now().isoformat()
+        self.storage.put(app)
     
     def get_application(self, app_id: str) -> Optional[Dict]:
         """Get application by ID."""
-        return self.applications.get(app_id)
+        return self.storage.get(app_id)
     
     def get_applications_by_status(self, status: ApplicationStatus) -> List[Dict]:
         """Get all applications with a specific status."""
-        return [
-            app for app in self.applications.values()
-            if app["status"] == status.value
-        ]
+        return self.storage.find_by_status(status.value)
+    
+    def iter_applications(self) -> Iterator[Dict]:
+        """Iterate over all application records."""
+        return self.storage.iter_all()
+    
+    def find_duplicate(self, url: str) -> Optional[Dict]:
+        """
+        Find an existing application for the same job as a URL.
+        
+        URLs are compared by canonical job key, so tracking parameters,
+        locales and apply-page variants of a posting all match.
+        
+        Args:
+            url: Job application URL
+        
+        Returns:
+            The existing application record, or None
+        """
+        return self.storage.find_by_job_key(canonicalize_job_url(url))
     
     def is_duplicate(self, url: str) -> bool:
         """Check if an application URL has already been applied to."""
-        app_id = self._generate_app_id(url)
-        return app_id in self.applications
+        return self.find_duplicate(url) is not None
     
     def get_statistics(self) -> Dict:
-        """Get application statistics."""
-        stats = {
-            "total": len(self.applications),
-            "by_status": {}
-        }
+        """
+        Get application statistics.
         
-        for status in ApplicationStatus:
-            count = len(self.get_applications_by_status(status))
-            stats["by_status"][status.value] = count
+        Aggregates are maintained incrementally on every mutation, so this
+        does not touch the stored history.
         
-        return stats
+        Returns:
+            Dictionary with total, by_status, by_company, started_by_day,
+            completed_by_day and mean_attempts
+        """
+        total = sum(self._status_counts.values())
+        return {
+            "total": total,
+            "by_status": {
+                status.value: self._status_counts[status.value]
+                for status in ApplicationStatus
+            },
+            "by_company": {k: v for k, v in self._company_counts.items() if v > 0},
+            "started_by_day": {k: v for k, v in self._started_by_day.items() if v > 0},
+            "completed_by_day": {k: v for k, v in self._completed_by_day.items() if v > 0},
+            "mean_attempts": round(self._total_attempts / total, 2) if total else 0.0
+        }
     
     def export_to_csv(self, output_file: Path):
         """Export applications to CSV file."""
@@ -185,7 +253,7 @@ class ApplicationTracker:
         
         try:
             with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                if not self.applications:
+                if not self.storage.count():
                     return
                 
                 fieldnames = ["id", "company", "position", "url", "status", 
@@ -193,19 +261,25 @@ class ApplicationTracker:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 
                 writer.writeheader()
-                for app in self.applications.values():
+                exported = 0
+                for app in self.storage.iter_all():
                     row = {k: app.get(k, "") for k in fieldnames}
                     writer.writerow(row)
+                    exported += 1
             
-            logger.info(f"Exported {len(self.applications)} applications to {output_file}")
+            logger.info(f"Exported {exported} applications to {output_file}")
         except Exception as e:
             logger.error(f"Error exporting to CSV: {e}")
     
     def _generate_app_id(self, url: str) -> str:
-        """Generate a unique application ID from URL."""
+        """Generate a unique application ID from the URL's canonical job key."""
         import hashlib
-        return hashlib.md5(url.encode()).hexdigest()[:12]
+        return hashlib.md5(canonicalize_job_url(url).encode()).hexdigest()[:12]
     
     def save(self):
         """Manually save the current state."""
-        self._save_history()
+        self.storage.flush()
+    
+    def close(self):
+        """Save and release the storage backend."""
+        self.storage.close()
@@ -1,25 +1,53 @@
+import time
+
+STARTUP_STARTED = time.perf_counter()
+
 import asyncio
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+import argparse
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Optional, Dict, List, Iterable, Callable, Tuple, TYPE_CHECKING
 
-from langchain_community.chat_models import ChatOCIGenAI
-from langchain.agents import AgentExecutor, create_tool_calling_agent
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_mcp_adapters.tools import load_mcp_tools
+# The MCP client, LangChain agent and OCI model modules are imported where
+# they are used (see preload_agent_modules), so the CLI starts quickly
+if TYPE_CHECKING:
+    from mcp import StdioServerParameters
+    from langchain.agents import AgentExecutor
 
 # Import new modules
-from prompts import get_system_prompt
+from prompts import get_system_prompt, get_prompt_token_report
+from phase_detector import detect_phase
+from job_identity import detect_platform, infer_job_details
+from job_queue import DUPLICATE_POLICIES, iter_jsonl_jobs, check_duplicate, ResultWriter
+from page_snapshot import PageSnapshot
+from form_filler import open_page
+from token_counter import estimate_tokens
+from prefill import PrefillResult, prefill_application, record_agent_steps
+from snapshot_compressor import get_compression_stats
+from scratchpad import build_scratchpad, get_scratchpad_stats
+from tool_selector import get_tool_subset_stats
+from model_router import ModelRouter, get_routing_stats
+from screening import create_screening_tool, get_screening_stats
+from metrics import start_metrics_server, stop_metrics_server
+from profiler import ApplicationProfile, ProfilingCallbackHandler, summarize_profiles, print_profile_report
+from form_cache import get_form_cache
+from answer_cache import get_answer_cache, staged_answers, settle_answers
+from resume_parser import get_resume_profile
+from outcome_detector import OutcomeDetector
+from checkpoint import Checkpointer, load_checkpoint, clear_checkpoint, resume_application, CHECKPOINT_KEY
 from application_tracker import ApplicationTracker, ApplicationStatus
 from error_handler import (
     ApplicationError, CaptchaError, AuthenticationError,
-    handle_error, is_retryable_error
+    handle_error, is_retryable_error, retry_async
 )
-from logger_setup import get_application_logger, get_system_logger
+from logger_setup import get_application_logger, get_system_logger, truncate_for_log
 from config import Config
 
 # Import user context
 try:
-    from user_context import USER_DETAILS
+    from user_context import USER_DETAILS, validate_user_details
 except ImportError:
     print("Error: user_context.py not found. Please create it with your details.")
     exit(1)
@@ -28,56 +56,620 @@ except ImportError:
 app_logger = get_application_logger()
 sys_logger = get_system_logger()
 
+def initialize():
+    """Run the one-time startup work: create data directories, check user details and parse the resume."""
+    Config.ensure_directories()
+    validate_user_details()
+    # Parses the resume on first use or after it changed; otherwise a cache lookup
+    if Config.RESUME_PARSING_ENABLED and get_resume_profile() is None:
+        sys_logger.warning(f"Resume could not be parsed, continuing without it: {USER_DETAILS.get('resume_path')}")
+
+def preload_agent_modules():
+    """
+    Import the heavy agent dependencies.
+    
+    Called in a worker thread while the MCP server starts, so the imports
+    overlap with the server's own startup instead of delaying it.
+    """
+    import langchain_community.chat_models.oci_generative_ai  # noqa: F401
+    import langchain.agents  # noqa: F401
+    import langchain.agents.format_scratchpad.tools  # noqa: F401
+    import langchain.agents.output_parsers.tools  # noqa: F401
+    import langchain_mcp_adapters.tools  # noqa: F401
+
+def log_startup_report(phases: Dict[str, float]):
+    """Log and print how long each startup phase took, ending at the ready prompt."""
+    total = time.perf_counter() - STARTUP_STARTED
+    breakdown = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in phases.items())
+    sys_logger.info(f"Startup took {total:.2f}s ({breakdown})")
+    print(f"⏱️  Ready in {total:.2f}s ({breakdown})")
+
+def get_server_params() -> "StdioServerParameters":
+    """Return the stdio parameters used to launch the pinned Browser MCP server."""
+    from mcp import StdioServerParameters
+    
+    command, args = Config.get_mcp_server_command()
+    return StdioServerParameters(command=command, args=args)
+
+def create_llm(model_id: Optional[str] = None):
+    """
+    Create a chat model for the agent.
+    
+    Args:
+        model_id: OCI model ID (defaults to Config.LLM_MODEL_ID)
+    
+    Returns:
+        ChatOCIGenAI instance
+    """
+    from langchain_community.chat_models.oci_generative_ai import ChatOCIGenAI
+    
+    cache_options = {}
+    if Config.LLM_CACHE_ENABLED:
+        from llm_cache import get_llm_cache
+        # Streamed calls bypass LangChain's cache, so tool-calling turns are made as single calls
+        cache_options = {"cache": get_llm_cache(), "disable_streaming": "tool_calling"}
+    
+    return ChatOCIGenAI(
+        auth_type="API_KEY",
+        compartment_id="ocid1.tenancy.oc1..aaaaaaaahqvb2kliqi35z57qalhpr4dyqbjprclszdcoar2wgc7q6nl36aba",
+        service_endpoint="https://inference.generativeai.us-chicago-1.oci.oraclecloud.com",
+        model_id=model_id or Config.LLM_MODEL_ID,
+        **cache_options
+    )
+
+def llm_cache_turns():
+    """Context for one attempt's model calls; a failing turn's cached response is evicted (see llm_cache)."""
+    if not Config.LLM_CACHE_ENABLED:
+        return contextlib.nullcontext()
+    from llm_cache import get_llm_cache
+    return get_llm_cache().track_turns()
+
+def create_strong_llm():
+    """Create the stronger chat model for routed turns, or None when model routing is off."""
+    if not Config.MODEL_ROUTING_ENABLED:
+        return None
+    return create_llm(Config.STRONG_LLM_MODEL_ID)
+
+def select_system_prompt(platform: Optional[str], intermediate_steps: List, phase: Optional[str] = None) -> str:
+    """Pick the system prompt for the next LLM turn from the platform and current phase."""
+    phase = phase or detect_phase(intermediate_steps)
+    system_prompt = get_system_prompt(mode="application", platform=platform, phase=phase)
+    sys_logger.debug(
+        f"Prompt for step {len(intermediate_steps) + 1}: platform={platform}, "
+        f"phase={phase}, ~{estimate_tokens(system_prompt)} tokens"
+    )
+    return system_prompt
+
+def create_agent_executor(
+    llm,
+    tools,
+    verbose: bool = True,
+    platform: Optional[str] = None,
+    history: Optional[List] = None,
+    strong_llm=None
+) -> "AgentExecutor":
+    """
+    Build a tool-calling agent executor over the given browser tools.
+    
+    The system prompt and the bound tools are re-selected on every turn so
+    they only carry the guidance for the job's ATS platform and the tools
+    for the current application phase. The executor itself keeps every tool,
+    so a call to a tool outside the phase's subset still runs. With a strong
+    model, each turn is also routed to the fast or the strong model. The
+    screening tool answers a page's open questions in one batched call.
+    
+    Args:
+        llm: Chat model that supports tool binding
+        tools: LangChain tools loaded from the MCP session
+        verbose: Whether the executor prints its own trace
+        platform: ATS platform of the job (see job_identity.detect_platform)
+        history: Steps restored from a checkpoint, placed before the executor's own steps
+        strong_llm: Optional stronger chat model for screening, unmapped fields and recovery turns
+    
+    Returns:
+        Configured AgentExecutor instance
+    """
+    from langchain.agents import AgentExecutor
+    from langchain.agents.output_parsers.tools import ToolsAgentOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+    
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "{system_prompt}"),
+        ("human", "{input}"),
+        ("placeholder", "{agent_scratchpad}"),
+    ])
+    
+    history = list(history or [])
+    if Config.SCREENING_BATCH_ENABLED:
+        tools = list(tools) + [create_screening_tool(tools, strong_llm or llm)]
+    router = ModelRouter(llm, tools, strong_llm)
+    
+    # Same pipeline as create_tool_calling_agent, plus a per-turn system prompt, model and tool subset
+    agent = (
+        RunnablePassthrough.assign(phase=lambda x: detect_phase(history + x["intermediate_steps"]))
+        | RunnablePassthrough.assign(
+            agent_scratchpad=lambda x: build_scratchpad(history + x["intermediate_steps"]),
+            system_prompt=lambda x: select_system_prompt(platform, history + x["intermediate_steps"], x["phase"]),
+        )
+        | RunnableLambda(lambda x: prompt | router.model_for(x["phase"], history + x["intermediate_steps"]))
+        | ToolsAgentOutputParser()
+    )
+    return AgentExecutor(
+        agent=agent, 
+        tools=tools, 
+        verbose=verbose,
+        max_iterations=15,
+        handle_parsing_errors=True
+    )
+
+async def stream_agent(
+    agent_executor: "AgentExecutor",
+    user_input: str,
+    prefix: str = "",
+    steps: Optional[List] = None,
+    callbacks: Optional[List] = None,
+    on_step: Optional[Callable[[List], None]] = None,
+    detector: Optional[OutcomeDetector] = None
+) -> Optional[str]:
+    """
+    Run the agent on one input, echoing progress as tools execute.
+    
+    With a detector, the run stops as soon as a tool result shows a
+    confirmation page, CAPTCHA or sign-in wall, without another LLM turn.
+    
+    Args:
+        agent_executor: Executor to run
+        user_input: Input passed to the agent
+        prefix: Label prepended to progress lines (e.g. the batch worker name)
+        steps: Optional list that collects (AgentAction, observation) pairs
+        callbacks: Optional callback handlers for the run (e.g. profiling)
+        on_step: Called with the collected steps after each completed step
+            (e.g. to checkpoint them); requires steps
+        detector: Optional outcome detector that ends the run early
+    
+    Returns:
+        The agent's final output, if any
+    
+    Raises:
+        CaptchaError: If the detector finds a CAPTCHA challenge
+        AuthenticationError: If the detector finds a sign-in wall
+    """
+    output = None
+    config = {"callbacks": callbacks} if callbacks else None
+    stream = agent_executor.astream({"input": user_input}, config=config)
+    async with contextlib.aclosing(stream):
+        async for chunk in stream:
+            if "actions" in chunk:
+                for action in chunk["actions"]:
+                    print(f"{prefix}⚙️  Executing: {action.tool}")
+                    app_logger.info(f"{prefix}Tool: {action.tool}, Input: {truncate_for_log(action.tool_input)}")
+            
+            elif "steps" in chunk:
+                for step in chunk["steps"]:
+                    print(f"{prefix}✅ Completed: {step.action.tool}")
+                    if steps is not None:
+                        steps.append((step.action, step.observation))
+                        if on_step:
+                            on_step(steps)
+                    if detector and detector.check(step.observation, step.action):
+                        break
+                if detector and detector.outcome:
+                    break
+            
+            elif "output" in chunk:
+                output = chunk["output"]
+                print(f"\n{prefix}🤖 Agent: {output}\n")
+                app_logger.info(f"{prefix}Agent output: {truncate_for_log(output)}")
+    
+    if detector and detector.outcome:
+        app_logger.info(f"{prefix}Stopped early ({detector.outcome}): {detector.describe()}")
+        error = detector.error()
+        if error is not None:
+            raise error
+        output = detector.describe()
+        print(f"\n{prefix}🏁 {output}\n")
+    return output
+
+def load_batch_file(path: Path) -> List[Dict]:
+    """
+    Read batch jobs from a text file.
+    
+    Each non-empty line holds a URL, optionally followed by a tab-separated
+    company name and position. Lines starting with '#' are ignored.
+    
+    Args:
+        path: Path to the batch file
+    
+    Returns:
+        List of job dictionaries with url, company and position keys
+    """
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = [part.strip() for part in line.split('\t')]
+            jobs.append({
+                "url": parts[0],
+                "company": parts[1] if len(parts) > 1 and parts[1] else "Unknown Company",
+                "position": parts[2] if len(parts) > 2 and parts[2] else "Unknown Position",
+            })
+    return jobs
+
+def load_jobs(path: Path) -> Iterable[Dict]:
+    """Stream jobs from a .jsonl file, or read a plain batch file (see load_batch_file)."""
+    if path.suffix.lower() == ".jsonl":
+        return iter_jsonl_jobs(path)
+    return load_batch_file(path)
+
+async def resolve_job_details(tools, job: Dict) -> Tuple[Dict, Optional[PageSnapshot]]:
+    """
+    Fill in a job's missing company and position from its page.
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        job: Job dictionary whose company or position is missing
+    
+    Returns:
+        Tuple of (completed job dictionary, snapshot of the opened page or None)
+    """
+    try:
+        snapshot = await open_page(tools, job["url"])
+    except Exception as e:
+        sys_logger.warning(f"Could not open {job['url']} to infer job details: {e}")
+        snapshot = None
+    company, position = infer_job_details(snapshot.title if snapshot else "", job["url"])
+    resolved = {
+        **job,
+        "company": job.get("company") or company or "Unknown Company",
+        "position": job.get("position") or position or "Unknown Position",
+    }
+    app_logger.info(f"Inferred job details for {job['url']}: {resolved['company']} - {resolved['position']}")
+    return resolved, snapshot
+
+def build_batch_input(job: Dict, prefill: Optional[PrefillResult] = None) -> str:
+    """Build the agent input for an unattended batch application."""
+    instruction = (
+        "Fill out the application completely and submit it without waiting for confirmation."
+        if Config.BATCH_AUTO_SUBMIT else
+        "Fill out the application completely but do not submit it; report when it is ready for review."
+    )
+    return (
+        f"Apply to this job: {job['url']}\n"
+        f"Company: {job['company']}\n"
+        f"Position: {job['position']}\n"
+        f"This is an unattended batch run with no user available. {instruction}"
+        + (f"\n{prefill.describe()}" if prefill else "")
+    )
+
+async def _run_batch_job(
+    llm,
+    tools,
+    tracker: ApplicationTracker,
+    job: Dict,
+    prefix: str,
+    opened: Optional[PageSnapshot] = None,
+    resume_from: Optional[str] = None,
+    strong_llm=None
+) -> Tuple[ApplicationStatus, str]:
+    """
+    Apply to a single job inside a batch worker and record the outcome.
+    
+    Every completed agent step is checkpointed, so a retry continues from
+    the last page reached with the earlier steps restored.
+    
+    Args:
+        resume_from: ID of an earlier failed application for the same job
+            whose checkpoint the first attempt continues from
+        strong_llm: Optional stronger chat model for routed turns
+    
+    Returns:
+        Tuple of (final status, application ID)
+    """
+    app_id = tracker.add_application(
+        url=job["url"],
+        company=job["company"],
+        position=job["position"],
+        status=ApplicationStatus.IN_PROGRESS
+    )
+    app_logger.info(f"{prefix}Starting application: {job['company']} - {job['position']}")
+    
+    earlier = load_checkpoint(tracker, resume_from) if resume_from and Config.CHECKPOINTS_ENABLED else None
+    if earlier:
+        tracker.update_metadata(app_id, {CHECKPOINT_KEY: earlier})
+    
+    steps = []
+    attempt = 0
+    detector = OutcomeDetector() if Config.OUTCOME_DETECTION_ENABLED else None
+    profile = ApplicationProfile(detect_platform(job["url"]))
+    callbacks = [ProfilingCallbackHandler(profile)]
+    
+    async def run_application():
+        nonlocal opened, attempt
+        attempt += 1
+        with llm_cache_turns():
+            tracker.increment_attempts(app_id)
+            steps.clear()
+            started = time.monotonic()
+            # Continue from the last checkpointed page, if any; otherwise the page
+            # opened to infer job details is only current on the first attempt
+            history, resumed, resume_note = await resume_application(tools, tracker, app_id)
+            url = resumed.url if resumed and resumed.url else job["url"]
+            prefill = await prefill_application(tools, url, profile.platform, resumed or opened, strong_llm or llm)
+            opened = None
+            profile.prefill_seconds += time.monotonic() - started
+            
+            agent_executor = create_agent_executor(
+                llm, tools, verbose=False, platform=profile.platform, history=history, strong_llm=strong_llm
+            )
+            agent_input = build_batch_input(job, prefill) + (f"\n{resume_note}" if resume_note else "")
+            checkpointer = Checkpointer(tracker, app_id, history, attempt) if Config.CHECKPOINTS_ENABLED else None
+            try:
+                output = await stream_agent(
+                    agent_executor, agent_input, prefix, steps, callbacks,
+                    checkpointer.on_step if checkpointer else None, detector
+                )
+            except (Exception, asyncio.CancelledError):
+                # Keep the steps not yet checkpointed for the retry or a later resume,
+                # also when the time budget cancels the attempt
+                if checkpointer:
+                    checkpointer.flush()
+                raise
+            record_agent_steps(prefill, steps)
+            return output
+    
+    try:
+        with staged_answers(app_id):
+            await retry_async(
+                run_application,
+                time_budget=Config.APPLICATION_TIME_BUDGET,
+                domain=urlsplit(job["url"]).hostname,
+                on_wait=profile.add_wait
+            )
+        if detector and detector.status:
+            status = detector.status
+        else:
+            status = (
+                ApplicationStatus.COMPLETED if Config.BATCH_AUTO_SUBMIT
+                else ApplicationStatus.REQUIRES_MANUAL
+            )
+        tracker.update_status(app_id, status)
+        clear_checkpoint(tracker, app_id)
+    
+    except (CaptchaError, AuthenticationError) as e:
+        status = ApplicationStatus.REQUIRES_MANUAL
+        tracker.update_status(app_id, status, handle_error(e, f"{prefix}Batch application"))
+    
+    except Exception as e:
+        status = ApplicationStatus.FAILED
+        tracker.update_status(app_id, status, handle_error(e, f"{prefix}Batch application"))
+    
+    if Config.ANSWER_CACHE_ENABLED:
+        # The model's answers are only trusted once the application went through
+        settle_answers(app_id, status == ApplicationStatus.COMPLETED)
+    tracker.update_metadata(app_id, {"profile": profile.to_dict()})
+    app_logger.info(f"{prefix}Application {app_id} finished with status {status.value}")
+    return status, app_id
+
+def build_job_result(job: Dict, status: str, app_id: Optional[str], tracker: ApplicationTracker, started: float) -> Dict:
+    """Build the result record reported for one batch job."""
+    result = {
+        "url": job["url"],
+        "company": job.get("company"),
+        "position": job.get("position"),
+        "status": status,
+        "app_id": app_id,
+        "seconds": round(time.monotonic() - started, 1),
+    }
+    if "line" in job:
+        result["line"] = job["line"]
+    app = tracker.get_application(app_id) if app_id and status != "skipped" else None
+    if app and app["errors"] and status != ApplicationStatus.COMPLETED.value:
+        result["error"] = app["errors"][-1]["error"].get("message")
+    return result
+
+async def _batch_worker(
+    worker_id: int,
+    queue: asyncio.Queue,
+    tracker: ApplicationTracker,
+    llm,
+    results: Dict[str, int],
+    server_params: Optional["StdioServerParameters"] = None,
+    duplicate_policy: str = "skip",
+    on_result: Optional[Callable[[Dict], None]] = None,
+    strong_llm=None
+):
+    """Consume jobs from the queue using a dedicated MCP session and agent, until a None sentinel."""
+    from mcp import ClientSession
+    from mcp.client.stdio import stdio_client
+    from langchain_mcp_adapters.tools import load_mcp_tools
+    
+    prefix = f"[worker {worker_id}] "
+    
+    async with stdio_client(server_params or get_server_params()) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            tools = await load_mcp_tools(session)
+            sys_logger.info(f"{prefix}MCP session initialized with {len(tools)} tools")
+            
+            while True:
+                job = await queue.get()
+                if job is None:
+                    break
+                
+                started = time.monotonic()
+                apply, existing = check_duplicate(tracker, job["url"], duplicate_policy)
+                if not apply:
+                    print(f"{prefix}⏭️  Skipping duplicate: {job['url']}")
+                    results["skipped"] += 1
+                    if on_result:
+                        on_result(build_job_result(job, "skipped", existing["id"], tracker, started))
+                    continue
+                
+                opened = None
+                if not job.get("company") or not job.get("position"):
+                    job, opened = await resolve_job_details(tools, job)
+                
+                # A failed earlier attempt is continued from its checkpoint
+                resume_from = existing["id"] if existing and existing["status"] == ApplicationStatus.FAILED.value else None
+                print(f"{prefix}🚀 Applying: {job['company']} - {job['position']} ({job['url']})")
+                status, app_id = await _run_batch_job(llm, tools, tracker, job, prefix, opened, resume_from, strong_llm)
+                results[status.value] += 1
+                print(f"{prefix}🏁 {job['url']} -> {status.value}")
+                if on_result:
+                    on_result(build_job_result(job, status.value, app_id, tracker, started))
+
+async def run_batch(
+    jobs: Iterable[Dict],
+    tracker: ApplicationTracker,
+    workers: Optional[int] = None,
+    llm=None,
+    server_params: Optional["StdioServerParameters"] = None,
+    duplicate_policy: Optional[str] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+    strong_llm=None
+) -> Dict[str, int]:
+    """
+    Apply to many jobs concurrently with a pool of independent workers.
+    
+    Every worker launches its own MCP session and agent. Browser MCP sessions
+    share one browser, so their number is capped at Config.MCP_MAX_SESSIONS.
+    All workers share the tracker. Jobs
+    are pulled from the iterable into a bounded queue as workers free up,
+    so a streamed job file is never held in memory as a whole.
+    
+    Args:
+        jobs: Job dictionaries, e.g. from load_batch_file or iter_jsonl_jobs;
+            a missing company or position is inferred from the job page
+        tracker: Shared application tracker
+        workers: Number of concurrent workers (defaults to Config.BATCH_CONCURRENCY);
+            capped at Config.MCP_MAX_SESSIONS for the Browser MCP server
+        llm: Chat model shared by all workers (defaults to create_llm())
+        server_params: MCP server each worker launches (defaults to get_server_params())
+        duplicate_policy: One of job_queue.DUPLICATE_POLICIES (defaults to 'skip',
+            or 'reapply' when Config.PREVENT_DUPLICATE_APPLICATIONS is off)
+        on_result: Called with a result record after each job
+        strong_llm: Stronger chat model for routed turns (defaults to create_strong_llm())
+    
+    Returns:
+        Count of jobs per outcome, including skipped duplicates
+    """
+    if workers is None:
+        workers = Config.BATCH_CONCURRENCY
+    if isinstance(jobs, list):
+        workers = min(workers, len(jobs))
+    if server_params is None and workers > Config.MCP_MAX_SESSIONS:
+        sys_logger.warning(
+            f"Browser MCP allows {Config.MCP_MAX_SESSIONS} concurrent session(s); "
+            f"running {Config.MCP_MAX_SESSIONS} of {workers} workers"
+        )
+        workers = Config.MCP_MAX_SESSIONS
+    workers = max(1, workers)
+    if duplicate_policy is None:
+        duplicate_policy = "skip" if Config.PREVENT_DUPLICATE_APPLICATIONS else "reapply"
+    llm = llm or create_llm()
+    strong_llm = strong_llm or create_strong_llm()
+    
+    queue = asyncio.Queue(maxsize=workers * Config.BATCH_QUEUE_DEPTH)
+    queued = 0
+    
+    async def feed_queue():
+        nonlocal queued
+        try:
+            for job in jobs:
+                await queue.put(job)
+                queued += 1
+        except Exception as e:
+            sys_logger.error(f"Stopped reading batch jobs after {queued}: {e}", exc_info=True)
+        for _ in range(workers):
+            await queue.put(None)
+    
+    results = {status.value: 0 for status in ApplicationStatus}
+    results["skipped"] = 0
+    
+    sys_logger.info(f"Starting batch with {workers} workers (duplicate policy: {duplicate_policy})")
+    feeder = asyncio.create_task(feed_queue())
+    outcomes = await asyncio.gather(
+        *(
+            _batch_worker(i + 1, queue, tracker, llm, results, server_params, duplicate_policy, on_result, strong_llm)
+            for i in range(workers)
+        ),
+        return_exceptions=True
+    )
+    for worker_id, outcome in enumerate(outcomes, start=1):
+        if isinstance(outcome, Exception):
+            sys_logger.error(f"Batch worker {worker_id} stopped: {outcome}", exc_info=outcome)
+    
+    # If every worker failed, the feeder is still waiting on a full queue
+    if not feeder.done():
+        feeder.cancel()
+        sys_logger.warning("All batch workers stopped before the job list was exhausted")
+    await asyncio.gather(feeder, return_exceptions=True)
+    
+    # Jobs queued but left behind by workers that failed are marked as skipped
+    results["skipped"] += queued - sum(results.values())
+    tracker.save()
+    sys_logger.info(f"Batch finished: {results}")
+    return results
+
+def print_batch_summary(results: Dict[str, int]):
+    """Print the outcome counts of a batch run."""
+    print("\n📦 Batch Summary:")
+    for outcome, count in results.items():
+        print(f"  {outcome.replace('_', ' ').title()}: {count}")
+    print()
+
 async def main():
     sys_logger.info("Starting Job Application Automation System")
     sys_logger.info(f"Configuration: {Config.get_config_summary()}")
+    initialize()
+    phases = {"imports": time.perf_counter() - STARTUP_STARTED}
     
     # Initialize application tracker
     tracker = ApplicationTracker()
     stats = tracker.get_statistics()
     sys_logger.info(f"Application Statistics: {stats}")
+    metrics_server = await start_metrics_server() if Config.METRICS_ENABLED else None
     
-    server_params = StdioServerParameters(
-        command="npx",
-        args=["@browsermcp/mcp@latest"]
-    )
-
     try:
-        async with stdio_client(server_params) as (read, write):
+        # Import the agent stack in the background while the MCP server starts
+        phase_started = time.perf_counter()
+        preload = asyncio.create_task(asyncio.to_thread(preload_agent_modules))
+        from mcp import ClientSession
+        from mcp.client.stdio import stdio_client
+        
+        async with stdio_client(get_server_params()) as (read, write):
             async with ClientSession(read, write) as session:
                 # Initialize the connection
                 await session.initialize()
                 sys_logger.info("MCP session initialized successfully")
-
+                phases["mcp_session"] = time.perf_counter() - phase_started
+                
                 # Get tools
+                phase_started = time.perf_counter()
+                await preload
+                from langchain_mcp_adapters.tools import load_mcp_tools
                 tools = await load_mcp_tools(session)
                 sys_logger.info(f"Loaded {len(tools)} browser automation tools")
-
+                phases["tools"] = time.perf_counter() - phase_started
+                
                 # Initialize OCI GenAI
-                llm = ChatOCIGenAI(
-                    auth_type="API_KEY",
-                    compartment_id="ocid1.tenancy.oc1..aaaaaaaahqvb2kliqi35z57qalhpr4dyqbjprclszdcoar2wgc7q6nl36aba",
-                    service_endpoint="https://inference.generativeai.us-chicago-1.oci.oraclecloud.com",
-                    model_id="xai.grok-4-fast-non-reasoning"
+                phase_started = time.perf_counter()
+                llm = create_llm()
+                strong_llm = create_strong_llm()
+                sys_logger.info(
+                    "LLM initialized successfully"
+                    + (f" (routing to {Config.STRONG_LLM_MODEL_ID} where needed)" if strong_llm else "")
                 )
-                sys_logger.info("LLM initialized successfully")
-
-                # Get system prompt
-                system_prompt = get_system_prompt(mode="application")
-
-                prompt = ChatPromptTemplate.from_messages([
-                    ("system", system_prompt),
-                    ("human", "{input}"),
-                    ("placeholder", "{agent_scratchpad}"),
-                ])
-
-                agent = create_tool_calling_agent(llm, tools, prompt)
-                agent_executor = AgentExecutor(
-                    agent=agent, 
-                    tools=tools, 
-                    verbose=True,
-                    max_iterations=15,
-                    handle_parsing_errors=True
+                
+                agent_executor = create_agent_executor(llm, tools, strong_llm=strong_llm)
+                phases["agent"] = time.perf_counter() - phase_started
+                prompt_tokens = get_prompt_token_report()
+                sys_logger.info(
+                    f"System prompt: ~{prompt_tokens['full']} tokens in full, "
+                    f"~{min(prompt_tokens.values())}-{max(prompt_tokens.values())} tokens per platform/phase variant"
                 )
                 
                 print("\n" + "="*60)
@@ -92,14 +684,23 @@ async def main():
                 print("  - Paste a job application URL to start applying")
                 print("  - Type 'stats' to see application statistics")
                 print("  - Type 'export' to export applications to CSV")
+                print("  - Type 'profile' to see where time goes across applications")
+                print("  - Type 'batch <file>' to apply to a list of URLs concurrently")
                 print("  - Type 'exit' or 'quit' to stop")
-                print("="*60 + "\n")
+                print("="*60)
+                log_startup_report(phases)
+                print()
                 
                 current_app_id = None
+                current_domain = None
+                current_prefill = None
+                current_profile = None
                 
                 while True:
                     try:
                         user_input = input("You: ").strip()
+                        agent_input = user_input
+                        prefill_url = None
                         
                         if not user_input:
                             continue
@@ -117,21 +718,87 @@ async def main():
                             print(f"  Total: {stats['total']}")
                             for status, count in stats['by_status'].items():
                                 print(f"  {status.title()}: {count}")
+                            print(f"  Mean attempts: {stats['mean_attempts']}")
+                            today = datetime.now().date().isoformat()
+                            print(f"  Completed today: {stats['completed_by_day'].get(today, 0)}")
+                            top_companies = sorted(
+                                stats['by_company'].items(), key=lambda item: item[1], reverse=True
+                            )[:5]
+                            if top_companies:
+                                print("  Top companies: " + ", ".join(
+                                    f"{company} ({count})" for company, count in top_companies
+                                ))
+                            cache_stats = get_form_cache().get_stats()
+                            print(f"  Form cache: {cache_stats['entries']} layouts, "
+                                  f"{cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                                  f"({cache_stats['hit_rate']:.0%} hit rate)")
+                            if Config.LLM_CACHE_ENABLED:
+                                from llm_cache import get_llm_cache
+                                llm_stats = get_llm_cache().get_stats()
+                                print(f"  LLM cache: {llm_stats['entries']} responses, "
+                                      f"{llm_stats['hits']} hits / {llm_stats['misses']} misses "
+                                      f"({llm_stats['hit_rate']:.0%} hit rate), "
+                                      f"{llm_stats['evicted']} evicted after failed turns")
+                            answer_stats = get_answer_cache().get_stats()
+                            print(f"  Answer cache: {answer_stats['seeded']} seeded + {answer_stats['stored']} stored "
+                                  f"({answer_stats['pending']} pending), "
+                                  f"{answer_stats['hits']} hits / {answer_stats['misses']} misses "
+                                  f"({answer_stats['hit_rate']:.0%} hit rate)")
+                            compression = get_compression_stats()
+                            print(f"  Snapshot compression: {compression['chars_saved']:,} chars / "
+                                  f"~{compression['tokens_saved']:,} tokens saved "
+                                  f"({compression['ratio']:.0%} of raw size sent)")
+                            scratchpad = get_scratchpad_stats()
+                            print(f"  Scratchpad windowing: ~{scratchpad['tokens_saved']:,} tokens saved over "
+                                  f"{scratchpad['summarized_turns']}/{scratchpad['turns']} summarized turns "
+                                  f"(largest scratchpad ~{scratchpad['max_sent_tokens']:,} tokens)")
+                            subsets = get_tool_subset_stats()
+                            per_phase = ", ".join(
+                                f"{phase} ~{totals['tokens_saved']:,} over {totals['turns']} turns"
+                                for phase, totals in subsets["phases"].items()
+                            )
+                            print(f"  Tool subsets: ~{subsets['tokens_saved']:,} schema tokens saved"
+                                  + (f" ({per_phase})" if per_phase else ""))
+                            screening = get_screening_stats()
+                            print(f"  Batched screening: {screening['answered']}/{screening['questions']} questions "
+                                  f"answered in {screening['batches']} calls")
+                            routing = get_routing_stats()
+                            for tier, usage in routing["models"].items():
+                                print(f"  {tier.capitalize()} model ({usage['model']}): {usage['calls']} calls, "
+                                      f"{usage['avg_seconds']:.2f}s avg, ~${usage['cost']:.4f}")
+                            if routing["decisions"]:
+                                print("  Routing: " + ", ".join(
+                                    f"{decision} {count}" for decision, count in sorted(routing["decisions"].items())
+                                ))
                             print()
                             continue
                         
+                        if user_input.lower() == 'profile':
+                            print_profile_report(summarize_profiles(tracker.iter_applications()))
+                            continue
+                        
                         if user_input.lower() == 'export':
                             export_path = Config.DATA_DIR / "applications_export.csv"
                             tracker.export_to_csv(export_path)
                             print(f"✅ Exported to {export_path}\n")
                             continue
                         
+                        if user_input.lower().startswith('batch '):
+                            batch_path = Path(user_input[len('batch '):].strip())
+                            if not batch_path.exists():
+                                print(f"❌ Batch file not found: {batch_path}\n")
+                                continue
+                            print(f"📦 Starting batch from {batch_path}...\n")
+                            results = await run_batch(load_jobs(batch_path), tracker, llm=llm, strong_llm=strong_llm)
+                            print_batch_summary(results)
+                            continue
+                        
                         # Check if input looks like a job application URL
                         if user_input.startswith('http'):
                             # Check for duplicates
-                            if tracker.is_duplicate(user_input):
+                            existing = tracker.find_duplicate(user_input)
+                            if existing:
                                 print("⚠️  You've already applied to this job!")
-                                existing = tracker.get_application(tracker._generate_app_id(user_input))
                                 print(f"   Applied on: {existing['created_at']}")
                                 print(f"   Status: {existing['status']}")
                                 
@@ -139,6 +806,10 @@ async def main():
                                 if confirm != 'yes':
                                     continue
                             
+                            # Answers staged for an unfinished earlier application are dropped
+                            if current_app_id and Config.ANSWER_CACHE_ENABLED:
+                                settle_answers(current_app_id, completed=False)
+                            
                             # Create new application entry
                             print("📝 Creating new application entry...")
                             print("   Company name: ", end="")
@@ -152,37 +823,94 @@ async def main():
                                 position=position,
                                 status=ApplicationStatus.IN_PROGRESS
                             )
+                            current_domain = urlsplit(user_input).hostname
+                            platform = detect_platform(user_input)
+                            agent_executor = create_agent_executor(llm, tools, platform=platform, strong_llm=strong_llm)
                             
                             app_logger.info(f"Starting application: {company} - {position}")
                             print(f"🚀 Starting application process...\n")
+                            
+                            current_profile = ApplicationProfile(platform)
+                            prefill_url = user_input
                         
                         # Execute the agent
+                        profiled_app_id, profile = current_app_id, current_profile
                         try:
-                            tracker.increment_attempts(current_app_id) if current_app_id else None
+                            # Prefill runs here so a CAPTCHA or sign-in page it finds is handled like the agent's
+                            if prefill_url:
+                                prefill_started = time.monotonic()
+                                with staged_answers(current_app_id):
+                                    current_prefill = await prefill_application(
+                                        tools, prefill_url, platform, llm=strong_llm or llm
+                                    )
+                                current_profile.prefill_seconds = time.monotonic() - prefill_started
+                                if current_prefill:
+                                    agent_input = f"{prefill_url}\n{current_prefill.describe()}"
+                                if current_prefill and current_prefill.filled:
+                                    source = "a known form layout" if current_prefill.cache_hit else f"the {platform} playbook"
+                                    print(f"⚡ Filled {len(current_prefill.filled)} fields from {source}; "
+                                          f"{len(current_prefill.leftover)} left for the agent")
+                            
+                            steps = []
+                            attempt = 0
+                            callbacks = [ProfilingCallbackHandler(profile)] if profile else None
+                            
+                            async def run_agent_turn():
+                                nonlocal attempt
+                                attempt += 1
+                                tracker.increment_attempts(current_app_id) if current_app_id else None
+                                steps.clear()
+                                executor, turn_input, history = agent_executor, agent_input, []
+                                # Retries continue from the checkpoint instead of starting the turn over
+                                if attempt > 1 and current_app_id:
+                                    history, _page, resume_note = await resume_application(tools, tracker, current_app_id)
+                                    if history:
+                                        executor = create_agent_executor(
+                                            llm, tools, platform=platform, history=history, strong_llm=strong_llm
+                                        )
+                                        turn_input = f"{agent_input}\n{resume_note}"
+                                checkpointer = (
+                                    Checkpointer(tracker, current_app_id, history, attempt)
+                                    if Config.CHECKPOINTS_ENABLED and current_app_id else None
+                                )
+                                detector = OutcomeDetector() if Config.OUTCOME_DETECTION_ENABLED else None
+                                try:
+                                    with llm_cache_turns():
+                                        return await stream_agent(
+                                            executor, turn_input, steps=steps, callbacks=callbacks,
+                                            on_step=checkpointer.on_step if checkpointer else None, detector=detector
+                                        )
+                                except (Exception, asyncio.CancelledError):
+                                    # Keep the steps not yet checkpointed for the retry or a later resume,
+                                    # also when the time budget cancels the attempt
+                                    if checkpointer:
+                                        checkpointer.flush()
+                                    raise
                             
                             print("🤖 Agent working...\n")
                             
-                            async for chunk in agent_executor.astream({"input": user_input}):
-                                if "actions" in chunk:
-                                    for action in chunk["actions"]:
-                                        print(f"⚙️  Executing: {action.tool}")
-                                        app_logger.info(f"Tool: {action.tool}, Input: {action.tool_input}")
-                                        
-                                elif "steps" in chunk:
-                                    for step in chunk["steps"]:
-                                        print(f"✅ Completed: {step.action.tool}")
-                                        
-                                elif "output" in chunk:
-                                    print(f"\n🤖 Agent: {chunk['output']}\n")
-                                    app_logger.info(f"Agent output: {chunk['output']}")
+                            with staged_answers(current_app_id):
+                                await retry_async(
+                                    run_agent_turn,
+                                    time_budget=Config.APPLICATION_TIME_BUDGET,
+                                    domain=current_domain,
+                                    on_wait=profile.add_wait if profile else None
+                                )
+                                record_agent_steps(current_prefill, steps)
                             
                             # Mark as completed if we got here without errors
                             if current_app_id:
                                 tracker.update_status(current_app_id, ApplicationStatus.COMPLETED)
+                                clear_checkpoint(tracker, current_app_id)
+                                if Config.ANSWER_CACHE_ENABLED:
+                                    settle_answers(current_app_id, completed=True)
                                 print("✅ Application completed successfully!\n")
                                 app_logger.info(f"Application {current_app_id} completed")
                                 current_app_id = None
-                                
+                                current_domain = None
+                                current_prefill = None
+                                current_profile = None
+                        
                         except CaptchaError as e:
                             print(f"\n🔒 CAPTCHA detected! Please solve it manually and try again.\n")
                             if current_app_id:
@@ -192,7 +920,7 @@ async def main():
                                     handle_error(e, "CAPTCHA encountered")
                                 )
                             app_logger.warning(f"CAPTCHA error: {e}")
-                            
+                        
                         except AuthenticationError as e:
                             print(f"\n🔐 Authentication required! Please log in and try again.\n")
                             if current_app_id:
@@ -202,7 +930,7 @@ async def main():
                                     handle_error(e, "Authentication required")
                                 )
                             app_logger.warning(f"Authentication error: {e}")
-                            
+                        
                         except ApplicationError as e:
                             error_info = handle_error(e, "Application process")
                             print(f"\n❌ Application error: {e.message}")
@@ -219,7 +947,7 @@ async def main():
                                     error_info
                                 )
                             app_logger.error(f"Application error: {e}")
-                            
+                        
                         except Exception as e:
                             error_info = handle_error(e, "Unexpected error")
                             print(f"\n❌ An unexpected error occurred: {str(e)}\n")
@@ -231,11 +959,17 @@ async def main():
                                     error_info
                                 )
                             sys_logger.error(f"Unexpected error: {e}", exc_info=True)
-                            
+                        
+                        finally:
+                            if profiled_app_id and profile is not None:
+                                tracker.update_metadata(profiled_app_id, {"profile": profile.to_dict()})
+                    
                     except KeyboardInterrupt:
                         print("\n\n⚠️  Interrupted by user")
                         if current_app_id:
                             tracker.update_status(current_app_id, ApplicationStatus.FAILED)
+                            if Config.ANSWER_CACHE_ENABLED:
+                                settle_answers(current_app_id, completed=False)
                         tracker.save()
                         break
                     
@@ -250,9 +984,141 @@ async def main():
         print("Please check the logs for more details.")
         return 1
     
+    finally:
+        await stop_metrics_server(metrics_server)
+    
     return 0
 
+async def batch_main(
+    batch_file: Path,
+    workers: Optional[int] = None,
+    duplicate_policy: Optional[str] = None,
+    results_file: Optional[Path] = None
+) -> int:
+    """
+    Run a batch of applications from a file without the interactive prompt.
+    
+    Args:
+        batch_file: Plain batch file or JSONL job queue (see load_jobs)
+        workers: Concurrent browser sessions (defaults to Config.BATCH_CONCURRENCY)
+        duplicate_policy: One of job_queue.DUPLICATE_POLICIES (see run_batch)
+        results_file: JSONL file that receives one result line per job
+    
+    Returns:
+        Process exit code
+    """
+    sys_logger.info("Starting Job Application Automation System in batch mode")
+    initialize()
+    tracker = ApplicationTracker()
+    metrics_server = await start_metrics_server() if Config.METRICS_ENABLED else None
+    
+    try:
+        jobs = load_jobs(batch_file)
+        with contextlib.ExitStack() as stack:
+            writer = stack.enter_context(ResultWriter(results_file)) if results_file else None
+            results = await run_batch(
+                jobs, tracker, workers=workers, duplicate_policy=duplicate_policy,
+                on_result=writer.write if writer else None
+            )
+    except Exception as e:
+        sys_logger.error(f"Fatal error: {e}", exc_info=True)
+        print(f"❌ Fatal error: {str(e)}")
+        return 1
+    finally:
+        await stop_metrics_server(metrics_server)
+    
+    print_batch_summary(results)
+    sys_logger.info(f"Snapshot compression: {get_compression_stats()}")
+    sys_logger.info(f"Scratchpad windowing: {get_scratchpad_stats()}")
+    sys_logger.info(f"Tool subsets: {get_tool_subset_stats()}")
+    sys_logger.info(f"Model routing: {get_routing_stats()}")
+    sys_logger.info(f"Batched screening: {get_screening_stats()}")
+    if Config.LLM_CACHE_ENABLED:
+        from llm_cache import get_llm_cache
+        sys_logger.info(f"LLM cache: {get_llm_cache().get_stats()}")
+    return 0
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Job application automation agent")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    apply_parser = subparsers.add_parser(
+        "apply",
+        help="Apply to every job in a JSONL queue without any prompts"
+    )
+    apply_parser.add_argument(
+        "jobs",
+        type=Path,
+        help='JSONL file with one job per line: {"url": ..., "company": ..., "position": ...}'
+    )
+    apply_parser.add_argument(
+        "--results",
+        type=Path,
+        default=Config.DATA_DIR / "apply_results.jsonl",
+        help="JSONL file to append one result per job to (default: %(default)s)"
+    )
+    apply_parser.add_argument(
+        "--duplicates",
+        choices=DUPLICATE_POLICIES,
+        default="skip",
+        help="Jobs applied to before: skip them, retry those that did not complete, or reapply (default: skip)"
+    )
+    submit_group = apply_parser.add_mutually_exclusive_group()
+    submit_group.add_argument(
+        "--submit",
+        dest="submit",
+        action="store_const",
+        const=True,
+        default=argparse.SUPPRESS,
+        help="Submit applications without confirmation (default: leave them for manual review)"
+    )
+    submit_group.add_argument(
+        "--no-submit",
+        dest="submit",
+        action="store_const",
+        const=False,
+        default=argparse.SUPPRESS,
+        help="Fill out applications but leave them for manual review instead of submitting"
+    )
+    # SUPPRESS keeps a top-level --workers from being overwritten by this copy's default
+    apply_parser.add_argument(
+        "--workers",
+        type=int,
+        default=argparse.SUPPRESS,
+        help=f"Concurrent browser sessions (default: {Config.BATCH_CONCURRENCY})"
+    )
+    
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        help="File with one job URL per line (optionally tab-separated company and position)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=f"Concurrent browser sessions in batch mode (default: {Config.BATCH_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--submit",
+        dest="submit",
+        action="store_const",
+        const=True,
+        default=None,
+        help="Submit batch applications without confirmation (default: leave them for manual review)"
+    )
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    args = parse_args()
+    if args.submit is not None:
+        Config.BATCH_AUTO_SUBMIT = args.submit
+    if args.command == "apply":
+        exit_code = asyncio.run(batch_main(args.jobs, args.workers, args.duplicates, args.results))
+    elif args.batch:
+        exit_code = asyncio.run(batch_main(args.batch, args.workers))
+    else:
+        exit_code = asyncio.run(main())
     exit(exit_code)
 
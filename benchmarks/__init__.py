@@ -0,0 +1,4 @@
+"""
+Offline benchmarks for the application agent.
+Runs the batch pipeline against a mock Browser MCP server and a scripted chat model.
+"""
@@ -0,0 +1,194 @@
+"""
+Deterministic chat model for offline benchmarks.
+Plays the applicant agent by reading page snapshots from its prompt and choosing the next tool call.
+"""
+
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+from page_snapshot import parse_snapshot, URL_PATTERN
+from playbooks import COMMON_RULES, FieldRule, unmapped_fields
+from screening import SCREENING_TOOL, QUESTIONS_HEADER, ANSWERS_SCHEMA
+from form_filler import get_user_value
+from token_counter import estimate_tokens, estimate_tokens_for_object
+
+# How the scripted agent answers fields no playbook rule covers
+EXTRA_RULES = [
+    FieldRule(r"^(full\s+)?name\b", "full_name"),
+    FieldRule(r"location|city", "location"),
+    FieldRule(r"current\s+company", "current_company"),
+]
+FREE_TEXT_ANSWER = "I enjoy building reliable products and would love to contribute to your team."
+CONTINUE_PATTERN = re.compile(r"^(apply( for this job| now)?|save and continue|continue|next|review|submit.*)$", re.I)
+DONE_PATTERN = re.compile(r"thank you for applying|submitted successfully", re.I)
+GENERATION_PATTERN = re.compile(r"\[ref=(s\d+)e\d+\]|new prefix (s\d+)")
+URL_IN_INPUT = re.compile(r"https?://\S+")
+GENERATION_PREFIX = re.compile(r"^s\d+(?=e\d+$)")
+
+class ScriptedApplicantModel(BaseChatModel):
+    """
+    Fake tool-calling model that fills every visible field and then continues or submits.
+    
+    It is stateless between turns: each decision is derived from the tool
+    calls and tool results already in the prompt, so it works with the
+    agent's scratchpad exactly as a real model would, including pruned and
+    diffed snapshots. Counters for turns and estimated tokens are shared by
+    all workers using the same instance. Input tokens include the schemas
+    of the bound tools, which a real model call sends on every turn. It
+    also answers batched screening calls and, when the screening tool is
+    bound, uses it for pages with several open questions.
+    """
+    
+    llm_turns: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    max_turns_per_application: int = 30
+    latency: float = 0.0
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-applicant"
+    
+    def bind_tools(self, tools, **kwargs):
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+        
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Return turn and token counters."""
+        return {
+            "llm_turns": self.llm_turns,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+        }
+    
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        tool_names = {tool["function"]["name"] for tool in kwargs.get("tools", [])}
+        if ANSWERS_SCHEMA["title"] in tool_names:
+            message = self._answer_batch(messages)
+        else:
+            message = self._decide(messages, tool_names)
+        prompt_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        prompt_tokens += sum(estimate_tokens_for_object(tool) for tool in kwargs.get("tools", []))
+        completion_tokens = estimate_tokens(str(message.content) + json.dumps(message.tool_calls))
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        with self._lock:
+            self.llm_turns += 1
+            self.input_tokens += prompt_tokens
+            self.output_tokens += completion_tokens
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    def _answer_batch(self, messages: List[BaseMessage]) -> AIMessage:
+        """Answer a batched screening call: Yes for choices, the usual answer for text."""
+        text = next((str(m.content) for m in messages if QUESTIONS_HEADER in str(m.content)), "")
+        questions = json.loads(text.split(QUESTIONS_HEADER, 1)[1]) if text else []
+        answers = [
+            {"id": question["id"], "answer": "Yes" if question.get("options") else self._answer(question["question"])}
+            for question in questions
+        ]
+        return self._call(ANSWERS_SCHEMA["title"], {"answers": answers}, 0)
+    
+    def _decide(self, messages: List[BaseMessage], tool_names=frozenset()) -> AIMessage:
+        """Choose the next action from the conversation so far."""
+        user_input = next((str(m.content) for m in messages if isinstance(m, HumanMessage)), "")
+        calls = [call for m in messages if isinstance(m, AIMessage) for call in m.tool_calls]
+        observations = [str(m.content) for m in messages if isinstance(m, ToolMessage)]
+        
+        if not calls:
+            if "already open" in user_input:
+                return self._call("browser_snapshot", {}, len(calls))
+            url = URL_IN_INPUT.search(user_input)
+            return self._call("browser_navigate", {"url": url.group(0) if url else ""}, len(calls))
+        
+        if observations and DONE_PATTERN.search(observations[-1]):
+            return AIMessage(content="Application submitted successfully!")
+        if len(calls) >= self.max_turns_per_application:
+            return AIMessage(content="Stopping: the form could not be completed.")
+        
+        elements, generation = self._current_page(observations)
+        if not elements:
+            return self._call("browser_snapshot", {}, len(calls))
+        
+        # A navigation reloads the page, so only fields acted on since then count as done
+        last_navigation = max((i for i, call in enumerate(calls) if call["name"] == "browser_navigate"), default=0)
+        acted = {(call["name"], call["args"].get("element")) for call in calls[last_navigation:]}
+        open_questions = unmapped_fields([element for element in elements.values() if element.is_form_field])
+        if (SCREENING_TOOL in tool_names and len(open_questions) >= 2
+                and (SCREENING_TOOL, None) not in acted):
+            return self._call(SCREENING_TOOL, {}, len(calls))
+        for element in elements.values():
+            if not element.is_form_field or element.is_filled:
+                continue
+            if element.role == "textbox" and ("browser_type", element.label) not in acted:
+                return self._call("browser_type", {
+                    "element": element.label, "ref": self._ref(element, generation),
+                    "text": self._answer(element.label), "submit": False,
+                }, len(calls))
+            if element.role == "combobox" and ("browser_select_option", element.label) not in acted:
+                return self._call("browser_select_option", {
+                    "element": element.label, "ref": self._ref(element, generation), "values": ["Yes"],
+                }, len(calls))
+        
+        clicks = [call for call in calls if call["name"] == "browser_click"]
+        for element in elements.values():
+            if element.role in ("button", "link") and CONTINUE_PATTERN.match(element.label):
+                ref = self._ref(element, generation)
+                if clicks and clicks[-1]["args"].get("ref") == ref:
+                    continue
+                return self._call("browser_click", {"element": element.label, "ref": ref}, len(calls))
+        
+        return AIMessage(content="Stopping: no way forward on this page.")
+    
+    def _current_page(self, observations: List[str]):
+        """Merge the snapshots and diffs of the current page into one element map."""
+        elements: Dict[str, Any] = {}
+        page_url = None
+        generation = None
+        for text in observations:
+            url = URL_PATTERN.search(text)
+            if url and url.group(1).strip() != page_url:
+                page_url = url.group(1).strip()
+                elements = {}
+            if "[Snapshot diff" not in text and "[ref=" in text:
+                elements = {}
+            for element in parse_snapshot(text).elements:
+                if element.ref:
+                    elements[GENERATION_PREFIX.sub("", element.ref)] = element
+            match = GENERATION_PATTERN.search(text)
+            if match:
+                generation = match.group(1) or match.group(2)
+        return elements, generation
+    
+    @staticmethod
+    def _ref(element, generation: Optional[str]) -> str:
+        """Rewrite an element's ref into the latest snapshot generation."""
+        if not generation or not GENERATION_PREFIX.match(element.ref or ""):
+            return element.ref
+        return GENERATION_PREFIX.sub(generation, element.ref)
+    
+    @staticmethod
+    def _answer(label: str) -> str:
+        """Pick the user's value for a field label."""
+        for rule in COMMON_RULES + EXTRA_RULES:
+            if rule.pattern.search(label):
+                value = get_user_value(rule.key)
+                if value:
+                    return value
+        return FREE_TEXT_ANSWER
+    
+    @staticmethod
+    def _call(name: str, args: Dict[str, Any], index: int) -> AIMessage:
+        return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call_{index}"}])
@@ -0,0 +1,221 @@
+"""
+Mock Browser MCP server for offline benchmarks.
+Serves synthetic ATS pages over stdio with the same tool names and snapshot format as Browser MCP.
+
+Run directly (``python benchmarks/mock_browser_server.py``); the benchmark
+runner launches one instance per batch worker. Set MOCK_BROWSER_STATS_FILE
+to append one JSON line per tool call, and MOCK_BROWSER_LATENCY to add a
+fixed delay (seconds) to every call.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp.server.fastmcp import FastMCP
+from benchmarks.synthetic_forms import Element, Page, PLATFORM_PAGES, CONFIRMATION, boilerplate
+from job_identity import detect_platform
+
+STATS_FILE = os.getenv("MOCK_BROWSER_STATS_FILE")
+LATENCY = float(os.getenv("MOCK_BROWSER_LATENCY", "0"))
+
+FIELD_ROLES = {"textbox", "combobox"}
+
+class BrowserState:
+    """The single tab controlled by this server."""
+    
+    def __init__(self):
+        self.base_url = ""
+        self.company = "Acme"
+        self.pages: Dict[str, Page] = {}
+        self.page: Optional[Page] = None
+        self.values: Dict[int, str] = {}
+        self.error = ""
+        self.generation = 0
+        self.refs: Dict[int, Element] = {}
+        self.chooser_open = False
+        self.uploaded: List[str] = []
+    
+    def load(self, url: str) -> bool:
+        """Open the synthetic application for a URL, at the step its path points to."""
+        pages = PLATFORM_PAGES.get(detect_platform(url))
+        if pages is None:
+            return False
+        url = url.rstrip("/")
+        start = next((page for page in pages + [CONFIRMATION] if page.path and url.endswith(page.path)), pages[0])
+        self.base_url = url[:-len(start.path)] if start.path and url.endswith(start.path) else url
+        self.pages = {page.page_id: page for page in pages + [CONFIRMATION]}
+        self.values = {}
+        self.uploaded = []
+        self.open(start)
+        return True
+    
+    def open(self, page: Page):
+        """Switch to another page of the current application."""
+        self.page = page
+        self.error = ""
+        self.chooser_open = False
+    
+    @property
+    def url(self) -> str:
+        return self.base_url + self.page.path if self.page else "about:blank"
+    
+    def render(self) -> str:
+        """Render the current page in Browser MCP's snapshot format."""
+        self.generation += 1
+        self.refs = {}
+        lines = []
+        
+        def add(depth: int, element: Element, role: str = None, suffix: str = ""):
+            number = len(self.refs) + 1
+            self.refs[number] = element
+            label = f' "{element.label}"' if element.label else ""
+            attrs = " [required]" if element.required else ""
+            lines.append(f"{'  ' * depth}- {role or element.role}{label}{attrs} [ref=s{self.generation}e{number}]{suffix}")
+        
+        if self.page is None:
+            return "- Page URL: about:blank\n- Page Title: \n- Page Snapshot\n```yaml\n- document\n```"
+        
+        page_boilerplate = boilerplate(self.company)
+        add(0, Element("document"), suffix=":")
+        add(1, Element("navigation"), suffix=":")
+        for link in page_boilerplate["header"]:
+            add(2, link)
+        add(1, Element("main"), suffix=":")
+        add(2, Element("heading", self.page.title))
+        if self.page is not CONFIRMATION:
+            add(2, Element("generic"), suffix=":")
+            for element in page_boilerplate["description"]:
+                add(3, element, suffix=f": {element.text}" if element.text else "")
+        
+        depth = 2
+        if self.page.form:
+            add(2, Element("form"), suffix=":")
+            depth = 3
+        if self.error:
+            add(depth, Element("alert"), suffix=f": {self.error}")
+        for element in self.page.elements:
+            if element.role in FIELD_ROLES:
+                value = self.values.get(id(element), "")
+                add(depth, element, suffix=f": {value}" if value else ("" if not element.options else ":"))
+                for option in element.options:
+                    add(depth + 1, Element("option", option))
+            else:
+                add(depth, element, suffix=f": {element.text}" if element.text else "")
+        
+        add(1, Element("contentinfo"), suffix=":")
+        for link in page_boilerplate["footer"]:
+            add(2, link)
+        
+        return "\n".join([
+            f"- Page URL: {self.url}",
+            f"- Page Title: {self.page.title}",
+            "- Page Snapshot",
+            "```yaml",
+            *lines,
+            "```",
+        ])
+    
+    def resolve(self, ref: str) -> Optional[Element]:
+        """Find an element by ref; the snapshot generation prefix is not checked."""
+        match = re.search(r"e(\d+)$", ref or "")
+        return self.refs.get(int(match.group(1))) if match else None
+    
+    def missing_required(self) -> List[str]:
+        """Labels of required fields on the current page that are still empty."""
+        return [
+            element.label for element in self.page.elements
+            if element.required and element.role in FIELD_ROLES and not self.values.get(id(element))
+        ]
+
+state = BrowserState()
+server = FastMCP("mock-browser", log_level="WARNING")
+
+def _log_event(event: str, **details):
+    """Append an event to the benchmark stats file, if one is configured."""
+    if STATS_FILE:
+        with open(STATS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"event": event, "pid": os.getpid(), **details}) + "\n")
+
+async def _record(tool: str, **details):
+    """Log a tool call for the benchmark and apply the simulated latency."""
+    _log_event("tool_call", tool=tool, **details)
+    if LATENCY:
+        await asyncio.sleep(LATENCY)
+
+@server.tool()
+async def browser_navigate(url: str) -> str:
+    """Navigate to a URL"""
+    await _record("browser_navigate", url=url)
+    if not state.load(url):
+        return f"Error: no synthetic page for {url}"
+    return f"Navigated to {url}\n{state.render()}"
+
+@server.tool()
+async def browser_snapshot() -> str:
+    """Capture accessibility snapshot of the current page"""
+    await _record("browser_snapshot")
+    return state.render()
+
+@server.tool()
+async def browser_click(element: str, ref: str) -> str:
+    """Perform click on a web page"""
+    await _record("browser_click")
+    target = state.resolve(ref)
+    if target is None or target.role not in ("button", "link"):
+        return f"Error: no clickable element with ref {ref}"
+    
+    if target.submit or target.goto:
+        missing = state.missing_required()
+        if missing:
+            state.error = f"{missing[0]} is required"
+        else:
+            state.open(CONFIRMATION if target.submit else state.pages[target.goto])
+            if target.submit:
+                _log_event("submitted", url=state.base_url, resume=bool(state.uploaded))
+    elif re.search(r"attach|resume|cv", target.label, re.I):
+        state.chooser_open = True
+        return f'Clicked "{target.label}"\n### Modal state\n- [File chooser]: can be handled by the "browser_file_upload" tool'
+    return f'Clicked "{target.label}"\n{state.render()}'
+
+@server.tool()
+async def browser_type(element: str, ref: str, text: str, submit: bool = False) -> str:
+    """Type text into editable element"""
+    await _record("browser_type")
+    target = state.resolve(ref)
+    if target is None or target.role != "textbox":
+        return f"Error: no text field with ref {ref}"
+    state.values[id(target)] = text
+    return f'Typed "{text}" into "{target.label}"\n{state.render()}'
+
+@server.tool()
+async def browser_select_option(element: str, ref: str, values: List[str]) -> str:
+    """Select an option in a dropdown"""
+    await _record("browser_select_option")
+    target = state.resolve(ref)
+    if target is None or target.role != "combobox":
+        return f"Error: no dropdown with ref {ref}"
+    choice = next((option for option in target.options if values and option.lower() == values[0].lower()), None)
+    if choice is None:
+        return f"Error: option {values} not found; available: {target.options}"
+    state.values[id(target)] = choice
+    return f'Selected "{choice}" in "{target.label}"\n{state.render()}'
+
+@server.tool()
+async def browser_file_upload(paths: List[str]) -> str:
+    """Upload one or multiple files"""
+    await _record("browser_file_upload")
+    if not state.chooser_open:
+        return "Error: no file chooser is open"
+    state.chooser_open = False
+    state.uploaded = list(paths)
+    return f"Uploaded {len(paths)} file(s)\n{state.render()}"
+
+if __name__ == "__main__":
+    server.run()
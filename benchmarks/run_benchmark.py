@@ -0,0 +1,228 @@
+"""
+Offline benchmark of the batch application pipeline.
+Runs synthetic applications through run_batch with a mock Browser MCP server and a scripted model.
+
+Usage:
+    python -m benchmarks.run_benchmark --applications 9 --workers 3
+    python -m benchmarks.run_benchmark --output after.json --baseline before.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from mcp import StdioServerParameters
+
+import answer_cache
+import form_cache
+from automate_client import run_batch
+from application_tracker import ApplicationTracker
+from form_cache import FormMappingCache
+from answer_cache import AnswerCache
+from config import Config
+from benchmarks.fake_llm import ScriptedApplicantModel
+from benchmarks.synthetic_forms import PLATFORM_PAGES, job_url
+
+MOCK_SERVER = Path(__file__).resolve().parent / "mock_browser_server.py"
+
+# Config overrides per scenario; 'baseline' turns off every shortcut
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "baseline": {
+        "PLAYBOOKS_ENABLED": False, "FORM_CACHE_ENABLED": False, "SNAPSHOT_PRUNING_ENABLED": False,
+        "ANSWER_CACHE_ENABLED": False, "SCREENING_BATCH_ENABLED": False,
+    },
+    "compressed": {
+        "PLAYBOOKS_ENABLED": False, "FORM_CACHE_ENABLED": False, "SNAPSHOT_PRUNING_ENABLED": True,
+        "ANSWER_CACHE_ENABLED": False, "SCREENING_BATCH_ENABLED": False,
+    },
+    "playbooks": {
+        "PLAYBOOKS_ENABLED": True, "FORM_CACHE_ENABLED": False, "SNAPSHOT_PRUNING_ENABLED": True,
+        "ANSWER_CACHE_ENABLED": False, "SCREENING_BATCH_ENABLED": False,
+    },
+    "default": {},
+    "routed": {"MODEL_ROUTING_ENABLED": True},
+}
+
+# Metrics compared against a baseline file, where lower is better unless noted
+REPORTED_METRICS = [
+    "apps_per_minute", "tool_calls_per_app", "llm_turns_per_app",
+    "input_tokens_per_app", "output_tokens_per_app",
+]
+
+@contextlib.contextmanager
+def config_overrides(overrides: Dict[str, Any]):
+    """Temporarily set Config attributes."""
+    saved = {name: getattr(Config, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(Config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+
+def build_jobs(applications: int, platforms: List[str]) -> List[Dict]:
+    """Spread synthetic postings evenly over the platforms."""
+    return [
+        {
+            "url": job_url(platforms[i % len(platforms)], i),
+            "company": f"Acme {i % 5}",
+            "position": "Software Engineer",
+        }
+        for i in range(applications)
+    ]
+
+def read_server_stats(stats_file: Path) -> Dict[str, Any]:
+    """Summarize the events logged by the mock servers."""
+    tools, submitted = Counter(), 0
+    if stats_file.exists():
+        with open(stats_file, "r", encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                if event["event"] == "tool_call":
+                    tools[event["tool"]] += 1
+                elif event["event"] == "submitted":
+                    submitted += 1
+    return {"tool_calls": sum(tools.values()), "by_tool": dict(tools), "submitted": submitted}
+
+async def run_scenario(
+    name: str,
+    jobs: List[Dict],
+    workers: int,
+    llm_latency: float,
+    tool_latency: float
+) -> Dict[str, Any]:
+    """
+    Run one scenario in a scratch data directory.
+    
+    Args:
+        name: Key of SCENARIOS
+        jobs: Synthetic jobs to apply to
+        workers: Concurrent batch workers
+        llm_latency: Simulated seconds per LLM turn
+        tool_latency: Simulated seconds per browser tool call
+    
+    Returns:
+        Throughput, tool-call, LLM-turn and token metrics for the scenario
+    """
+    # The mock forms are submitted end to end, as in a `--submit` batch run
+    overrides = {"BATCH_AUTO_SUBMIT": True, **SCENARIOS[name]}
+    with tempfile.TemporaryDirectory() as scratch, config_overrides(overrides):
+        scratch = Path(scratch)
+        stats_file = scratch / "server_stats.jsonl"
+        server_params = StdioServerParameters(
+            command=sys.executable,
+            args=[str(MOCK_SERVER)],
+            env={
+                **os.environ,
+                "MOCK_BROWSER_STATS_FILE": str(stats_file),
+                "MOCK_BROWSER_LATENCY": str(tool_latency),
+            },
+        )
+        form_cache._form_cache = FormMappingCache(scratch / "form_mappings.json")
+        answer_cache._answer_cache = AnswerCache(scratch / "screening_answers.json")
+        tracker = ApplicationTracker(history_file=scratch / "applications.json")
+        llm = ScriptedApplicantModel(latency=llm_latency)
+        strong_llm = ScriptedApplicantModel(latency=llm_latency) if Config.MODEL_ROUTING_ENABLED else None
+        
+        started = time.perf_counter()
+        results = await run_batch(
+            jobs, tracker, workers=workers, llm=llm, server_params=server_params, strong_llm=strong_llm
+        )
+        elapsed = time.perf_counter() - started
+        tracker.close()
+        server = read_server_stats(stats_file)
+    
+    model = llm.get_stats()
+    strong = strong_llm.get_stats() if strong_llm else {"llm_turns": 0, "input_tokens": 0, "output_tokens": 0}
+    model = {key: value + strong[key] for key, value in model.items()}
+    count = len(jobs)
+    return {
+        "scenario": name,
+        "applications": count,
+        "submitted": server["submitted"],
+        "results": results,
+        "elapsed_seconds": round(elapsed, 2),
+        "apps_per_minute": round(count / elapsed * 60, 1) if elapsed else 0.0,
+        "tool_calls_per_app": round(server["tool_calls"] / count, 1),
+        "llm_turns_per_app": round(model["llm_turns"] / count, 1),
+        "strong_llm_turns_per_app": round(strong["llm_turns"] / count, 1),
+        "input_tokens_per_app": round(model["input_tokens"] / count),
+        "output_tokens_per_app": round(model["output_tokens"] / count),
+        "by_tool": server["by_tool"],
+    }
+
+def print_report(reports: List[Dict[str, Any]], baseline: Optional[Dict[str, Dict]] = None):
+    """Print one row per scenario, with changes against a baseline run if given."""
+    header = f"{'scenario':<12}{'submitted':>11}" + "".join(f"{metric:>24}" for metric in REPORTED_METRICS)
+    print("\n" + header)
+    print("-" * len(header))
+    for report in reports:
+        row = f"{report['scenario']:<12}{report['submitted']:>5}/{report['applications']:<5}"
+        for metric in REPORTED_METRICS:
+            value = report[metric]
+            cell = f"{value:,}"
+            previous = (baseline or {}).get(report["scenario"], {}).get(metric)
+            if previous:
+                cell += f" ({(value - previous) / previous:+.0%})"
+            row += f"{cell:>24}"
+        print(row)
+    print()
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Offline benchmark of the application agent")
+    parser.add_argument("--applications", type=int, default=9, help="Applications per scenario")
+    parser.add_argument("--workers", type=int, default=3, help="Concurrent batch workers")
+    parser.add_argument(
+        "--platforms", nargs="+", default=list(PLATFORM_PAGES), choices=list(PLATFORM_PAGES),
+        help="Synthetic platforms to apply on"
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS),
+        help="Scenarios to run"
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM turn")
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="Simulated seconds per tool call")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Earlier --output file to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Show agent progress and logs")
+    return parser.parse_args()
+
+async def main() -> int:
+    args = parse_args()
+    jobs = build_jobs(args.applications, args.platforms)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = {report["scenario"]: report for report in json.load(f)}
+    
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+    
+    reports = []
+    for name in args.scenarios:
+        print(f"Running scenario '{name}' ({len(jobs)} applications, {args.workers} workers)...")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output if not args.verbose else sys.stdout):
+            reports.append(await run_scenario(name, jobs, args.workers, args.llm_latency, args.tool_latency))
+    
+    print_report(reports, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,138 @@
+"""
+Synthetic ATS application pages served by the mock Browser MCP server.
+Each platform is a sequence of pages modelled on its real layout.
+"""
+
+from typing import Dict, List, Optional
+
+class Element:
+    """An element on a synthetic page."""
+    
+    def __init__(
+        self,
+        role: str,
+        label: str = "",
+        required: bool = False,
+        options: Optional[List[str]] = None,
+        goto: Optional[str] = None,
+        submit: bool = False,
+        text: str = ""
+    ):
+        """
+        Initialize the element.
+        
+        Args:
+            role: Accessibility role (textbox, combobox, button, link, ...)
+            label: Accessible name
+            required: Whether submitting requires a value
+            options: Choices of a combobox
+            goto: Page id opened when the element is clicked
+            submit: Whether clicking the element submits the application
+            text: Static text content (paragraphs, headings)
+        """
+        self.role = role
+        self.label = label
+        self.required = required
+        self.options = options or []
+        self.goto = goto
+        self.submit = submit
+        self.text = text
+
+class Page:
+    """A synthetic page: boilerplate around an optional form."""
+    
+    def __init__(self, page_id: str, title: str, path: str, elements: List[Element], form: bool = True):
+        self.page_id = page_id
+        self.title = title
+        self.path = path
+        self.elements = elements
+        self.form = form
+
+def boilerplate(company: str) -> Dict[str, List[Element]]:
+    """Navigation, job description and footer that real career pages carry."""
+    return {
+        "header": [Element("link", label) for label in (
+            "Home", "About us", "Teams", "Locations", "Benefits", "Life at " + company, "Blog", "All jobs"
+        )],
+        "description": [Element("heading", "About the role")] + [
+            Element("paragraph", text=(
+                f"Paragraph {i + 1} of the job description: you will design, build and operate "
+                f"services used by millions of people, working closely with product and design."
+            ))
+            for i in range(12)
+        ] + [Element("heading", "Benefits")] + [
+            Element("listitem", text=f"Benefit {i + 1}: generous leave, learning budget and health cover")
+            for i in range(8)
+        ],
+        "footer": [Element("link", label) for label in (
+            "Privacy policy", "Terms of use", "Cookie settings", "Accessibility", "Contact"
+        )],
+    }
+
+CONFIRMATION = Page("done", "Application submitted", "/confirmation", [
+    Element("heading", "Thank you for applying!"),
+    Element("paragraph", text="Your application has been submitted successfully. We will be in touch."),
+], form=False)
+
+PLATFORM_PAGES: Dict[str, List[Page]] = {
+    "greenhouse": [
+        Page("form", "Job Application for Software Engineer", "", [
+            Element("textbox", "First Name", required=True),
+            Element("textbox", "Last Name", required=True),
+            Element("textbox", "Email", required=True),
+            Element("textbox", "Phone"),
+            Element("button", "Attach"),
+            Element("textbox", "LinkedIn Profile"),
+            Element("textbox", "Website"),
+            Element("combobox", "Are you legally authorized to work in India?", required=True,
+                    options=["Yes", "No"]),
+            Element("textbox", "Why do you want to join us?"),
+            Element("button", "Submit Application", submit=True),
+        ]),
+    ],
+    "lever": [
+        Page("posting", "Software Engineer", "", [
+            Element("link", "Apply for this job", goto="form"),
+        ], form=False),
+        Page("form", "Software Engineer - Apply", "/apply", [
+            Element("button", "ATTACH RESUME/CV"),
+            Element("textbox", "Full name", required=True),
+            Element("textbox", "Email", required=True),
+            Element("textbox", "Phone"),
+            Element("textbox", "Current company"),
+            Element("textbox", "LinkedIn URL"),
+            Element("textbox", "GitHub URL"),
+            Element("textbox", "Additional information"),
+            Element("button", "Submit application", submit=True),
+        ]),
+    ],
+    "workday": [
+        Page("info", "My Information", "/apply/step1", [
+            Element("textbox", "First Name", required=True),
+            Element("textbox", "Last Name", required=True),
+            Element("textbox", "Email Address", required=True),
+            Element("textbox", "Phone Number", required=True),
+            Element("button", "Save and Continue", goto="questions"),
+        ]),
+        Page("questions", "Application Questions", "/apply/step2", [
+            Element("combobox", "Will you now or in the future require visa sponsorship?", required=True,
+                    options=["Yes", "No"]),
+            Element("combobox", "Are you willing to relocate?", required=True, options=["Yes", "No"]),
+            Element("button", "Save and Continue", goto="review"),
+        ]),
+        Page("review", "Review", "/apply/review", [
+            Element("heading", "Review your application"),
+            Element("button", "Submit", submit=True),
+        ], form=False),
+    ],
+}
+
+def job_url(platform: str, index: int) -> str:
+    """Build the URL of the index-th synthetic posting on a platform."""
+    if platform == "greenhouse":
+        return f"https://boards.greenhouse.io/acme{index % 5}/jobs/{4000000 + index}"
+    if platform == "lever":
+        return f"https://jobs.lever.co/acme{index % 5}/{index:08d}-0000-4000-8000-000000000000"
+    if platform == "workday":
+        return f"https://acme{index % 5}.wd1.myworkdayjobs.com/en-US/careers/job/Remote/Engineer_R{index:05d}"
+    raise ValueError(f"No synthetic pages for platform: {platform}")
@@ -0,0 +1,282 @@
+"""
+Step-level checkpoints for applications in progress.
+Stores the agent's completed steps in the tracker record so a retry resumes mid-form instead of starting over.
+"""
+
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple, Any
+from page_snapshot import PageSnapshot, URL_PATTERN, is_snapshot, parse_snapshot
+from phase_detector import detect_phase
+from snapshot_compressor import prune_snapshot, truncate_observation
+from scratchpad import message_group_starts
+from form_filler import NAVIGATE_TOOL, SNAPSHOT_TOOL, TYPE_TOOL, SELECT_TOOL, call_tool
+from application_tracker import ApplicationTracker
+from logger_setup import get_application_logger
+from config import Config
+
+logger = get_application_logger()
+
+# Metadata key of the checkpoint in a tracker record
+CHECKPOINT_KEY = "checkpoint"
+
+def serialize_step(action: Any, observation: Any, keep_snapshot: bool = True) -> Dict:
+    """
+    Convert one (AgentAction, observation) pair into JSON-safe data.
+    
+    Snapshot observations are pruned and capped the same way they are for
+    the prompt. Older snapshots are replaced by a one-line note, since a
+    resumed application reopens the last page and takes a fresh one.
+    
+    Args:
+        action: Agent action from the executor
+        observation: Tool result for the action
+        keep_snapshot: Keep a snapshot observation instead of replacing it
+    
+    Returns:
+        Dictionary accepted by deserialize_step
+    """
+    from langchain_core.messages import messages_to_dict
+    
+    text = str(observation)
+    if is_snapshot(text):
+        if keep_snapshot:
+            text = truncate_observation(prune_snapshot(text), Config.SNAPSHOT_MAX_CHARS)
+        else:
+            match = URL_PATTERN.search(text)
+            text = f"[Snapshot of {match.group(1).strip() if match else 'an earlier page'} omitted from the checkpoint]"
+    return {
+        "tool": action.tool,
+        "tool_input": action.tool_input,
+        "tool_call_id": getattr(action, "tool_call_id", None),
+        "log": action.log,
+        "message_log": messages_to_dict(getattr(action, "message_log", [])),
+        "observation": text,
+    }
+
+def deserialize_step(data: Dict) -> Tuple[Any, str]:
+    """
+    Rebuild a step saved by serialize_step.
+    
+    Args:
+        data: Serialized step
+    
+    Returns:
+        (AgentAction, observation) pair for the agent's scratchpad
+    """
+    from langchain_core.agents import AgentAction
+    from langchain_core.messages import messages_from_dict
+    from langchain.agents.output_parsers.tools import ToolAgentAction
+    
+    if data.get("tool_call_id"):
+        action = ToolAgentAction(
+            tool=data["tool"],
+            tool_input=data["tool_input"],
+            log=data.get("log", ""),
+            message_log=messages_from_dict(data.get("message_log", [])),
+            tool_call_id=data["tool_call_id"],
+        )
+    else:
+        action = AgentAction(tool=data["tool"], tool_input=data["tool_input"], log=data.get("log", ""))
+    return action, data["observation"]
+
+def navigation_step(url: str, observation: str, index: int) -> Tuple[Any, str]:
+    """
+    Build the step recording that a resumed application reopened a page.
+    
+    Appending it to the restored steps makes the fresh snapshot the latest
+    observation the agent sees, so it does not act on refs from before.
+    
+    Args:
+        url: Page that was reopened
+        observation: Navigation tool result (the page snapshot)
+        index: Position of the step, used to make its tool call ID unique
+    
+    Returns:
+        (AgentAction, observation) pair
+    """
+    call_id = f"resume_{index}"
+    return deserialize_step({
+        "tool": NAVIGATE_TOOL,
+        "tool_input": {"url": url},
+        "tool_call_id": call_id,
+        "log": f"Reopening {url} to resume the application",
+        "message_log": [{"type": "ai", "data": {
+            "content": "", "tool_calls": [{"name": NAVIGATE_TOOL, "args": {"url": url}, "id": call_id}],
+        }}],
+        "observation": observation,
+    })
+
+def last_page_url(steps: List[Tuple[Any, Any]]) -> Optional[str]:
+    """Return the URL of the most recent page snapshot in the steps, if any."""
+    for _action, observation in reversed(steps):
+        match = URL_PATTERN.search(str(observation))
+        if match:
+            return match.group(1).strip()
+    return None
+
+def filled_fields(steps: List[Tuple[Any, Any]]) -> List[str]:
+    """Return the labels of fields the agent typed into or selected, in order."""
+    labels = []
+    for action, _observation in steps:
+        if action.tool in (TYPE_TOOL, SELECT_TOOL) and isinstance(action.tool_input, dict):
+            label = action.tool_input.get("element")
+            if label and label not in labels:
+                labels.append(label)
+    return labels
+
+def save_checkpoint(tracker: ApplicationTracker, app_id: str, steps: List[Tuple[Any, Any]], attempt: int):
+    """
+    Store the completed steps and form progress of an application.
+    
+    Only the latest page snapshot is kept in full, so the record stays small.
+    At most Config.CHECKPOINT_MAX_STEPS recent steps are kept, cut at a model
+    message so parallel tool calls are restored with all of their results.
+    
+    Args:
+        tracker: Application tracker
+        app_id: Application ID
+        steps: All steps completed so far, including restored ones
+        attempt: Attempt that produced the latest step
+    """
+    starts = message_group_starts(steps)
+    first = len(steps) - Config.CHECKPOINT_MAX_STEPS
+    kept = steps[next((start for start in starts if start >= first), starts[-1] if starts else 0):]
+    latest = max((i for i, (_action, observation) in enumerate(kept) if is_snapshot(str(observation))), default=None)
+    tracker.update_metadata(app_id, {CHECKPOINT_KEY: {
+        "steps": [
+            serialize_step(action, observation, keep_snapshot=(i == latest))
+            for i, (action, observation) in enumerate(kept)
+        ],
+        "page_url": last_page_url(steps),
+        "phase": detect_phase(steps),
+        "filled_fields": filled_fields(steps),
+        "attempt": attempt,
+        "updated_at": datetime.now().isoformat(),
+    }})
+
+class Checkpointer:
+    """
+    Checkpoints one attempt's steps as they complete, writing only when needed.
+    
+    Every checkpoint rewrites the tracker record, so a write happens when a
+    step reaches a new page or phase, or after Config.CHECKPOINT_SAVE_INTERVAL
+    steps; flush() stores the remaining steps when the attempt fails.
+    """
+    
+    def __init__(self, tracker: ApplicationTracker, app_id: str, history: List[Tuple[Any, Any]], attempt: int):
+        """
+        Initialize the checkpointer.
+        
+        Args:
+            tracker: Application tracker
+            app_id: Application ID
+            history: Steps restored from an earlier checkpoint
+            attempt: Attempt whose steps are checkpointed
+        """
+        self.tracker = tracker
+        self.app_id = app_id
+        self.history = list(history)
+        self.attempt = attempt
+        self._saved_count = 0
+        self._saved_page = (last_page_url(self.history), detect_phase(self.history))
+        self._pending = []
+    
+    def on_step(self, steps: List[Tuple[Any, Any]]):
+        """
+        Checkpoint the attempt's steps if they moved on far enough since the last write.
+        
+        Args:
+            steps: Steps completed so far in this attempt
+        """
+        self._pending = list(steps)
+        page = (last_page_url(steps) or self._saved_page[0], detect_phase(self.history + steps))
+        if page != self._saved_page or len(steps) - self._saved_count >= Config.CHECKPOINT_SAVE_INTERVAL:
+            self._save(steps, page)
+    
+    def flush(self):
+        """Checkpoint any steps not written yet."""
+        if len(self._pending) > self._saved_count:
+            self._save(self._pending, self._saved_page)
+    
+    def _save(self, steps: List[Tuple[Any, Any]], page: Tuple[Optional[str], str]):
+        save_checkpoint(self.tracker, self.app_id, self.history + steps, self.attempt)
+        self._saved_count = len(steps)
+        self._saved_page = page
+
+def load_checkpoint(tracker: ApplicationTracker, app_id: str) -> Optional[Dict]:
+    """Return the checkpoint stored for an application, or None if it has none."""
+    app = tracker.get_application(app_id)
+    checkpoint = (app or {}).get("metadata", {}).get(CHECKPOINT_KEY)
+    return checkpoint if checkpoint and checkpoint.get("steps") else None
+
+def clear_checkpoint(tracker: ApplicationTracker, app_id: str):
+    """Drop an application's checkpoint once it no longer needs resuming."""
+    app = tracker.get_application(app_id)
+    if app and app.get("metadata", {}).get(CHECKPOINT_KEY):
+        tracker.update_metadata(app_id, {CHECKPOINT_KEY: None})
+
+def restore_steps(checkpoint: Dict) -> List[Tuple[Any, str]]:
+    """
+    Rebuild the agent steps stored in a checkpoint.
+    
+    Args:
+        checkpoint: Value returned by load_checkpoint
+    
+    Returns:
+        (AgentAction, observation) pairs, or an empty list if they cannot be restored
+    """
+    try:
+        return [deserialize_step(step) for step in checkpoint["steps"]]
+    except Exception as e:
+        logger.warning(f"Could not restore checkpointed steps, starting over: {e}")
+        return []
+
+def describe_resume(checkpoint: Dict) -> str:
+    """Tell the agent that it is continuing an earlier attempt."""
+    parts = [
+        f"This continues an earlier attempt that stopped after {len(checkpoint['steps'])} steps "
+        f"in the {checkpoint.get('phase', 'discovery')} phase; the steps it took are included below."
+    ]
+    if checkpoint.get("page_url"):
+        parts.append(
+            f"The browser was reopened at the last page it reached ({checkpoint['page_url']}); "
+            f"its snapshot is the latest step."
+        )
+    if checkpoint.get("filled_fields"):
+        fields = ", ".join(f'"{label}"' for label in checkpoint["filled_fields"])
+        parts.append(f"Fields filled before: {fields}; refill any that lost their value.")
+    parts.append("Element refs from earlier snapshots are no longer valid.")
+    return " ".join(parts)
+
+async def resume_application(
+    tools: List,
+    tracker: ApplicationTracker,
+    app_id: str
+) -> Tuple[List[Tuple[Any, str]], Optional[PageSnapshot], str]:
+    """
+    Restore an application's checkpoint and reopen the last page it reached.
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        tracker: Application tracker
+        app_id: Application ID
+    
+    Returns:
+        Tuple of (restored steps, snapshot of the reopened page or None, note
+        for the agent's input); the steps are empty if there is nothing to resume
+    """
+    checkpoint = load_checkpoint(tracker, app_id) if Config.CHECKPOINTS_ENABLED else None
+    history = restore_steps(checkpoint) if checkpoint else []
+    if not history:
+        return [], None, ""
+    
+    page_url = checkpoint.get("page_url")
+    snapshot = None
+    if page_url:
+        text = await call_tool(tools, NAVIGATE_TOOL, {"url": page_url})
+        if not is_snapshot(text):
+            text = await call_tool(tools, SNAPSHOT_TOOL, {})
+        history.append(navigation_step(page_url, text, len(history)))
+        snapshot = parse_snapshot(text)
+    logger.info(f"Resuming application {app_id} after {len(history)} checkpointed steps at {page_url or 'the job URL'}")
+    return history, snapshot, describe_resume(checkpoint)
@@ -14,37 +14,134 @@ class Config:
     LOGS_DIR = BASE_DIR / "logs"
     DATA_DIR = BASE_DIR / "data"
     
-    # Ensure directories exist
-    LOGS_DIR.mkdir(exist_ok=True)
-    DATA_DIR.mkdir(exist_ok=True)
-    
     # Logging configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     APPLICATION_LOG_FILE = LOGS_DIR / "applications.log"
     SYSTEM_LOG_FILE = LOGS_DIR / "system.log"
     LOG_MAX_BYTES = 10 * 1024 * 1024  # 10MB
     LOG_BACKUP_COUNT = 5
+    LOG_FORMAT_STYLE = os.getenv("LOG_FORMAT_STYLE", "text")  # "text" or "json" (JSON lines in log files)
+    LOG_MAX_FIELD_CHARS = 500  # cap for tool inputs/outputs embedded in log messages
+    LOG_MAX_MESSAGE_CHARS = 4000  # hard cap for any single log message
     
     # Application tracking
     APPLICATION_HISTORY_FILE = DATA_DIR / "applications.json"
+    APPLICATION_DB_FILE = DATA_DIR / "applications.db"
+    TRACKER_BACKEND = os.getenv("TRACKER_BACKEND", "json")  # "json" or "sqlite"
+    JOURNAL_COMPACTION_THRESHOLD = 500  # journal entries before folding into a snapshot
+    JOURNAL_FSYNC = False  # fsync every journal append (slower, survives power loss)
     
     # Error handling and retry configuration
     MAX_RETRY_ATTEMPTS = 3
     RETRY_BACKOFF_MULTIPLIER = 2  # Exponential backoff: 1s, 2s, 4s, etc.
     INITIAL_RETRY_DELAY = 1  # seconds
+    RETRY_JITTER = 0.25  # randomize each delay by +/- 25%
+    APPLICATION_TIME_BUDGET = 900  # seconds allowed per application across retries
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5  # consecutive network/timeout failures per domain
+    CIRCUIT_BREAKER_RESET_TIMEOUT = 300  # seconds before retrying a paused domain
+    
+    # Browser MCP server (pinned; a local node_modules install is used when present)
+    BROWSER_MCP_PACKAGE = os.getenv("BROWSER_MCP_PACKAGE", "@browsermcp/mcp@0.1.3")
+    MCP_SERVER_LOCAL_BIN = BASE_DIR / "node_modules" / ".bin" / "mcp-server-browsermcp"
+    MCP_SERVER_COMMAND = os.getenv("MCP_SERVER_COMMAND", "npx")
+    MCP_SERVER_ARGS = os.getenv("MCP_SERVER_ARGS", f"--prefer-offline --yes {BROWSER_MCP_PACKAGE}").split()
     
     # Browser automation settings
     PAGE_LOAD_TIMEOUT = 30  # seconds
     ELEMENT_WAIT_TIMEOUT = 10  # seconds
     
     # Form filling settings
+    FORM_CACHE_ENABLED = True  # replay known form layouts without the LLM
+    FORM_CACHE_FILE = DATA_DIR / "form_mappings.json"
+    FORM_CACHE_MAX_ENTRIES = 500  # form layouts kept before evicting the least recently used
+    PLAYBOOKS_ENABLED = True  # fill standard fields on known ATS platforms without the LLM
+    BROWSER_UPLOAD_TOOL = "browser_file_upload"  # MCP tool used for resume uploads, skipped if the server lacks it
     TYPING_DELAY = 0.1  # seconds between keystrokes (more human-like)
     CLICK_DELAY = 0.5  # seconds after clicking
     
+    # Screening answer cache settings
+    ANSWER_CACHE_ENABLED = True  # answer recurring screening questions without the LLM
+    ANSWER_CACHE_FILE = DATA_DIR / "screening_answers.json"
+    ANSWER_CACHE_THRESHOLD = 0.7  # minimum similarity x confidence to reuse an answer
+    ANSWER_CACHE_MARGIN = 0.05  # closer runner-up with a different answer makes a match ambiguous
+    ANSWER_CACHE_LEARNED_CONFIDENCE = 0.9  # confidence of answers learned from agent runs
+    SCREENING_BATCH_ENABLED = True  # answer a page's remaining questions in one structured LLM call
+    SCREENING_BATCH_MAX_QUESTIONS = 20  # questions sent in one call; the rest are left to the agent
+    
+    # Resume parsing settings
+    RESUME_PARSING_ENABLED = True  # extract resume sections once and reuse them (PDFs need pypdf)
+    RESUME_CACHE_FILE = DATA_DIR / "resume_cache.json"
+    RESUME_CACHE_MAX_ENTRIES = 5  # parsed resume versions kept, keyed by file hash
+    
+    # Chat models (prices in USD per million tokens, used for cost estimates)
+    LLM_MODEL_ID = os.getenv("LLM_MODEL_ID", "xai.grok-4-fast-non-reasoning")  # fast model for routine turns
+    LLM_INPUT_PRICE = 0.20
+    LLM_OUTPUT_PRICE = 0.50
+    MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING_ENABLED", "false").lower() == "true"  # use the strong model where needed
+    STRONG_LLM_MODEL_ID = os.getenv("STRONG_LLM_MODEL_ID", "xai.grok-4")  # screening, unmapped fields and recovery
+    STRONG_LLM_INPUT_PRICE = 3.00
+    STRONG_LLM_OUTPUT_PRICE = 15.00
+    
+    # LLM response cache (opt-in; replays identical agent turns on retries)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+    LLM_CACHE_FILE = DATA_DIR / "llm_cache.json"
+    LLM_CACHE_MAX_ENTRIES = 2000  # responses kept before evicting the least recently used
+    LLM_CACHE_TTL = 24 * 3600  # seconds a cached response stays valid
+    LLM_CACHE_SAVE_INTERVAL = 20  # new responses between writes of the cache file
+    
+    # Step checkpoints (retries resume from the last page reached)
+    CHECKPOINTS_ENABLED = True
+    CHECKPOINT_MAX_STEPS = 30  # most recent agent steps kept in an application's checkpoint
+    CHECKPOINT_SAVE_INTERVAL = 5  # steps on the same page between checkpoint writes
+    
+    # Agent context settings
+    SNAPSHOT_PRUNING_ENABLED = True  # strip page snapshots down to form-relevant nodes
+    SNAPSHOT_DIFF_ENABLED = True  # send later snapshots of the same page as diffs
+    SNAPSHOT_MAX_CHARS = 12000  # cap on a single tool result in the prompt
+    SCRATCHPAD_WINDOWING_ENABLED = True  # summarize older agent steps instead of resending them
+    SCRATCHPAD_WINDOW_STEPS = 8  # most recent agent steps sent verbatim
+    SCRATCHPAD_MAX_TOKENS = 8000  # ceiling for the scratchpad; older steps are summarized to fit
+    TOOL_SUBSETS_ENABLED = True  # bind only the browser tools the current phase needs
+    
+    # Outcome detection (end a run on confirmation, CAPTCHA or sign-in pages)
+    OUTCOME_DETECTION_ENABLED = True
+    
+    # Metrics endpoint
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"  # serve Prometheus metrics
+    METRICS_HOST = "127.0.0.1"
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+    
     # Application settings
     PREVENT_DUPLICATE_APPLICATIONS = True
     AUTO_SAVE_PROGRESS = True
     
+    # Batch mode settings
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "1"))  # parallel browser sessions
+    # Browser MCP drives one browser through a single extension connection, so its
+    # sessions cannot run in parallel; raise only for a server with a browser per session
+    MCP_MAX_SESSIONS = int(os.getenv("MCP_MAX_SESSIONS", "1"))
+    BATCH_AUTO_SUBMIT = False  # submit without confirmation in unattended batch runs (--submit)
+    BATCH_QUEUE_DEPTH = 2  # jobs read ahead per worker when streaming a job file
+    
+    @classmethod
+    def ensure_directories(cls):
+        """Create the log and data directories if they do not exist."""
+        cls.LOGS_DIR.mkdir(exist_ok=True)
+        cls.DATA_DIR.mkdir(exist_ok=True)
+    
+    @classmethod
+    def get_mcp_server_command(cls):
+        """
+        Return the command and arguments that launch the Browser MCP server.
+        
+        An explicit MCP_SERVER_COMMAND wins; otherwise a locally installed
+        server binary is run directly, and npx with the pinned package is the
+        fallback.
+        """
+        if "MCP_SERVER_COMMAND" not in os.environ and cls.MCP_SERVER_LOCAL_BIN.exists():
+            return str(cls.MCP_SERVER_LOCAL_BIN), []
+        return cls.MCP_SERVER_COMMAND, list(cls.MCP_SERVER_ARGS)
+    
     @classmethod
     def get_config_summary(cls):
         """Return a summary of current configuration."""
@@ -54,4 +151,6 @@ class Config:
             "log_level": cls.LOG_LEVEL,
             "max_retries": cls.MAX_RETRY_ATTEMPTS,
             "prevent_duplicates": cls.PREVENT_DUPLICATE_APPLICATIONS,
+            "tracker_backend": cls.TRACKER_BACKEND,
+            "batch_concurrency": cls.BATCH_CONCURRENCY,
         }
@@ -4,9 +4,12 @@ Provides specialized exception classes and retry logic.
 """
 
 import time
+import random
+import asyncio
 from enum import Enum
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Awaitable, Dict
 from logger_setup import get_system_logger
+from metrics import APPLICATION_ERRORS
 from config import Config
 
 logger = get_system_logger()
@@ -60,6 +63,122 @@ class TimeoutError(ApplicationError):
     def __init__(self, message: str):
         super().__init__(message, ErrorCategory.TIMEOUT)
 
+class CircuitOpenError(ApplicationError):
+    """Raised when requests to a domain are suspended by its circuit breaker."""
+    def __init__(self, domain: str, retry_after: float):
+        self.domain = domain
+        self.retry_after = retry_after
+        super().__init__(
+            f"Too many network failures for {domain} - paused for {retry_after:.0f}s",
+            ErrorCategory.NETWORK
+        )
+
+class CircuitBreaker:
+    """
+    Per-domain circuit breaker.
+    
+    After repeated network or timeout failures the circuit opens and calls
+    fail fast until the reset timeout passes. One trial call is then let
+    through while other callers keep failing fast; success closes the
+    circuit, failure opens it again.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        domain: str,
+        failure_threshold: int = None,
+        reset_timeout: float = None
+    ):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            domain: Domain the breaker protects
+            failure_threshold: Consecutive failures before opening (defaults to Config.CIRCUIT_BREAKER_FAILURE_THRESHOLD)
+            reset_timeout: Seconds to stay open (defaults to Config.CIRCUIT_BREAKER_RESET_TIMEOUT)
+        """
+        self.domain = domain
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or Config.CIRCUIT_BREAKER_RESET_TIMEOUT
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+    
+    def before_call(self):
+        """
+        Check whether a call may proceed.
+        
+        Every call let through must be settled with record_success,
+        record_failure or release_trial.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a trial call in flight
+        """
+        if self.state == self.OPEN:
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.reset_timeout:
+                raise CircuitOpenError(self.domain, self.reset_timeout - elapsed)
+            self.state = self.HALF_OPEN
+            self.trial_in_flight = True
+            logger.info(f"Circuit for {self.domain} half-open, allowing a trial call")
+        elif self.state == self.HALF_OPEN:
+            if self.trial_in_flight:
+                # A failed trial reopens the circuit for the full reset timeout
+                raise CircuitOpenError(self.domain, self.reset_timeout)
+            self.trial_in_flight = True
+    
+    def release_trial(self):
+        """Settle a call that ended without an outcome (e.g. cancelled), freeing the trial slot."""
+        self.trial_in_flight = False
+    
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.domain} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trial_in_flight = False
+    
+    def record_failure(self, error: Exception):
+        """Count a failed call; only network and timeout errors trip the breaker."""
+        # Other errors say nothing about the domain, so the next caller may try again
+        self.trial_in_flight = False
+        if not isinstance(error, (NetworkError, TimeoutError)):
+            return
+        
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            logger.warning(
+                f"Circuit for {self.domain} opened after {self.failures} failures "
+                f"(paused for {self.reset_timeout}s)"
+            )
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_circuit_breaker(domain: str) -> CircuitBreaker:
+    """Get the shared circuit breaker for a domain, creating it if needed."""
+    domain = domain.lower()
+    if domain not in _circuit_breakers:
+        _circuit_breakers[domain] = CircuitBreaker(domain)
+    return _circuit_breakers[domain]
+
+def normalize_error(error: Exception) -> Exception:
+    """Map built-in connection and timeout exceptions onto application errors."""
+    if isinstance(error, ApplicationError):
+        return error
+    if isinstance(error, asyncio.TimeoutError):
+        return TimeoutError(str(error) or "Operation timed out")
+    if isinstance(error, ConnectionError):
+        return NetworkError(str(error) or type(error).__name__)
+    return error
+
 def retry_with_backoff(
     func: Callable,
     max_attempts: int = None,
@@ -110,6 +229,98 @@ def retry_with_backoff(
     
     raise last_exception
 
+async def retry_async(
+    func: Callable[[], Awaitable[Any]],
+    max_attempts: int = None,
+    initial_delay: float = None,
+    backoff_multiplier: float = None,
+    jitter: float = None,
+    time_budget: float = None,
+    domain: Optional[str] = None,
+    on_wait: Optional[Callable[[float], None]] = None
+) -> Any:
+    """
+    Await a coroutine factory with exponential backoff without blocking the event loop.
+    
+    Only errors accepted by is_retryable_error are retried. When a domain is
+    given, its circuit breaker is consulted before every attempt and updated
+    with the outcome.
+    
+    Args:
+        func: Callable returning a new awaitable for each attempt
+        max_attempts: Maximum number of attempts (defaults to Config.MAX_RETRY_ATTEMPTS)
+        initial_delay: Initial delay in seconds (defaults to Config.INITIAL_RETRY_DELAY)
+        backoff_multiplier: Multiplier for exponential backoff (defaults to Config.RETRY_BACKOFF_MULTIPLIER)
+        jitter: Random +/- fraction applied to each delay (defaults to Config.RETRY_JITTER)
+        time_budget: Overall seconds allowed across all attempts (None for no limit)
+        domain: Domain whose circuit breaker guards the calls
+        on_wait: Called with the seconds slept before each retry
+    
+    Returns:
+        Result of the awaited call
+    
+    Raises:
+        The last error (normalized via normalize_error) if all attempts fail,
+        TimeoutError if the time budget runs out, or CircuitOpenError
+    """
+    if max_attempts is None:
+        max_attempts = Config.MAX_RETRY_ATTEMPTS
+    if initial_delay is None:
+        initial_delay = Config.INITIAL_RETRY_DELAY
+    if backoff_multiplier is None:
+        backoff_multiplier = Config.RETRY_BACKOFF_MULTIPLIER
+    if jitter is None:
+        jitter = Config.RETRY_JITTER
+    
+    name = getattr(func, "__name__", "operation")
+    breaker = get_circuit_breaker(domain) if domain else None
+    deadline = time.monotonic() + time_budget if time_budget else None
+    delay = initial_delay
+    
+    for attempt in range(1, max_attempts + 1):
+        remaining = deadline - time.monotonic() if deadline else None
+        if remaining is not None and remaining <= 0:
+            raise TimeoutError(f"Time budget of {time_budget}s exhausted for {name}")
+        
+        if breaker:
+            breaker.before_call()
+        
+        try:
+            logger.info(f"Attempt {attempt}/{max_attempts} for {name}")
+            if remaining is None:
+                result = await func()
+            else:
+                result = await asyncio.wait_for(func(), timeout=remaining)
+            if breaker:
+                breaker.record_success()
+            return result
+        except asyncio.CancelledError:
+            if breaker:
+                breaker.release_trial()
+            raise
+        except Exception as e:
+            error = normalize_error(e)
+            if breaker:
+                breaker.record_failure(error)
+            logger.warning(f"Attempt {attempt} failed: {str(error)}")
+            
+            if not is_retryable_error(error):
+                raise error from e
+            if attempt == max_attempts:
+                logger.error(f"All {max_attempts} attempts failed for {name}")
+                raise error from e
+            
+            sleep_for = delay * random.uniform(1 - jitter, 1 + jitter)
+            if deadline and time.monotonic() + sleep_for >= deadline:
+                logger.error(f"Time budget exhausted for {name}, not retrying")
+                raise error from e
+            
+            logger.info(f"Retrying in {sleep_for:.1f} seconds...")
+            if on_wait:
+                on_wait(sleep_for)
+            await asyncio.sleep(sleep_for)
+            delay *= backoff_multiplier
+
 def handle_error(error: Exception, context: str = "") -> dict:
     """
     Handle an error and return structured error information.
@@ -136,6 +347,7 @@ def handle_error(error: Exception, context: str = "") -> dict:
         if error.category in [ErrorCategory.CAPTCHA, ErrorCategory.AUTHENTICATION]:
             error_info["requires_manual_intervention"] = True
     
+    APPLICATION_ERRORS.inc(error_info["category"])
     logger.error(f"Error handled: {error_info}")
     return error_info
 
@@ -149,8 +361,8 @@ def is_retryable_error(error: Exception) -> bool:
     Returns:
         True if the error should be retried, False otherwise
     """
-    # Don't retry CAPTCHA or authentication errors
-    if isinstance(error, (CaptchaError, AuthenticationError)):
+    # Don't retry CAPTCHA or authentication errors, or domains that are paused
+    if isinstance(error, (CaptchaError, AuthenticationError, CircuitOpenError)):
         return False
     
     # Retry network and timeout errors
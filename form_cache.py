@@ -0,0 +1,208 @@
+"""
+Persistent cache of form-field mappings keyed by form fingerprint.
+Lets a known form layout be filled again without LLM reasoning.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple, Any, Iterator
+from pathlib import Path
+from page_snapshot import PageElement, normalize_label, ref_key
+from form_filler import build_value_index, get_user_value, TYPE_TOOL, SELECT_TOOL
+from logger_setup import get_system_logger
+from config import Config
+
+logger = get_system_logger()
+
+def fingerprint_form(fields: List[PageElement], platform: str) -> str:
+    """
+    Fingerprint a form by its platform and the labels and types of its fields.
+    
+    Refs and current values are ignored, so the same layout produces the same
+    fingerprint across postings and visits.
+    
+    Args:
+        fields: Form fields from the page snapshot
+        platform: ATS platform of the page
+    
+    Returns:
+        Hex digest identifying the form layout
+    """
+    signature = [platform] + [f"{field.role}:{normalize_label(field.label)}" for field in fields]
+    return hashlib.sha1("\n".join(signature).encode("utf-8")).hexdigest()
+
+class FormMappingCache:
+    """
+    LRU cache of resolved field-label -> USER_DETAILS key mappings, saved to disk.
+    """
+    
+    def __init__(self, cache_file: Optional[Path] = None, max_entries: int = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_file: JSON file backing the cache (defaults to Config.FORM_CACHE_FILE)
+            max_entries: Maximum number of form layouts kept (defaults to Config.FORM_CACHE_MAX_ENTRIES)
+        """
+        self.cache_file = Path(cache_file or Config.FORM_CACHE_FILE)
+        self.max_entries = max_entries or Config.FORM_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = self._load()
+    
+    def _load(self) -> "OrderedDict[str, Dict]":
+        """Load cached mappings, least recently used first."""
+        if not self.cache_file.exists():
+            return OrderedDict()
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = sorted(data.items(), key=lambda item: item[1].get("last_used", ""))
+            logger.info(f"Loaded {len(entries)} cached form mappings")
+            return OrderedDict(entries)
+        except Exception as e:
+            logger.error(f"Error loading form cache: {e}")
+            return OrderedDict()
+    
+    def save(self):
+        """Write the cache to disk atomically."""
+        try:
+            with self._lock:
+                tmp_file = self.cache_file.with_suffix(".json.tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.error(f"Error saving form cache: {e}")
+    
+    def get(self, fingerprint: str) -> Optional[Dict[str, str]]:
+        """
+        Look up the mapping for a form fingerprint.
+        
+        Args:
+            fingerprint: Value from fingerprint_form
+        
+        Returns:
+            Mapping of normalized field label to USER_DETAILS key, or None
+        """
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["hits"] = entry.get("hits", 0) + 1
+            entry["last_used"] = datetime.now().isoformat()
+            self._entries.move_to_end(fingerprint)
+            return dict(entry["mapping"])
+    
+    def put(self, fingerprint: str, mapping: Dict[str, str], platform: str = ""):
+        """
+        Store (or extend) the mapping for a form fingerprint and persist it.
+        
+        Args:
+            fingerprint: Value from fingerprint_form
+            mapping: Mapping of normalized field label to USER_DETAILS key
+            platform: ATS platform, kept for reference
+        """
+        if not mapping:
+            return
+        with self._lock:
+            entry = self._entries.pop(fingerprint, None) or {"mapping": {}, "hits": 0, "platform": platform}
+            entry["mapping"].update(mapping)
+            entry["last_used"] = datetime.now().isoformat()
+            self._entries[fingerprint] = entry
+            
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.info(f"Evicted form mapping {evicted[:10]}")
+        self.save()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return entry count, hits, misses and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+def plan_from_mapping(fields: List[PageElement], mapping: Dict[str, str]) -> List[Tuple[PageElement, str]]:
+    """
+    Turn a cached mapping into (field, value) pairs for the current page.
+    
+    Args:
+        fields: Form fields from the current snapshot
+        mapping: Normalized label -> USER_DETAILS key
+    
+    Returns:
+        Fields that are still empty paired with the user's value
+    """
+    plan = []
+    for field in fields:
+        key = mapping.get(normalize_label(field.label))
+        if key and not field.is_filled:
+            value = get_user_value(key)
+            if value:
+                plan.append((field, value))
+    return plan
+
+def learn_mapping(fields: List[PageElement], steps: List[Tuple[Any, Any]]) -> Dict[str, str]:
+    """
+    Recover the field mapping the agent chose from its tool calls.
+    
+    A typed or selected value that equals a known user value reveals which
+    USER_DETAILS key the field maps to.
+    
+    Args:
+        fields: Form fields from the snapshot taken before the agent ran
+        steps: (AgentAction, observation) pairs from the agent run
+    
+    Returns:
+        Mapping of normalized field label to USER_DETAILS key
+    """
+    value_index = build_value_index()
+    mapping = {}
+    for field, value in iter_filled_values(fields, steps):
+        key = value_index.get(value.lower())
+        if key:
+            mapping[normalize_label(field.label)] = key
+    return mapping
+
+def iter_filled_values(fields: List[PageElement], steps: List[Tuple[Any, Any]]) -> Iterator[Tuple[PageElement, str]]:
+    """
+    Yield the fields the agent typed into or selected, with the value it used.
+    
+    Args:
+        fields: Form fields from the snapshot taken before the agent ran
+        steps: (AgentAction, observation) pairs from the agent run
+    
+    Yields:
+        (field, value) pairs in the order the agent filled them
+    """
+    by_ref = {ref_key(field.ref): field for field in fields}
+    for action, _observation in steps:
+        if action.tool not in (TYPE_TOOL, SELECT_TOOL) or not isinstance(action.tool_input, dict):
+            continue
+        field = by_ref.get(ref_key(action.tool_input.get("ref")))
+        value = action.tool_input.get("text")
+        if value is None:
+            values = action.tool_input.get("values") or []
+            value = values[0] if values else ""
+        if field is not None and str(value).strip():
+            yield field, str(value).strip()
+
+_form_cache: Optional[FormMappingCache] = None
+
+def get_form_cache() -> FormMappingCache:
+    """Get the shared form mapping cache."""
+    global _form_cache
+    if _form_cache is None:
+        _form_cache = FormMappingCache()
+    return _form_cache
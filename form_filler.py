@@ -0,0 +1,211 @@
+"""
+Direct form filling through Browser MCP tools, without LLM reasoning.
+Used to replay known field mappings before the agent takes over.
+"""
+
+from typing import Optional, Dict, List, Tuple
+from pathlib import Path
+from page_snapshot import PageSnapshot, PageElement, parse_snapshot, is_snapshot
+from logger_setup import get_application_logger
+from user_context import USER_DETAILS
+from resume_parser import get_resume_profile
+from config import Config
+
+logger = get_application_logger()
+
+# Browser MCP tool names
+NAVIGATE_TOOL = "browser_navigate"
+SNAPSHOT_TOOL = "browser_snapshot"
+TYPE_TOOL = "browser_type"
+SELECT_TOOL = "browser_select_option"
+CLICK_TOOL = "browser_click"
+
+# Roles filled by typing vs. by selecting an option
+TYPED_ROLES = {"textbox", "searchbox", "spinbutton"}
+SELECT_ROLES = {"combobox", "listbox"}
+
+# USER_DETAILS keys that can be typed straight into a field
+FILLABLE_KEYS = [
+    "first_name", "last_name", "full_name", "email", "phone", "linkedin_url",
+    "github_url", "portfolio_url", "website_url", "location", "current_company", "current_title",
+    "school", "degree", "graduation_year", "notice_period",
+    "salary_expectation_min", "salary_expectation_max", "available_start_date",
+]
+
+def _latest_entry(section: str, resume_section: str) -> Dict:
+    """Most recent entry of a USER_DETAILS list, falling back to the parsed resume."""
+    entries = USER_DETAILS.get(section) or (get_resume_profile() or {}).get(resume_section) or [{}]
+    return entries[0]
+
+def get_user_value(key: str) -> str:
+    """
+    Resolve a USER_DETAILS key (or derived key such as 'full_name') to text.
+    
+    Work history, education and skills missing from USER_DETAILS are taken
+    from the parsed resume.
+    
+    Args:
+        key: USER_DETAILS key
+    
+    Returns:
+        The value as a string, or '' when unavailable
+    """
+    if key == "full_name":
+        return f"{USER_DETAILS.get('first_name', '')} {USER_DETAILS.get('last_name', '')}".strip()
+    if key in ("current_company", "current_title"):
+        experience = _latest_entry("work_experience", "experience")
+        return str(experience.get("company" if key == "current_company" else "title", "")).strip()
+    if key in ("school", "degree", "graduation_year"):
+        education = _latest_entry("education", "education")
+        if key == "school":
+            return str(education.get("university") or education.get("institution") or "").strip()
+        return str(education.get(key, "")).strip()
+    if key == "skills":
+        skills = USER_DETAILS.get("skills") or [
+            skill for items in (get_resume_profile() or {}).get("skills", {}).values() for skill in items
+        ]
+        return ", ".join(skills)
+    value = USER_DETAILS.get(key, "")
+    if isinstance(value, bool) or value is None:
+        return ""
+    return str(value).strip()
+
+def build_value_index() -> Dict[str, str]:
+    """Map each fillable user value (lowercased) back to its USER_DETAILS key."""
+    index = {}
+    for key in FILLABLE_KEYS:
+        value = get_user_value(key)
+        if value and value.lower() not in index:
+            index[value.lower()] = key
+    return index
+
+def find_tool(tools: List, name: str):
+    """Find a tool by name, returning None when the MCP server does not offer it."""
+    for tool in tools:
+        if tool.name == name:
+            return tool
+    return None
+
+def result_to_text(result) -> str:
+    """Flatten an MCP tool result (string or content blocks) into text."""
+    if isinstance(result, str):
+        return result
+    if isinstance(result, (list, tuple)):
+        parts = []
+        for item in result:
+            if isinstance(item, dict):
+                parts.append(str(item.get("text", "")))
+            else:
+                parts.append(result_to_text(item))
+        return "\n".join(part for part in parts if part)
+    return str(result)
+
+async def call_tool(tools: List, name: str, args: Dict) -> str:
+    """
+    Invoke a Browser MCP tool directly.
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        name: Tool name
+        args: Tool arguments
+    
+    Returns:
+        Tool output as text
+    
+    Raises:
+        KeyError: If the tool is not available
+    """
+    tool = find_tool(tools, name)
+    if tool is None:
+        raise KeyError(f"Browser tool not available: {name}")
+    return result_to_text(await tool.ainvoke(args))
+
+async def open_page(tools: List, url: str) -> PageSnapshot:
+    """Navigate to a URL and return the parsed page snapshot."""
+    text = await call_tool(tools, NAVIGATE_TOOL, {"url": url})
+    if not is_snapshot(text):
+        text = await call_tool(tools, SNAPSHOT_TOOL, {})
+    return parse_snapshot(text)
+
+async def take_snapshot(tools: List) -> PageSnapshot:
+    """Capture and parse the current page."""
+    return parse_snapshot(await call_tool(tools, SNAPSHOT_TOOL, {}))
+
+async def click_element(tools: List, element: PageElement) -> str:
+    """Click an element from the current snapshot and return the tool output."""
+    return await call_tool(tools, CLICK_TOOL, {
+        "element": element.label or element.role, "ref": element.ref
+    })
+
+async def upload_file(tools: List, button: PageElement, path: str) -> bool:
+    """
+    Upload a file through the page's file chooser.
+    
+    Clicks the button that opens the chooser, then hands the file to the
+    upload tool named by Config.BROWSER_UPLOAD_TOOL.
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        button: Element that opens the file chooser
+        path: Absolute path of the file to upload
+    
+    Returns:
+        True if the file was uploaded, False if the server has no upload tool or it failed
+    """
+    if find_tool(tools, Config.BROWSER_UPLOAD_TOOL) is None:
+        return False
+    try:
+        await click_element(tools, button)
+        await call_tool(tools, Config.BROWSER_UPLOAD_TOOL, {"paths": [path]})
+        logger.info(f"Uploaded {Path(path).name} via '{button.label}'")
+        return True
+    except Exception as e:
+        logger.warning(f"File upload failed for '{button.label}': {e}")
+        return False
+
+async def fill_field(tools: List, field: PageElement, value: str) -> bool:
+    """
+    Fill a single form field.
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        field: Field from the current snapshot
+        value: Text to type or option to select
+    
+    Returns:
+        True if the field was filled
+    """
+    element = field.label or field.role
+    try:
+        if field.role in TYPED_ROLES:
+            await call_tool(tools, TYPE_TOOL, {
+                "element": element, "ref": field.ref, "text": value, "submit": False
+            })
+            return True
+        if field.role in SELECT_ROLES:
+            await call_tool(tools, SELECT_TOOL, {
+                "element": element, "ref": field.ref, "values": [value]
+            })
+            return True
+    except Exception as e:
+        logger.warning(f"Direct fill failed for '{element}': {e}")
+    return False
+
+async def fill_fields(tools: List, assignments: List[Tuple[PageElement, str]]) -> List[PageElement]:
+    """
+    Fill several fields in order, skipping ones that fail.
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        assignments: (field, value) pairs
+    
+    Returns:
+        Fields that were filled (match them by ref; forms can repeat a label)
+    """
+    filled = []
+    for field, value in assignments:
+        if value and await fill_field(tools, field, value):
+            filled.append(field)
+    if filled:
+        logger.info(f"Filled {len(filled)} fields directly: {[field.label for field in filled]}")
+    return filled
@@ -0,0 +1,257 @@
+"""
+Job identity module for recognizing the same posting behind different URLs.
+Canonicalizes job URLs using the job-ID structure of common ATS platforms.
+"""
+
+import re
+from typing import Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from or set the page language
+TRACKING_PARAMS = {
+    "gh_src", "source", "src", "ref", "referrer", "refid", "trk", "trkinfo",
+    "trackingid", "lever-source", "lever-origin", "lever-via", "gclid",
+    "fbclid", "msclkid", "mc_cid", "mc_eid", "ccuid", "iis", "iisn",
+    "lang", "locale", "hl", "_ga", "ebp", "recommendedflavor",
+    "originalsubdomain", "alternatechannel", "geoid",
+}
+
+# Path segments Workday inserts for the page language (e.g. en-US)
+LOCALE_SEGMENT = re.compile(r"^[a-z]{2}(-[A-Za-z]{2})?$")
+UUID_PATTERN = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+DIGITS_PATTERN = re.compile(r"(\d{4,})")
+
+def detect_platform(url: str) -> str:
+    """
+    Detect the ATS platform hosting a job URL.
+    
+    Args:
+        url: Job posting or application URL
+    
+    Returns:
+        One of 'greenhouse', 'lever', 'workday', 'linkedin', 'taleo',
+        'icims' or 'custom'
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    query = {k.lower(): v for k, v in parse_qsl(parts.query)}
+    
+    if host.endswith("greenhouse.io") or "gh_jid" in query:
+        return "greenhouse"
+    if host.endswith("lever.co"):
+        return "lever"
+    if host.endswith("myworkdayjobs.com") or host.endswith("myworkdaysite.com"):
+        return "workday"
+    if host.endswith("linkedin.com"):
+        return "linkedin"
+    if host.endswith("taleo.net"):
+        return "taleo"
+    if host.endswith("icims.com"):
+        return "icims"
+    return "custom"
+
+def _greenhouse_job_id(segments: list, query: dict) -> Optional[str]:
+    """Extract a Greenhouse job ID from path segments or query parameters."""
+    if query.get("gh_jid"):
+        return query["gh_jid"]
+    # Embedded boards: /embed/job_app?for=<board>&token=<id>
+    if query.get("token"):
+        return query["token"]
+    if "jobs" in segments:
+        index = segments.index("jobs")
+        if index + 1 < len(segments) and segments[index + 1].isdigit():
+            return segments[index + 1]
+    return None
+
+def _lever_job_id(segments: list) -> Optional[str]:
+    """Extract a Lever posting UUID from path segments."""
+    for segment in segments:
+        if UUID_PATTERN.match(segment):
+            return segment.lower()
+    return None
+
+def _workday_job_id(host: str, segments: list) -> Optional[str]:
+    """Extract a Workday tenant and requisition ID from path segments."""
+    tenant = host.split(".")[0]
+    for marker in ("job", "details"):
+        if marker in segments:
+            for segment in segments[segments.index(marker) + 1:]:
+                # The title slug ends with the requisition ID, e.g. Software-Engineer_R12345
+                if "_" in segment:
+                    requisition = segment.rsplit("_", 1)[1]
+                    return f"{tenant}:{requisition.lower()}"
+    return None
+
+def _linkedin_job_id(segments: list, query: dict) -> Optional[str]:
+    """Extract a LinkedIn job ID from the view path or search parameters."""
+    if query.get("currentjobid"):
+        return query["currentjobid"]
+    if "view" in segments:
+        index = segments.index("view")
+        if index + 1 < len(segments):
+            # /jobs/view/<id> or /jobs/view/<title-slug>-<id>
+            match = DIGITS_PATTERN.findall(segments[index + 1])
+            if match:
+                return match[-1]
+    return None
+
+def _taleo_job_id(host: str, query: dict) -> Optional[str]:
+    """Extract a Taleo tenant and job ID from the query string."""
+    job = query.get("job") or query.get("requisitionno")
+    if job:
+        return f"{host.split('.')[0]}:{job.lower()}"
+    return None
+
+def _icims_job_id(host: str, segments: list) -> Optional[str]:
+    """Extract an iCIMS tenant and job ID from path segments."""
+    if "jobs" in segments:
+        index = segments.index("jobs")
+        if index + 1 < len(segments) and segments[index + 1].isdigit():
+            return f"{host.split('.')[0]}:{segments[index + 1]}"
+    return None
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL by dropping tracking parameters, fragments and noise.
+    
+    Args:
+        url: URL to normalize
+    
+    Returns:
+        Normalized URL string without the scheme
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    
+    path = re.sub(r"/+", "/", parts.path).rstrip("/")
+    params = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    query = f"?{urlencode(params)}" if params else ""
+    return f"{host}{path}{query}"
+
+def parse_job_identity(url: str) -> Tuple[str, Optional[str]]:
+    """
+    Identify the platform and platform-specific job ID of a URL.
+    
+    Args:
+        url: Job posting or application URL
+    
+    Returns:
+        Tuple of (platform, job ID); the job ID is None when the URL does
+        not follow a known ATS structure
+    """
+    platform = detect_platform(url)
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    segments = [s for s in parts.path.split("/") if s]
+    query = {k.lower(): v for k, v in parse_qsl(parts.query)}
+    
+    if platform == "greenhouse":
+        return platform, _greenhouse_job_id(segments, query)
+    if platform == "lever":
+        return platform, _lever_job_id(segments)
+    if platform == "workday":
+        segments = [s for s in segments if not LOCALE_SEGMENT.match(s)]
+        return platform, _workday_job_id(host, segments)
+    if platform == "linkedin":
+        return platform, _linkedin_job_id(segments, query)
+    if platform == "taleo":
+        return platform, _taleo_job_id(host, query)
+    if platform == "icims":
+        return platform, _icims_job_id(host, segments)
+    return platform, None
+
+def canonicalize_job_url(url: str) -> str:
+    """
+    Build the canonical key identifying the job behind a URL.
+    
+    URLs that differ only in tracking parameters, locale, apply-page suffixes
+    or redirect forms map to the same key, e.g. 'greenhouse:4012345'.
+    
+    Args:
+        url: Job posting or application URL
+    
+    Returns:
+        Canonical job key
+    """
+    platform, job_id = parse_job_identity(url)
+    if job_id:
+        return f"{platform}:{job_id}"
+    return f"url:{normalize_url(url)}"
+
+# Page title layouts used by ATS platforms and career sites, most specific first
+TITLE_PATTERNS = [
+    re.compile(r"^(?P<company>.+?) hiring (?P<position>.+?)(?: in .+)?(?: \| LinkedIn)?$", re.I),
+    re.compile(r"^(?P<position>.+?) at (?P<company>.+?)(?: [|\-–] .+)?$", re.I),
+    re.compile(r"^(?P<company>[^|\-–]+?) [\-–] (?P<position>.+?)(?: [|\-–] .+)?$"),
+]
+
+# Title fragments that name the page rather than the job
+TITLE_PREFIX = re.compile(r"^(job )?application( form)? for\s+", re.I)
+TITLE_NOISE = re.compile(r"\s*[|\-–]\s*(careers?|jobs?|apply( now)?|job board|workday|lever|greenhouse)\s*$", re.I)
+
+# Hosts that carry the company in the first path segment
+BOARD_HOSTS = ("greenhouse.io", "lever.co", "ashbyhq.com", "workable.com")
+
+def company_from_url(url: str) -> Optional[str]:
+    """
+    Guess the company name from an ATS URL.
+    
+    Args:
+        url: Job posting or application URL
+    
+    Returns:
+        Company name (e.g. 'Acme Robotics' from jobs.lever.co/acme-robotics/...),
+        or None if the URL gives no hint
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    segments = [s for s in parts.path.split("/") if s]
+    
+    if host.endswith(BOARD_HOSTS):
+        slug = segments[0] if segments and segments[0] not in ("embed", "jobs") else None
+    elif detect_platform(url) in ("workday", "taleo", "icims"):
+        slug = host.split(".")[0]
+    elif detect_platform(url) == "custom" and "." in host:
+        # careers.acme.com -> acme, jobs.acme.co.uk -> acme
+        labels = [label for label in host.split(".")[:-1] if label not in ("co", "com", "ac", "org")]
+        slug = labels[-1] if labels else None
+    else:
+        slug = None
+    if not slug:
+        return None
+    return re.sub(r"[-_]+", " ", slug).strip().title() or None
+
+def infer_job_details(title: str, url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Infer the company and position from a page title, falling back to the URL.
+    
+    Args:
+        title: Page title from a snapshot
+        url: Job posting or application URL
+    
+    Returns:
+        Tuple of (company, position); either is None if it could not be inferred
+    """
+    title = TITLE_PREFIX.sub("", title.strip())
+    while TITLE_NOISE.search(title):
+        title = TITLE_NOISE.sub("", title)
+    
+    company, position = None, None
+    for pattern in TITLE_PATTERNS:
+        match = pattern.match(title)
+        if match:
+            company, position = match.group("company").strip(), match.group("position").strip()
+            break
+    else:
+        position = title or None
+    
+    url_company = company_from_url(url)
+    # A job title next to the company is ambiguous in 'A - B' titles; trust the URL
+    if url_company and company and url_company.lower() == (position or "").lower():
+        company, position = position, company
+    return company or url_company, position
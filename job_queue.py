@@ -0,0 +1,107 @@
+"""
+Streaming job queue for unattended batch runs.
+Reads jobs from a JSONL file one line at a time and writes one JSON result line per job.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Iterator, Tuple
+from application_tracker import ApplicationTracker, ApplicationStatus
+from logger_setup import get_system_logger
+
+logger = get_system_logger()
+
+# What to do with a job the tracker has seen before:
+#   skip          - never apply again
+#   retry-failed  - apply again unless the earlier application completed
+#   reapply       - always apply again
+DUPLICATE_POLICIES = ("skip", "retry-failed", "reapply")
+
+def iter_jsonl_jobs(path: Path) -> Iterator[Dict]:
+    """
+    Stream jobs from a JSONL file without reading it into memory.
+    
+    Each line is a JSON object with a 'url' key and optional 'company' and
+    'position' keys; missing values are left as None so they can be inferred
+    from the page. A line may also be a bare JSON string holding the URL.
+    Blank lines and lines starting with '#' are ignored, and malformed lines
+    are logged and skipped.
+    
+    Args:
+        path: Path to the JSONL file
+    
+    Yields:
+        Job dictionaries with url, company and position keys, plus the
+        source line number under 'line'
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"{path}:{line_number}: invalid JSON ({e}), skipping")
+                continue
+            if isinstance(record, str):
+                record = {"url": record}
+            url = record.get("url") if isinstance(record, dict) else None
+            if not url or not isinstance(url, str):
+                logger.warning(f"{path}:{line_number}: no 'url' in job, skipping")
+                continue
+            yield {
+                "url": url.strip(),
+                "company": record.get("company") or None,
+                "position": record.get("position") or None,
+                "line": line_number,
+            }
+
+def check_duplicate(tracker: ApplicationTracker, url: str, policy: str) -> Tuple[bool, Optional[Dict]]:
+    """
+    Decide whether to apply to a job the tracker may already know.
+    
+    Args:
+        tracker: Application tracker
+        url: Job application URL
+        policy: One of DUPLICATE_POLICIES
+    
+    Returns:
+        Tuple of (should apply, existing application record or None)
+    """
+    existing = tracker.find_duplicate(url)
+    if existing is None or policy == "reapply":
+        return True, existing
+    if policy == "retry-failed":
+        return existing["status"] != ApplicationStatus.COMPLETED.value, existing
+    return False, existing
+
+class ResultWriter:
+    """Appends one JSON line per finished job and flushes it immediately."""
+    
+    def __init__(self, path: Path):
+        """
+        Create a writer that appends to a results file when entered.
+        
+        Args:
+            path: JSONL file to write results to
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+    
+    def __enter__(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._file.close()
+    
+    def write(self, result: Dict):
+        """Write one result record, stamped with the time it finished."""
+        line = json.dumps({**result, "finished_at": datetime.now().isoformat()}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
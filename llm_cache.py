@@ -0,0 +1,270 @@
+"""
+Disk-backed LLM response cache for the agent's chat model.
+Replays identical agent turns (same messages, tools and model) from earlier runs without calling the model.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration
+from logger_setup import get_system_logger
+from config import Config
+
+logger = get_system_logger()
+
+# Message fields that describe a model run rather than the conversation
+RUN_METADATA_FIELDS = ("id", "usage_metadata", "response_metadata")
+
+# Keys of the model calls made within track_turns(); a list, so lookups run
+# in executor threads (which get a copy of the context) still record into it
+_turn_keys = contextvars.ContextVar("llm_cache_turn_keys", default=None)
+
+def _strip_run_ids(prompt: str) -> str:
+    """
+    Drop per-run bookkeeping from a serialized prompt.
+    
+    LangChain stamps each model response with an ID derived from its run and
+    with usage metadata that differs between a fresh and a cached response,
+    so the same conversation replayed in a new run would never produce the
+    same key. Message content, tool calls and tool results are kept.
+    
+    Args:
+        prompt: Messages serialized by LangChain (a JSON list)
+    
+    Returns:
+        The prompt re-serialized without run metadata, or unchanged if it is not JSON
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+    for message in messages:
+        if isinstance(message, dict) and isinstance(message.get("kwargs"), dict):
+            for field in RUN_METADATA_FIELDS:
+                message["kwargs"].pop(field, None)
+    return json.dumps(messages, sort_keys=True, ensure_ascii=False)
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """
+    Hash a model call into a cache key.
+    
+    Args:
+        prompt: Serialized messages of the call
+        llm_string: LangChain's description of the model, its parameters and bound tools
+    
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256(_strip_run_ids(prompt).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(llm_string.encode("utf-8"))
+    return digest.hexdigest()
+
+class LLMResponseCache(BaseCache):
+    """
+    LRU cache of chat model responses with a time-to-live, saved to disk.
+    
+    Pass an instance as the `cache` argument of a LangChain chat model. Only
+    chat generations are stored; anything else is passed through uncached.
+    New responses are written to disk every Config.LLM_CACHE_SAVE_INTERVAL
+    updates and on flush(), which also runs at exit.
+    """
+    
+    def __init__(self, cache_file: Optional[Path] = None, max_entries: int = None, ttl: float = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_file: JSON file backing the cache (defaults to Config.LLM_CACHE_FILE)
+            max_entries: Maximum number of responses kept (defaults to Config.LLM_CACHE_MAX_ENTRIES)
+            ttl: Seconds a response stays valid (defaults to Config.LLM_CACHE_TTL)
+        """
+        self.cache_file = Path(cache_file or Config.LLM_CACHE_FILE)
+        self.max_entries = max_entries or Config.LLM_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else Config.LLM_CACHE_TTL
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._entries = self._load()
+    
+    def _is_expired(self, entry: Dict, now: float) -> bool:
+        return now - entry.get("created_at", 0) > self.ttl
+    
+    def _load(self) -> "OrderedDict[str, Dict]":
+        """Load unexpired responses, least recently used first."""
+        if not self.cache_file.exists():
+            return OrderedDict()
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            now = time.time()
+            entries = sorted(
+                ((key, entry) for key, entry in data.items() if not self._is_expired(entry, now)),
+                key=lambda item: item[1].get("last_used", 0)
+            )
+            logger.info(f"Loaded {len(entries)} cached LLM responses ({len(data) - len(entries)} expired)")
+            return OrderedDict(entries)
+        except Exception as e:
+            logger.error(f"Error loading LLM cache: {e}")
+            return OrderedDict()
+    
+    def save(self):
+        """Write the cache to disk atomically."""
+        try:
+            with self._lock:
+                tmp_file = self.cache_file.with_suffix(".json.tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f, ensure_ascii=False, default=str)
+                os.replace(tmp_file, self.cache_file)
+                self._unsaved = 0
+        except Exception as e:
+            logger.error(f"Error saving LLM cache: {e}")
+    
+    def flush(self):
+        """Write the cache to disk if it has unsaved responses."""
+        if self._unsaved:
+            self.save()
+    
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """
+        Return the cached response for a model call, if present and not expired.
+        
+        Args:
+            prompt: Serialized messages of the call
+            llm_string: LangChain's description of the model and call parameters
+        
+        Returns:
+            List of chat generations, or None on a miss
+        """
+        key = cache_key(prompt, llm_string)
+        turn_keys = _turn_keys.get()
+        if turn_keys is not None:
+            turn_keys.append(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry, time.time()):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["last_used"] = time.time()
+            self._entries.move_to_end(key)
+            generations = entry["generations"]
+        logger.debug(f"LLM cache hit {key[:10]}")
+        messages = messages_from_dict([generation["message"] for generation in generations])
+        return [
+            ChatGeneration(message=message, generation_info=generation.get("generation_info"))
+            for message, generation in zip(messages, generations)
+        ]
+    
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE):
+        """
+        Store the response to a model call, saving the cache every few updates.
+        
+        Args:
+            prompt: Serialized messages of the call
+            llm_string: LangChain's description of the model and call parameters
+            return_val: Generations returned by the model
+        """
+        if not return_val or not all(isinstance(generation, ChatGeneration) for generation in return_val):
+            return
+        now = time.time()
+        entry = {
+            "created_at": now,
+            "last_used": now,
+            "generations": [
+                {"message": message_to_dict(generation.message), "generation_info": generation.generation_info}
+                for generation in return_val
+            ],
+        }
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._unsaved += 1
+            due = self._unsaved >= Config.LLM_CACHE_SAVE_INTERVAL
+        if due:
+            self.save()
+    
+    @contextlib.contextmanager
+    def track_turns(self):
+        """
+        Evict the response of the turn an exception was raised in.
+        
+        Used around each agent attempt: when it fails, the last model call
+        made within this context is the turn whose decision led to the
+        error, so its cached response is dropped and a retry asks the model
+        again. The earlier turns of the attempt are still replayed.
+        """
+        turn_keys = []
+        token = _turn_keys.set(turn_keys)
+        try:
+            yield
+        except Exception:
+            if turn_keys:
+                self.evict(turn_keys[-1])
+            raise
+        finally:
+            _turn_keys.reset(token)
+    
+    def evict(self, key: str):
+        """
+        Drop one cached response.
+        
+        Args:
+            key: Cache key of the response (see cache_key)
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return
+            self.evicted += 1
+            self._unsaved += 1
+        logger.debug(f"Evicted cached LLM response {key[:10]}")
+    
+    def clear(self, **kwargs: Any):
+        """Remove every cached response and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evicted = 0
+        self.save()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return entry count, hits, misses, responses evicted after failed turns and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the shared LLM response cache."""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache()
+        atexit.register(_llm_cache.flush)
+    return _llm_cache
@@ -1,21 +1,114 @@
 """
 Logging setup module for structured logging across the application.
 Provides separate loggers for application events and system events.
+
+Records are handed to a queue and written by a background listener thread,
+so file and console I/O never runs on the event loop.
 """
 
+import atexit
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import sys
+from pathlib import Path
 from config import Config
 
 # Custom log format with timestamp, level, and message
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Listeners started by setup_logger, stopped (and flushed) at exit
+_listeners = []
+
+def truncate_for_log(value, limit: int = None) -> str:
+    """
+    Render a value for logging, capping its length.
+    
+    Args:
+        value: Value to render (tool inputs, agent output, ...)
+        limit: Maximum characters kept (defaults to Config.LOG_MAX_FIELD_CHARS)
+    
+    Returns:
+        String representation, truncated with a marker if too long
+    """
+    if limit is None:
+        limit = Config.LOG_MAX_FIELD_CHARS
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [truncated {len(text) - limit} chars]"
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as compact single-line JSON objects."""
+    
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, DATE_FORMAT),
+            "logger": record.name,
+            "level": record.levelname,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class TruncatingQueueHandler(QueueHandler):
+    """
+    Queue handler that caps message size before the record is enqueued.
+    
+    The traceback stays in exc_text, apart from the message, so the
+    listener's formatters still render it. A long traceback is cut from the
+    front, keeping the frames nearest the error and the exception itself.
+    """
+    
+    def prepare(self, record):
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        
+        record = copy.copy(record)
+        record.msg = truncate_for_log(record.getMessage(), Config.LOG_MAX_MESSAGE_CHARS)
+        record.args = None
+        # Formatters render exc_text as is; with exc_info they would format the full traceback again
+        record.exc_info = None
+        limit = Config.LOG_MAX_MESSAGE_CHARS
+        if exc_text and len(exc_text) > limit:
+            exc_text = f"[truncated {len(exc_text) - limit} chars] ...{exc_text[-limit:]}"
+        record.exc_text = exc_text
+        return record
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that creates the log directory when the file is first opened, not at import."""
+    
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+def _create_formatter() -> logging.Formatter:
+    """Create the formatter selected by Config.LOG_FORMAT_STYLE."""
+    if Config.LOG_FORMAT_STYLE == "json":
+        return JsonLinesFormatter()
+    return logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+
+def stop_logging():
+    """Stop all queue listeners, flushing records that are still queued."""
+    while _listeners:
+        _listeners.pop().stop()
+
+atexit.register(stop_logging)
+
 def setup_logger(name, log_file, level=None):
     """
     Set up a logger with both file and console handlers.
     
+    The logger itself only enqueues records; a QueueListener thread owns the
+    file and console handlers.
+    
     Args:
         name: Logger name
         log_file: Path to log file
@@ -34,15 +127,16 @@ def setup_logger(name, log_file, level=None):
     if logger.handlers:
         return logger
     
-    # File handler with rotation
-    file_handler = RotatingFileHandler(
+    # File handler with rotation; the file and its directory are only created
+    # by the listener thread when the first record is written
+    file_handler = LazyRotatingFileHandler(
         log_file,
         maxBytes=Config.LOG_MAX_BYTES,
-        backupCount=Config.LOG_BACKUP_COUNT
+        backupCount=Config.LOG_BACKUP_COUNT,
+        delay=True
     )
     file_handler.setLevel(level)
-    file_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-    file_handler.setFormatter(file_formatter)
+    file_handler.setFormatter(_create_formatter())
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -50,9 +144,14 @@ def setup_logger(name, log_file, level=None):
     console_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
     console_handler.setFormatter(console_formatter)
     
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # The logger only enqueues; the listener thread does the actual writes
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    
+    logger.addHandler(TruncatingQueueHandler(log_queue))
+    logger.propagate = False
     
     return logger
 
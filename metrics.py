@@ -0,0 +1,189 @@
+"""
+Prometheus-format metrics for long-running agent sessions.
+Keeps counters and histograms in memory and serves them from the main event loop.
+"""
+
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from typing import Optional, Dict, List, Tuple
+from logger_setup import get_system_logger
+from config import Config
+
+logger = get_system_logger()
+
+# Histogram bucket upper bounds, in seconds
+APPLICATION_DURATION_BUCKETS = (30, 60, 120, 180, 300, 600, 900, 1800, 3600)
+TOOL_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """Render a Prometheus label set, e.g. '{status="completed"}'."""
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Counter:
+    """Monotonic counter with optional labels."""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, *labels: str, amount: float = 1.0):
+        """Increment the series for the given label values."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Tuple[float, ...],
+        labelnames: Tuple[str, ...] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self.labelnames = labelnames
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, *labels: str):
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{_format_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+                label_text = _format_labels(self.labelnames, labels)
+                lines.append(f"{self.name}_sum{label_text} {_format_number(round(total, 6))}")
+                lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+STARTED_AT = time.time()
+
+APPLICATION_OUTCOMES = Counter(
+    "job_application_status_transitions_total",
+    "Application status transitions recorded by the tracker, by new status.",
+    ("status",),
+)
+APPLICATION_ERRORS = Counter(
+    "job_application_errors_total",
+    "Errors passed to handle_error, by error category.",
+    ("category",),
+)
+APPLICATION_DURATION = Histogram(
+    "job_application_duration_seconds",
+    "Time from creating an application to its final status.",
+    APPLICATION_DURATION_BUCKETS,
+)
+TOOL_CALL_LATENCY = Histogram(
+    "job_application_tool_call_seconds",
+    "Browser tool call latency, by tool.",
+    TOOL_LATENCY_BUCKETS,
+    ("tool",),
+)
+LLM_LATENCY = Histogram(
+    "job_application_llm_seconds",
+    "LLM call latency per agent turn.",
+    LLM_LATENCY_BUCKETS,
+)
+
+REGISTRY = [APPLICATION_OUTCOMES, APPLICATION_ERRORS, APPLICATION_DURATION, TOOL_CALL_LATENCY, LLM_LATENCY]
+
+def render_metrics() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP job_application_agent_start_time_seconds Unix time the agent process started.",
+        "# TYPE job_application_agent_start_time_seconds gauge",
+        f"job_application_agent_start_time_seconds {_format_number(round(STARTED_AT, 3))}",
+    ]
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+async def _handle_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Answer one HTTP request: GET /metrics returns the metrics, anything else 404."""
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, body = "200 OK", render_metrics().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            status, body, content_type = "404 Not Found", b"Not found\n", "text/plain"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+async def start_metrics_server(host: str = None, port: int = None) -> Optional[asyncio.AbstractServer]:
+    """
+    Serve /metrics on the running event loop.
+    
+    Args:
+        host: Interface to bind (defaults to Config.METRICS_HOST)
+        port: Port to bind (defaults to Config.METRICS_PORT)
+    
+    Returns:
+        The asyncio server, or None if it could not be started
+    """
+    host = host or Config.METRICS_HOST
+    port = port if port is not None else Config.METRICS_PORT
+    try:
+        server = await asyncio.start_server(_handle_request, host, port)
+    except OSError as e:
+        logger.error(f"Could not start metrics server on {host}:{port}: {e}")
+        return None
+    logger.info(f"Metrics available at http://{host}:{port}/metrics")
+    return server
+
+async def stop_metrics_server(server: Optional[asyncio.AbstractServer]):
+    """Close a server returned by start_metrics_server."""
+    if server is not None:
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,203 @@
+"""
+Two-tier model routing for the agent loop.
+Sends routine turns to the fast default model and screening, unmapped fields and recovery turns to a stronger model.
+"""
+
+import threading
+import time
+from typing import Optional, Dict, List, Tuple, Any
+from uuid import UUID
+from langchain_core.callbacks import AsyncCallbackHandler
+from page_snapshot import PageSnapshot, is_snapshot, parse_snapshot
+from playbooks import unmapped_fields
+from profiler import estimate_prompt_tokens, response_tokens
+from tool_selector import ToolSelector
+from logger_setup import get_system_logger
+from config import Config
+
+logger = get_system_logger()
+
+FAST = "fast"
+STRONG = "strong"
+
+# Why a turn went to the model it did
+ROUTINE = "routine"
+SCREENING = "screening"
+UNMAPPED_FIELDS = "unmapped_fields"
+RECOVERY = "recovery"
+
+def latest_snapshot(steps: List[Tuple[Any, Any]]) -> Optional[PageSnapshot]:
+    """Parse the most recent page snapshot in the steps, if any."""
+    for _action, observation in reversed(steps):
+        text = str(observation)
+        if is_snapshot(text):
+            return parse_snapshot(text)
+    return None
+
+def _needs_recovery(steps: List[Tuple[Any, Any]]) -> bool:
+    """Whether the last tool call failed or repeated the one before it."""
+    if not steps:
+        return False
+    action, observation = steps[-1]
+    if str(observation).strip().lower().startswith("error"):
+        return True
+    if len(steps) > 1:
+        previous, _observation = steps[-2]
+        return action.tool == previous.tool and action.tool_input == previous.tool_input
+    return False
+
+def choose_tier(phase: str, steps: List[Tuple[Any, Any]]) -> Tuple[str, str]:
+    """
+    Decide which model takes the next agent turn.
+    
+    Navigation, snapshot reading and standard field fills are routine.
+    Screening pages, fields no playbook rule maps, and recovering from a
+    failed or repeated tool call need the stronger model.
+    
+    Args:
+        phase: Phase from phase_detector.detect_phase
+        steps: (AgentAction, observation) pairs so far, including restored ones
+    
+    Returns:
+        Tuple of (FAST or STRONG, reason)
+    """
+    if _needs_recovery(steps):
+        return STRONG, RECOVERY
+    if phase == "screening":
+        return STRONG, SCREENING
+    if phase == "filling":
+        snapshot = latest_snapshot(steps)
+        if snapshot is not None and unmapped_fields(snapshot.form_fields):
+            return STRONG, UNMAPPED_FIELDS
+    return FAST, ROUTINE
+
+class RoutingStats:
+    """Running totals of routing decisions and of each model's calls, latency and cost."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.decisions: Dict[str, int] = {}
+        self.models: Dict[str, Dict[str, Any]] = {}
+    
+    def record_decision(self, tier: str, reason: str):
+        """Count one routed turn."""
+        with self._lock:
+            key = f"{tier}/{reason}"
+            self.decisions[key] = self.decisions.get(key, 0) + 1
+    
+    def record_call(self, tier: str, model: str, seconds: float, input_tokens: int, output_tokens: int, cost: float):
+        """Add one model call."""
+        with self._lock:
+            totals = self.models.setdefault(tier, {
+                "model": model, "calls": 0, "seconds": 0.0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0,
+            })
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+            totals["input_tokens"] += input_tokens
+            totals["output_tokens"] += output_tokens
+            totals["cost"] += cost
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return decision counts and per-model calls, average latency, tokens and cost."""
+        with self._lock:
+            models = {
+                tier: {
+                    "model": totals["model"],
+                    "calls": totals["calls"],
+                    "avg_seconds": round(totals["seconds"] / totals["calls"], 3) if totals["calls"] else 0.0,
+                    "input_tokens": totals["input_tokens"],
+                    "output_tokens": totals["output_tokens"],
+                    "cost": round(totals["cost"], 6),
+                }
+                for tier, totals in self.models.items()
+            }
+            return {"decisions": dict(self.decisions), "models": models}
+
+routing_stats = RoutingStats()
+
+def model_name(llm) -> str:
+    """Name of a chat model for reports (its model ID where it has one)."""
+    return getattr(llm, "model_id", None) or getattr(llm, "model_name", None) or llm._llm_type
+
+class ModelUsageCallbackHandler(AsyncCallbackHandler):
+    """Records the latency, tokens and estimated cost of one model tier's calls."""
+    
+    def __init__(self, tier: str, model: str, input_price: float, output_price: float):
+        """
+        Initialize the handler.
+        
+        Args:
+            tier: FAST or STRONG
+            model: Model name for reports
+            input_price: USD per million input tokens
+            output_price: USD per million output tokens
+        """
+        self.tier = tier
+        self.model = model
+        self.input_price = input_price
+        self.output_price = output_price
+        self._calls: Dict[UUID, tuple] = {}
+    
+    async def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List], *, run_id: UUID, **kwargs):
+        self._calls[run_id] = (time.monotonic(), estimate_prompt_tokens(messages))
+    
+    async def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        started, prompt_tokens = self._calls.pop(run_id, (None, 0))
+        if started is None:
+            return
+        input_tokens, output_tokens = response_tokens(response, prompt_tokens)
+        cost = (input_tokens * self.input_price + output_tokens * self.output_price) / 1_000_000
+        routing_stats.record_call(self.tier, self.model, time.monotonic() - started, input_tokens, output_tokens, cost)
+    
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        started, prompt_tokens = self._calls.pop(run_id, (None, 0))
+        if started is not None:
+            cost = prompt_tokens * self.input_price / 1_000_000
+            routing_stats.record_call(self.tier, self.model, time.monotonic() - started, prompt_tokens, 0, cost)
+
+class ModelRouter:
+    """Picks the model, bound to the current phase's tools, for each agent turn."""
+    
+    def __init__(self, llm, tools: List, strong_llm=None):
+        """
+        Bind each model to the tools.
+        
+        Args:
+            llm: Default (fast) chat model; takes every turn without a strong model
+            tools: Tools loaded from the MCP session
+            strong_llm: Optional stronger chat model for turns that need reasoning
+        """
+        self.routing = strong_llm is not None
+        self._models = {FAST: self._bind(FAST, llm, tools, Config.LLM_INPUT_PRICE, Config.LLM_OUTPUT_PRICE)}
+        if self.routing:
+            self._models[STRONG] = self._bind(
+                STRONG, strong_llm, tools, Config.STRONG_LLM_INPUT_PRICE, Config.STRONG_LLM_OUTPUT_PRICE
+            )
+    
+    @staticmethod
+    def _bind(tier: str, llm, tools: List, input_price: float, output_price: float) -> Tuple[ToolSelector, List]:
+        handler = ModelUsageCallbackHandler(tier, model_name(llm), input_price, output_price)
+        return ToolSelector(llm, tools), [handler]
+    
+    def model_for(self, phase: str, steps: List[Tuple[Any, Any]]):
+        """
+        Return the model for the next turn.
+        
+        Args:
+            phase: Phase of the next turn
+            steps: (AgentAction, observation) pairs so far, including restored ones
+        
+        Returns:
+            Tool-bound chat model that records its usage
+        """
+        tier = FAST
+        if self.routing:
+            tier, reason = choose_tier(phase, steps)
+            routing_stats.record_decision(tier, reason)
+            logger.debug(f"Step {len(steps) + 1} routed to the {tier} model ({reason})")
+        selector, callbacks = self._models[tier]
+        return selector.model_for(phase).with_config(callbacks=callbacks)
+
+def get_routing_stats() -> Dict[str, Any]:
+    """Get routing decisions and per-model usage for this process."""
+    return routing_stats.get_stats()
@@ -0,0 +1,157 @@
+"""
+Outcome detection for browser tool results.
+Recognizes confirmation pages and CAPTCHA or login walls so an application can stop without further LLM turns.
+"""
+
+import re
+from typing import Optional, Any
+from form_filler import CLICK_TOOL
+from page_snapshot import PageSnapshot, is_snapshot, parse_snapshot
+from prompts import SUCCESS_INDICATORS
+from application_tracker import ApplicationStatus
+from error_handler import ApplicationError, CaptchaError, AuthenticationError
+
+SUBMITTED = "submitted"
+CAPTCHA = "captcha"
+LOGIN_REQUIRED = "login_required"
+
+# Status an application ends in for each outcome
+OUTCOME_STATUSES = {
+    SUBMITTED: ApplicationStatus.COMPLETED,
+    CAPTCHA: ApplicationStatus.REQUIRES_MANUAL,
+    LOGIN_REQUIRED: ApplicationStatus.REQUIRES_MANUAL,
+}
+
+# Confirmation pages keep at most a field or two (e.g. a job alert signup)
+MAX_CONFIRMATION_FIELDS = 2
+
+# Interactive challenges; passive badges ("protected by reCAPTCHA") are not blocking
+CAPTCHA_PATTERN = re.compile(
+    r"i'?m not a robot|verify (?:that )?you(?:'re| are) (?:a )?human|"
+    r"(?:complete|solve) the (?:captcha|security check)|please complete captcha|"
+    r"(?:re|h)?captcha challenge|checking your browser|press (?:and|&) hold|"
+    r"select all (?:images|squares)",
+    re.I
+)
+
+# Sign-in walls and expired sessions
+LOGIN_PATTERN = re.compile(
+    r"session (?:has )?expired|(?:sign|log) in to (?:continue|apply)|"
+    r"please (?:sign|log) in|you must be (?:signed|logged) in",
+    re.I
+)
+PASSWORD_FIELD_PATTERN = re.compile(r"\bpassword\b", re.I)
+
+# Buttons that submit an application or one of its steps
+SUBMIT_BUTTON_PATTERN = re.compile(r"\bsubmit\b|\bsend (?:my |your )?application\b", re.I)
+
+def _normalize(text: str) -> str:
+    return text.replace("’", "'").lower()
+
+def page_text(snapshot: PageSnapshot) -> str:
+    """Visible text of a page: its title plus element labels and values."""
+    parts = [snapshot.title] + [f"{element.label} {element.value}" for element in snapshot.elements]
+    return _normalize(" ".join(parts))
+
+def classify_page(snapshot: PageSnapshot, after_submit: bool = False) -> Optional[str]:
+    """
+    Decide whether a page ends the application.
+    
+    Blocking states win over success: a sign-in form, or a CAPTCHA that
+    blocks progress, means the agent cannot continue, whatever else the page
+    says. A CAPTCHA blocks when it is all the page offers (an interstitial
+    challenge) or when it is still shown after the form was submitted; a
+    challenge checkbox inside a form the agent is still filling does not.
+    
+    Args:
+        snapshot: Parsed page snapshot
+        after_submit: The snapshot is the result of clicking a submit button
+    
+    Returns:
+        SUBMITTED, CAPTCHA, LOGIN_REQUIRED, or None to keep going
+    """
+    text = page_text(snapshot)
+    fields = snapshot.form_fields
+    if CAPTCHA_PATTERN.search(text):
+        other_fields = [field for field in fields if not CAPTCHA_PATTERN.search(_normalize(field.label))]
+        if after_submit or not other_fields:
+            return CAPTCHA
+    if LOGIN_PATTERN.search(text) or any(
+        field.role == "textbox" and PASSWORD_FIELD_PATTERN.search(field.label) for field in fields
+    ):
+        return LOGIN_REQUIRED
+    if len(fields) <= MAX_CONFIRMATION_FIELDS and any(
+        _normalize(indicator) in text for indicator in SUCCESS_INDICATORS
+    ):
+        return SUBMITTED
+    return None
+
+def is_submit_click(action: Any) -> bool:
+    """Check whether an agent action clicks a submit button."""
+    if action is None or getattr(action, "tool", None) != CLICK_TOOL:
+        return False
+    tool_input = action.tool_input if isinstance(action.tool_input, dict) else {}
+    return bool(SUBMIT_BUTTON_PATTERN.search(str(tool_input.get("element", ""))))
+
+def outcome_error(outcome: Optional[str], url: str) -> Optional[ApplicationError]:
+    """Exception describing a blocking outcome on a page, or None."""
+    if outcome == CAPTCHA:
+        return CaptchaError(f"CAPTCHA detected at {url} - manual intervention required")
+    if outcome == LOGIN_REQUIRED:
+        return AuthenticationError(f"Sign-in required at {url}")
+    return None
+
+class OutcomeDetector:
+    """Watches the tool results of one agent run for a final outcome."""
+    
+    def __init__(self):
+        self.outcome: Optional[str] = None
+        self.url = ""
+    
+    def check(self, observation, action: Any = None) -> Optional[str]:
+        """
+        Classify one tool result; results without a page snapshot are ignored.
+        
+        Args:
+            observation: Tool result from the agent's step
+            action: The step's AgentAction, used to tell a submit click apart
+        
+        Returns:
+            The detected outcome, or None
+        """
+        text = str(observation)
+        if self.outcome is None and is_snapshot(text):
+            snapshot = parse_snapshot(text)
+            self.outcome = classify_page(snapshot, after_submit=is_submit_click(action))
+            self.url = snapshot.url
+        return self.outcome
+    
+    @property
+    def status(self) -> Optional[ApplicationStatus]:
+        """Application status for the detected outcome, if any."""
+        return OUTCOME_STATUSES.get(self.outcome)
+    
+    def error(self) -> Optional[ApplicationError]:
+        """Exception describing a blocking outcome, or None."""
+        return outcome_error(self.outcome, self.url)
+    
+    def describe(self) -> str:
+        """Final output reported when the run is stopped early."""
+        if self.outcome == SUBMITTED:
+            return f"Application submitted: confirmation page detected at {self.url}."
+        return str(self.error() or "")
+
+def check_page(snapshot: PageSnapshot):
+    """
+    Raise if a page opened outside the agent loop is a CAPTCHA or login wall.
+    
+    A CAPTCHA checkbox inside the form does not raise; the agent fills the
+    form and the challenge only stops the run if it blocks the submit.
+    
+    Raises:
+        CaptchaError: If the page shows a CAPTCHA challenge
+        AuthenticationError: If the page asks the user to sign in
+    """
+    error = outcome_error(classify_page(snapshot), snapshot.url)
+    if error is not None:
+        raise error
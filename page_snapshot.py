@@ -0,0 +1,152 @@
+"""
+Page snapshot parsing for Browser MCP tool results.
+Turns accessibility snapshots into structured elements and form fields.
+"""
+
+import re
+from typing import Optional, List
+
+# Accessibility roles that accept user input
+FORM_FIELD_ROLES = {"textbox", "combobox", "checkbox", "radio", "listbox", "spinbutton", "searchbox"}
+
+# e.g. '  - textbox "First Name" [required] [ref=s1e23]: Dharshan'
+ELEMENT_PATTERN = re.compile(
+    r'^(?P<indent>\s*)- (?P<role>[\w-]+)'
+    r'(?: "(?P<label>(?:[^"\\]|\\.)*)")?'
+    r'(?P<attrs>(?: \[[^\]]*\])*)'
+    r'(?::\s*(?P<value>.*))?$'
+)
+REF_PATTERN = re.compile(r'\[ref=([^\]]+)\]')
+URL_PATTERN = re.compile(r'^- Page URL: (.*)$', re.M)
+TITLE_PATTERN = re.compile(r'^- Page Title: (.*)$', re.M)
+
+class PageElement:
+    """A single element from an accessibility snapshot."""
+    
+    def __init__(
+        self,
+        role: str,
+        label: str,
+        ref: Optional[str],
+        value: str = "",
+        attributes: Optional[List[str]] = None,
+        depth: int = 0,
+        line: str = ""
+    ):
+        self.role = role
+        self.label = label
+        self.ref = ref
+        self.value = value
+        self.attributes = attributes or []
+        self.depth = depth
+        self.line = line
+    
+    @property
+    def is_form_field(self) -> bool:
+        """Whether the element accepts user input."""
+        return self.role in FORM_FIELD_ROLES and self.ref is not None
+    
+    @property
+    def is_required(self) -> bool:
+        """Whether the element is marked as required."""
+        return "required" in self.attributes or self.label.rstrip().endswith("*")
+    
+    @property
+    def is_filled(self) -> bool:
+        """Whether the element already holds a value or is checked."""
+        return bool(self.value.strip()) or "checked" in self.attributes
+    
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return {"role": self.role, "label": self.label, "ref": self.ref, "value": self.value}
+    
+    def __repr__(self):
+        return f"PageElement({self.role!r}, {self.label!r}, ref={self.ref!r})"
+
+class PageSnapshot:
+    """Structured view of a Browser MCP page snapshot."""
+    
+    def __init__(self, url: str, title: str, elements: List[PageElement]):
+        self.url = url
+        self.title = title
+        self.elements = elements
+    
+    @property
+    def form_fields(self) -> List[PageElement]:
+        """Elements that accept user input."""
+        return [element for element in self.elements if element.is_form_field]
+    
+    def find_by_ref(self, ref: str) -> Optional[PageElement]:
+        """Find an element by its snapshot reference."""
+        for element in self.elements:
+            if element.ref == ref:
+                return element
+        return None
+    
+    def options_for(self, field: PageElement) -> List[str]:
+        """Labels of the options nested under a dropdown or listbox field."""
+        options = []
+        for index, element in enumerate(self.elements):
+            if element is not field:
+                continue
+            for child in self.elements[index + 1:]:
+                if child.depth <= field.depth:
+                    break
+                if child.role == "option" and child.label:
+                    options.append(child.label)
+            break
+        return options
+
+def ref_key(ref: Optional[str]) -> str:
+    """Element part of a ref ('s3e14' -> 'e14'), which stays the same across snapshots of a page."""
+    return re.sub(r"^s\d+(?=e\d+$)", "", ref or "")
+
+def is_snapshot(text: str) -> bool:
+    """Check whether a tool result contains a page snapshot."""
+    return "[ref=" in text
+
+def parse_snapshot(text: str) -> PageSnapshot:
+    """
+    Parse the text returned by Browser MCP snapshot-producing tools.
+    
+    Args:
+        text: Raw tool output
+    
+    Returns:
+        PageSnapshot with URL, title and elements in document order
+    """
+    url_match = URL_PATTERN.search(text)
+    title_match = TITLE_PATTERN.search(text)
+    
+    elements = []
+    for line in text.splitlines():
+        match = ELEMENT_PATTERN.match(line)
+        if not match:
+            continue
+        attrs = match.group("attrs") or ""
+        ref_match = REF_PATTERN.search(attrs)
+        attributes = [
+            attr.strip("[]") for attr in re.findall(r'\[[^\]]*\]', attrs)
+            if not attr.startswith("[ref=")
+        ]
+        elements.append(PageElement(
+            role=match.group("role"),
+            label=(match.group("label") or "").replace('\\"', '"'),
+            ref=ref_match.group(1) if ref_match else None,
+            value=(match.group("value") or "").strip(),
+            attributes=attributes,
+            depth=len(match.group("indent")) // 2,
+            line=line,
+        ))
+    
+    return PageSnapshot(
+        url=url_match.group(1).strip() if url_match else "",
+        title=title_match.group(1).strip() if title_match else "",
+        elements=elements,
+    )
+
+def normalize_label(label: str) -> str:
+    """Normalize a field label for matching (case, punctuation, required markers)."""
+    label = label.lower().replace("*", " ")
+    label = re.sub(r"[^a-z0-9?]+", " ", label)
+    return re.sub(r"\s+", " ", label).strip()
@@ -0,0 +1,71 @@
+"""
+Application phase detection for the agent loop.
+Infers the current phase of an application from the latest page snapshot.
+"""
+
+import re
+from typing import List, Tuple, Any
+
+# Accessibility roles that indicate an editable form field
+FORM_FIELD_ROLES = ("textbox", "combobox", "checkbox", "radio", "listbox", "spinbutton", "searchbox")
+
+# A snapshot line for one of those roles or a radio group; whole role names
+# only, so a 'radiogroup' line is not mistaken for a 'radio' line
+FIELD_LINE_PATTERN = re.compile(rf"^(\s*)- ({'|'.join(FORM_FIELD_ROLES)}|radiogroup)\b")
+
+# Text that indicates a review/submit step
+SUBMIT_MARKERS = ("review your application", "review and submit", "submit application", "submit your application")
+
+def _is_snapshot(observation: str) -> bool:
+    """Check whether a tool result contains a page snapshot (elements carry refs)."""
+    return "[ref=" in observation
+
+def _field_lines(lowered: str) -> List[str]:
+    """Form field lines of a snapshot; a radio group counts once, as its question, not once per option."""
+    lines = []
+    group_indent = None
+    for line in lowered.splitlines():
+        match = FIELD_LINE_PATTERN.match(line)
+        if not match:
+            continue
+        indent, role = len(match.group(1)), match.group(2)
+        if role == "radio" and group_indent is not None and indent > group_indent:
+            continue
+        group_indent = indent if role == "radiogroup" else None
+        lines.append(line)
+    return lines
+
+def detect_phase(intermediate_steps: List[Tuple[Any, Any]]) -> str:
+    """
+    Infer the application phase from the agent's intermediate steps.
+    
+    The most recent page snapshot decides: a submit/review page with hardly
+    any editable fields means the submit step, no form fields means the
+    agent is still discovering the form, mostly question-style fields means
+    screening, anything else is filling.
+    
+    Args:
+        intermediate_steps: (AgentAction, observation) pairs from the executor
+    
+    Returns:
+        One of 'discovery', 'filling', 'screening' or 'submit'
+    """
+    for _action, observation in reversed(intermediate_steps):
+        text = str(observation)
+        if not _is_snapshot(text):
+            continue
+        
+        lowered = text.lower()
+        field_lines = _field_lines(lowered)
+        # Review pages show answers as text, leaving at most a consent checkbox or two
+        if any(marker in lowered for marker in SUBMIT_MARKERS) and len(field_lines) <= 2:
+            return "submit"
+        if not field_lines:
+            return "discovery"
+        
+        question_lines = [line for line in field_lines if "?" in line]
+        if len(question_lines) * 2 >= len(field_lines):
+            return "screening"
+        return "filling"
+    
+    return "discovery"
@@ -0,0 +1,189 @@
+"""
+Deterministic playbooks for common ATS application forms.
+Fill the standard fields of known platforms with scripted Browser MCP calls.
+"""
+
+import os
+import re
+from typing import Optional, Dict, List, Tuple
+from page_snapshot import PageSnapshot, PageElement, parse_snapshot, is_snapshot
+from form_filler import TYPED_ROLES, SELECT_ROLES, get_user_value, click_element, take_snapshot, upload_file
+from logger_setup import get_application_logger
+from user_context import USER_DETAILS
+
+logger = get_application_logger()
+
+class FieldRule:
+    """Maps field labels matching a pattern to a USER_DETAILS key."""
+    
+    def __init__(self, pattern: str, key: str):
+        self.pattern = re.compile(pattern, re.I)
+        self.key = key
+    
+    def matches(self, field: PageElement) -> bool:
+        return bool(self.pattern.search(field.label))
+
+class Playbook:
+    """Scripted handling of one ATS platform's application form."""
+    
+    def __init__(
+        self,
+        platform: str,
+        field_rules: List[FieldRule],
+        apply_pattern: str,
+        resume_pattern: str = r"\b(resume|cv)\b|attach",
+    ):
+        """
+        Initialize the playbook.
+        
+        Args:
+            platform: Platform name as returned by job_identity.detect_platform
+            field_rules: Rules for standard fields, checked in order
+            apply_pattern: Label of the link/button that opens the form from a posting page
+            resume_pattern: Label of the button that opens the resume file chooser
+        """
+        self.platform = platform
+        self.field_rules = field_rules
+        self.apply_pattern = re.compile(apply_pattern, re.I)
+        self.resume_pattern = re.compile(resume_pattern, re.I)
+    
+    def find_apply_button(self, snapshot: PageSnapshot) -> Optional[PageElement]:
+        """Find the control that opens the application form on a posting page."""
+        for element in snapshot.elements:
+            if element.role in ("link", "button") and element.ref and self.apply_pattern.search(element.label):
+                return element
+        return None
+    
+    def find_resume_button(self, snapshot: PageSnapshot) -> Optional[PageElement]:
+        """Find the control that opens the resume file chooser."""
+        for element in snapshot.elements:
+            if element.role == "button" and element.ref and self.resume_pattern.search(element.label):
+                return element
+        return None
+    
+    def plan(self, fields: List[PageElement]) -> Tuple[List[Tuple[PageElement, str]], List[PageElement]]:
+        """
+        Match form fields against the playbook's rules.
+        
+        Args:
+            fields: Form fields from the current snapshot
+        
+        Returns:
+            Tuple of (field, value) assignments and the fields left for the agent
+        """
+        assignments = []
+        leftover = []
+        for field in fields:
+            if field.is_filled:
+                continue
+            rule = next((rule for rule in self.field_rules if rule.matches(field)), None)
+            value = get_user_value(rule.key) if rule else ""
+            if value:
+                assignments.append((field, value))
+            else:
+                leftover.append(field)
+        return assignments, leftover
+    
+    async def open_form(self, tools: List, snapshot: PageSnapshot) -> PageSnapshot:
+        """
+        Click through from a job posting to its application form when needed.
+        
+        Args:
+            tools: Tools loaded from the MCP session
+            snapshot: Snapshot of the page that was navigated to
+        
+        Returns:
+            Snapshot of the application form, or the original snapshot if nothing was clicked
+        """
+        if snapshot.form_fields:
+            return snapshot
+        button = self.find_apply_button(snapshot)
+        if button is None:
+            return snapshot
+        try:
+            text = await click_element(tools, button)
+            form = parse_snapshot(text) if is_snapshot(text) else await take_snapshot(tools)
+            logger.info(f"Opened {self.platform} application form via '{button.label}'")
+            return form
+        except Exception as e:
+            logger.warning(f"Could not open {self.platform} application form: {e}")
+            return snapshot
+    
+    async def upload_resume(self, tools: List, snapshot: PageSnapshot) -> bool:
+        """
+        Upload USER_DETAILS['resume_path'] through the form's resume button.
+        
+        Args:
+            tools: Tools loaded from the MCP session
+            snapshot: Snapshot of the application form
+        
+        Returns:
+            True if the resume was uploaded
+        """
+        path = USER_DETAILS.get("resume_path", "")
+        button = self.find_resume_button(snapshot)
+        if not path or button is None:
+            return False
+        if not os.path.isfile(path):
+            logger.warning(f"Resume not found at {path}; leaving the upload to the agent")
+            return False
+        return await upload_file(tools, button, path)
+
+# Rules shared by most platforms
+COMMON_RULES = [
+    FieldRule(r"^(legal\s+)?(first|given)\s+name", "first_name"),
+    FieldRule(r"^(legal\s+)?(last|family)\s+name|^surname", "last_name"),
+    FieldRule(r"^e-?mail", "email"),
+    FieldRule(r"^(phone|mobile|contact number)", "phone"),
+    FieldRule(r"linkedin", "linkedin_url"),
+    FieldRule(r"github", "github_url"),
+    FieldRule(r"portfolio", "portfolio_url"),
+    FieldRule(r"^(personal\s+)?website", "website_url"),
+]
+
+PLAYBOOKS: Dict[str, Playbook] = {
+    "greenhouse": Playbook(
+        "greenhouse",
+        COMMON_RULES + [
+            FieldRule(r"^(location|city|current location)", "location"),
+            FieldRule(r"^(school|university|college)\b", "school"),
+            FieldRule(r"^degree\b", "degree"),
+        ],
+        apply_pattern=r"^apply( for this job| now)?$",
+    ),
+    "lever": Playbook(
+        "lever",
+        [FieldRule(r"^(full\s+)?name\b", "full_name")] + COMMON_RULES + [
+            FieldRule(r"current\s+location|^location", "location"),
+            FieldRule(r"current\s+company", "current_company"),
+        ],
+        apply_pattern=r"^apply for this job$",
+        resume_pattern=r"attach\s+resume|\b(resume|cv)\b",
+    ),
+}
+
+def get_playbook(platform: str) -> Optional[Playbook]:
+    """Get the playbook for a platform, if one exists."""
+    return PLAYBOOKS.get(platform)
+
+# Labels the playbooks know how to fill from USER_DETAILS
+STANDARD_RULES = COMMON_RULES + [rule for playbook in PLAYBOOKS.values() for rule in playbook.field_rules]
+
+def unmapped_fields(fields: List[PageElement]) -> List[PageElement]:
+    """
+    Find empty text and dropdown fields that no standard field rule covers.
+    
+    These are the screening questions and custom fields whose value has to
+    be worked out from the user's details.
+    
+    Args:
+        fields: Form fields of a page
+    
+    Returns:
+        Unfilled fields without a matching playbook rule, in page order
+    """
+    return [
+        field for field in fields
+        if field.role in TYPED_ROLES | SELECT_ROLES and not field.is_filled
+        and not any(rule.matches(field) for rule in STANDARD_RULES)
+    ]
@@ -0,0 +1,167 @@
+"""
+Pre-agent form filling for job applications.
+Opens the application page and fills what is already known before the agent runs.
+"""
+
+from typing import Optional, List, Tuple, Any
+from page_snapshot import PageSnapshot, PageElement
+from form_filler import open_page, fill_fields
+from outcome_detector import check_page
+from playbooks import get_playbook, unmapped_fields
+from answer_cache import plan_cached_answers, learn_answers, remember_answers
+from screening import plan_batched_answers
+from form_cache import get_form_cache, fingerprint_form, plan_from_mapping, learn_mapping
+from logger_setup import get_application_logger
+from config import Config
+
+logger = get_application_logger()
+
+class PrefillResult:
+    """Outcome of filling a form before the agent runs."""
+    
+    def __init__(self, url: str, platform: str, snapshot: PageSnapshot):
+        self.url = url
+        self.platform = platform
+        self.snapshot = snapshot
+        self.fingerprint = fingerprint_form(snapshot.form_fields, platform)
+        self.cache_hit = False
+        self.playbook_used = False
+        self.resume_uploaded = False
+        self.cached_answers = 0
+        self.batched_answers = 0
+        self.filled: List[PageElement] = []
+        self.leftover: List[PageElement] = []
+    
+    def describe(self) -> str:
+        """Describe the prefilled state for the agent's input."""
+        parts = ["The application page is already open."]
+        if self.filled:
+            fields = ", ".join(f'"{field.label or field.role}"' for field in self.filled)
+            parts.append(
+                f"These fields are already filled with the correct values: {fields}. "
+                f"Do not fill them again."
+            )
+        if self.resume_uploaded:
+            parts.append("The resume is already uploaded.")
+        if self.leftover:
+            fields = ", ".join(f'"{field.label or field.role}"' for field in self.leftover)
+            parts.append(f"Only these fields still need attention: {fields}.")
+        parts.append("Take a snapshot and continue with the remaining fields.")
+        return " ".join(parts)
+
+async def prefill_application(
+    tools: List,
+    url: str,
+    platform: str,
+    snapshot: Optional[PageSnapshot] = None,
+    llm=None
+) -> Optional[PrefillResult]:
+    """
+    Open the application page and fill what is known without the LLM.
+    
+    A cached field mapping is replayed first; on known ATS platforms the
+    platform playbook then fills the remaining standard fields and uploads
+    the resume, and screening questions with a confident match in the answer
+    cache are answered. With a model, the questions still open are answered
+    together in one structured call, leaving only unknown fields and
+    questions the user's details do not cover.
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        url: Job application URL
+        platform: ATS platform of the URL
+        snapshot: Snapshot of the URL if the page is already open in the browser
+        llm: Chat model for batched screening answers (None skips them)
+    
+    Returns:
+        PrefillResult, or None if the page could not be opened directly
+    
+    Raises:
+        CaptchaError: If the opened page shows a CAPTCHA challenge
+        AuthenticationError: If the opened page asks the user to sign in
+    """
+    playbook = get_playbook(platform) if Config.PLAYBOOKS_ENABLED else None
+    if not Config.FORM_CACHE_ENABLED and playbook is None:
+        return None
+    
+    try:
+        snapshot = snapshot or await open_page(tools, url)
+    except Exception as e:
+        logger.warning(f"Could not open {url} for prefill: {e}")
+        return None
+    
+    if playbook is not None:
+        snapshot = await playbook.open_form(tools, snapshot)
+    if Config.OUTCOME_DETECTION_ENABLED:
+        check_page(snapshot)
+    
+    result = PrefillResult(url, platform, snapshot)
+    fields = snapshot.form_fields
+    if not fields:
+        return result
+    
+    plan = []
+    mapping = get_form_cache().get(result.fingerprint) if Config.FORM_CACHE_ENABLED else None
+    if mapping:
+        result.cache_hit = True
+        plan = plan_from_mapping(fields, mapping)
+    
+    planned = {id(field) for field, _ in plan}
+    remaining = [field for field in fields if id(field) not in planned]
+    if playbook is not None:
+        playbook_plan, remaining = playbook.plan(remaining)
+        result.playbook_used = True
+        plan += playbook_plan
+    
+    if Config.ANSWER_CACHE_ENABLED and remaining:
+        answer_plan, remaining = plan_cached_answers(snapshot, remaining)
+        result.cached_answers = len(answer_plan)
+        plan += answer_plan
+    
+    questions = unmapped_fields(remaining) if llm is not None and Config.SCREENING_BATCH_ENABLED else []
+    batch_plan = []
+    if questions:
+        batch_plan, unanswered = await plan_batched_answers(llm, snapshot, questions)
+        result.batched_answers = len(batch_plan)
+        plan += batch_plan
+        remaining = [field for field in remaining if field not in questions] + unanswered
+    
+    result.filled = await fill_fields(tools, plan)
+    filled_refs = {field.ref for field in result.filled}
+    if Config.ANSWER_CACHE_ENABLED and batch_plan:
+        remember_answers((field, answer) for field, answer in batch_plan if field.ref in filled_refs)
+    failed = [field for field, _ in plan if field.ref not in filled_refs]
+    result.leftover = [field for field in remaining + failed if not field.is_filled]
+    
+    if playbook is not None:
+        result.resume_uploaded = await playbook.upload_resume(tools, snapshot)
+    
+    source = "form cache" if result.cache_hit else f"{platform} playbook" if result.playbook_used else "prefill"
+    logger.info(
+        f"Prefilled {len(result.filled)} fields for {url} via {source} "
+        f"({result.cached_answers} cached, {result.batched_answers} batched answers); "
+        f"{len(result.leftover)} left for the agent"
+    )
+    return result
+
+def record_agent_steps(result: Optional[PrefillResult], steps: List[Tuple[Any, Any]]):
+    """
+    Learn the field mapping from the agent's tool calls and cache it for this form layout.
+    
+    Answers the agent gave to the fields prefill left open are staged for
+    the answer cache (see answer_cache.staged_answers).
+    
+    Args:
+        result: Prefill result for the application (ignored if None)
+        steps: (AgentAction, observation) pairs from the agent run
+    """
+    if result is None or not result.snapshot.form_fields:
+        return
+    if Config.ANSWER_CACHE_ENABLED and result.leftover:
+        learned = learn_answers(result.leftover, steps)
+        if learned:
+            logger.info(f"Staged {learned} screening answers from the agent for {result.url}")
+    mapping = learn_mapping(result.snapshot.form_fields, steps)
+    if mapping:
+        get_form_cache().put(result.fingerprint, mapping, result.platform)
+        logger.info(f"Cached {len(mapping)} field mappings for {result.platform} form {result.fingerprint[:10]}")
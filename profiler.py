@@ -0,0 +1,218 @@
+"""
+Per-application performance profiling.
+Times tool calls, LLM turns and waits during an application and summarizes profiles across applications.
+"""
+
+import time
+from collections import defaultdict
+from typing import Optional, Dict, List, Any, Iterable, Tuple
+from uuid import UUID
+from langchain_core.callbacks import AsyncCallbackHandler
+from token_counter import estimate_tokens
+from metrics import TOOL_CALL_LATENCY, LLM_LATENCY
+
+# Browser MCP tools that only wait
+WAIT_TOOLS = {"browser_wait", "browser_wait_for"}
+
+# Per-call entries kept in a stored profile
+MAX_PROFILE_ENTRIES = 200
+
+PERCENTILES = (50, 90, 99)
+
+def estimate_prompt_tokens(messages: List[List]) -> int:
+    """Estimate the input tokens of a chat model call from its message batches."""
+    return sum(estimate_tokens(str(message.content)) for batch in messages for message in batch)
+
+def response_tokens(response, prompt_tokens: int) -> Tuple[int, int]:
+    """
+    Read the input and output tokens of a chat model call.
+    
+    Usage reported by the model wins; otherwise the prompt estimate is kept
+    and the output is estimated from the generated text or tool calls.
+    
+    Args:
+        response: LLMResult passed to on_llm_end
+        prompt_tokens: Estimated input tokens of the call
+    
+    Returns:
+        Tuple of (input tokens, output tokens)
+    """
+    input_tokens, output_tokens = prompt_tokens, 0
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage = getattr(message, "usage_metadata", None)
+            if usage:
+                input_tokens = usage.get("input_tokens", input_tokens)
+                output_tokens += usage.get("output_tokens", 0)
+            else:
+                output_tokens += estimate_tokens(generation.text or str(getattr(message, "tool_calls", "")))
+    return input_tokens, output_tokens
+
+class ApplicationProfile:
+    """Timing and token usage collected for one application."""
+    
+    def __init__(self, platform: str = "custom"):
+        self.platform = platform
+        self.started = time.monotonic()
+        self.tool_calls: List[List] = []
+        self.llm_turns: List[List] = []
+        self.prefill_seconds = 0.0
+        self.wait_seconds = 0.0
+    
+    def add_tool_call(self, tool: str, seconds: float):
+        """Record one tool call; wait tools also count as wait time."""
+        self.tool_calls.append([tool, round(seconds, 3)])
+        TOOL_CALL_LATENCY.observe(seconds, tool)
+        if tool in WAIT_TOOLS:
+            self.wait_seconds += seconds
+    
+    def add_llm_turn(self, seconds: float, input_tokens: int, output_tokens: int):
+        """Record one LLM call."""
+        self.llm_turns.append([round(seconds, 3), input_tokens, output_tokens])
+        LLM_LATENCY.observe(seconds)
+    
+    def add_wait(self, seconds: float):
+        """Record time spent sleeping (e.g. retry backoff)."""
+        self.wait_seconds += seconds
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the profile as stored in application metadata."""
+        tool_seconds = sum(seconds for _tool, seconds in self.tool_calls)
+        return {
+            "platform": self.platform,
+            "wall_seconds": round(time.monotonic() - self.started, 3),
+            "prefill_seconds": round(self.prefill_seconds, 3),
+            "llm_seconds": round(sum(turn[0] for turn in self.llm_turns), 3),
+            "tool_seconds": round(tool_seconds, 3),
+            "wait_seconds": round(self.wait_seconds, 3),
+            "iterations": len(self.llm_turns),
+            "input_tokens": sum(turn[1] for turn in self.llm_turns),
+            "output_tokens": sum(turn[2] for turn in self.llm_turns),
+            "tool_calls": self.tool_calls[-MAX_PROFILE_ENTRIES:],
+            "llm_turns": self.llm_turns[-MAX_PROFILE_ENTRIES:],
+        }
+
+class ProfilingCallbackHandler(AsyncCallbackHandler):
+    """Feeds tool and LLM timings from the agent executor into an ApplicationProfile."""
+    
+    def __init__(self, profile: ApplicationProfile):
+        self.profile = profile
+        self._tools: Dict[UUID, tuple] = {}
+        self._llm: Dict[UUID, tuple] = {}
+    
+    async def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs):
+        self._tools[run_id] = ((serialized or {}).get("name", "unknown"), time.monotonic())
+    
+    async def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs):
+        self._finish_tool(run_id)
+    
+    async def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        self._finish_tool(run_id)
+    
+    async def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List], *, run_id: UUID, **kwargs):
+        self._llm[run_id] = (time.monotonic(), estimate_prompt_tokens(messages))
+    
+    async def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        started, prompt_tokens = self._llm.pop(run_id, (None, 0))
+        if started is None:
+            return
+        input_tokens, output_tokens = response_tokens(response, prompt_tokens)
+        self.profile.add_llm_turn(time.monotonic() - started, input_tokens, output_tokens)
+    
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        started, prompt_tokens = self._llm.pop(run_id, (None, 0))
+        if started is not None:
+            self.profile.add_llm_turn(time.monotonic() - started, prompt_tokens, 0)
+    
+    def _finish_tool(self, run_id: UUID):
+        name, started = self._tools.pop(run_id, (None, None))
+        if name is not None:
+            self.profile.add_tool_call(name, time.monotonic() - started)
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    return {f"p{pct}": round(percentile(values, pct), 3) for pct in PERCENTILES}
+
+def summarize_profiles(applications: Iterable[Dict]) -> Dict[str, Any]:
+    """
+    Compute percentiles over the profiles stored in application metadata.
+    
+    Args:
+        applications: Application records from the tracker
+    
+    Returns:
+        Dictionary with 'count', per-application metric percentiles ('overall'),
+        the same per platform ('by_platform'), and per-call percentiles for LLM
+        turns and each tool ('llm_turn_seconds', 'tool_seconds')
+    """
+    metrics = ("wall_seconds", "llm_seconds", "tool_seconds", "wait_seconds",
+               "prefill_seconds", "iterations", "input_tokens", "output_tokens")
+    overall = defaultdict(list)
+    by_platform = defaultdict(lambda: defaultdict(list))
+    turn_seconds = []
+    tool_seconds = defaultdict(list)
+    count = 0
+    
+    for app in applications:
+        profile = (app.get("metadata") or {}).get("profile")
+        if not profile:
+            continue
+        count += 1
+        platform = profile.get("platform", "custom")
+        for metric in metrics:
+            overall[metric].append(profile.get(metric, 0))
+            by_platform[platform][metric].append(profile.get(metric, 0))
+        turn_seconds.extend(turn[0] for turn in profile.get("llm_turns", []))
+        for tool, seconds in profile.get("tool_calls", []):
+            tool_seconds[tool].append(seconds)
+    
+    return {
+        "count": count,
+        "overall": {metric: _percentiles(overall[metric]) for metric in metrics},
+        "by_platform": {
+            platform: {
+                "count": len(values["wall_seconds"]),
+                **{metric: _percentiles(values[metric]) for metric in metrics},
+            }
+            for platform, values in sorted(by_platform.items())
+        },
+        "llm_turn_seconds": _percentiles(turn_seconds),
+        "tool_seconds": {
+            tool: {"calls": len(values), **_percentiles(values)}
+            for tool, values in sorted(tool_seconds.items(), key=lambda item: -sum(item[1]))
+        },
+    }
+
+def print_profile_report(summary: Dict[str, Any]):
+    """Print the output of summarize_profiles for the REPL."""
+    if not summary["count"]:
+        print("\n📈 No application profiles recorded yet\n")
+        return
+    
+    header = "".join(f"{f'p{pct}':>10}" for pct in PERCENTILES)
+    print(f"\n📈 Performance Profile ({summary['count']} applications):")
+    print(f"  {'':<18}{header}")
+    for metric, values in summary["overall"].items():
+        print(f"  {metric:<18}" + "".join(f"{values[f'p{pct}']:>10,}" for pct in PERCENTILES))
+    print(f"  {'llm turn (s)':<18}" + "".join(
+        f"{summary['llm_turn_seconds'][f'p{pct}']:>10,}" for pct in PERCENTILES
+    ))
+    
+    print("\n  By platform (wall seconds / iterations):")
+    for platform, values in summary["by_platform"].items():
+        wall, iterations = values["wall_seconds"], values["iterations"]
+        print(f"    {platform:<12} n={values['count']:<4} wall p50 {wall['p50']}s p90 {wall['p90']}s, "
+              f"iterations p50 {iterations['p50']} p90 {iterations['p90']}")
+    
+    print("\n  Tool calls (seconds):")
+    for tool, values in list(summary["tool_seconds"].items())[:8]:
+        print(f"    {tool:<24} {values['calls']:>5} calls  p50 {values['p50']}  p90 {values['p90']}")
+    print()
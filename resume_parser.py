@@ -0,0 +1,409 @@
+"""
+Resume parsing module for extracting structured sections from the user's resume.
+Parsed results are cached on disk by file content hash, so a resume is only re-read when it changes.
+
+PDF support needs the optional pypdf package; plain-text resumes (.txt, .md) work without it.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Any
+from user_context import USER_DETAILS
+from logger_setup import get_system_logger
+from config import Config
+
+logger = get_system_logger()
+
+# Section headings as they appear on resumes, mapped to the section they start
+SECTION_HEADINGS = {
+    "summary": "summary", "professional summary": "summary", "profile": "summary",
+    "objective": "summary", "about me": "summary",
+    "experience": "experience", "work experience": "experience",
+    "professional experience": "experience", "employment": "experience",
+    "employment history": "experience", "work history": "experience",
+    "education": "education", "academic background": "education",
+    "skills": "skills", "technical skills": "skills", "core competencies": "skills",
+    "projects": "projects", "personal projects": "projects", "selected projects": "projects",
+    "achievements": "achievements", "awards": "achievements", "honors": "achievements",
+    "certifications": "certifications", "certificates": "certifications",
+}
+
+# Skill groups that PDF extraction may glue to the first skill (e.g. 'LanguagesPython')
+SKILL_CATEGORIES = [
+    "Programming Languages", "Languages", "AI/ML", "Machine Learning", "Cloud", "Databases",
+    "Frameworks", "Libraries", "Tools", "Platforms", "Technologies", "DevOps", "Web",
+]
+
+MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+DATE_RANGE_PATTERN = re.compile(
+    rf"((?:{MONTH}\s+)?\d{{4}})\s*(?:—|–|-|to)\s*((?:{MONTH}\s+)?\d{{4}}|Present|Current|Now)", re.I
+)
+GPA_PATTERN = re.compile(r"\b(?:C?GPA|CPI)\s*:?\s*([\d.]+(?:\s*/\s*[\d.]+)?)", re.I)
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+URL_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com|gitlab\.com)/[\w\-./]+", re.I)
+BULLET_PATTERN = re.compile(r"^[•●▪◦\-*–]\s*")
+
+# Gap that separates layout columns in extracted text (e.g. title and dates)
+COLUMN_GAP = re.compile(r"\s{2,}")
+
+def file_sha256(path: Path) -> str:
+    """Hash a file's contents in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def extract_text(path: Path) -> Optional[str]:
+    """
+    Extract the text of a resume file.
+    
+    Args:
+        path: PDF or plain-text resume
+    
+    Returns:
+        The text, or None if the format is unsupported or pypdf is not installed
+    """
+    if path.suffix.lower() in (".txt", ".md"):
+        return path.read_text(encoding="utf-8", errors="replace")
+    if path.suffix.lower() != ".pdf":
+        logger.warning(f"Unsupported resume format: {path.suffix}")
+        return None
+    
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.warning("pypdf is not installed; install it to parse PDF resumes")
+        return None
+    
+    reader = PdfReader(str(path))
+    pages = []
+    for page in reader.pages:
+        # Layout mode keeps column gaps and fixes kerned words ('A WS'); older pypdf lacks it
+        try:
+            pages.append(page.extract_text(extraction_mode="layout"))
+        except TypeError:
+            pages.append(page.extract_text())
+    return "\n".join(pages)
+
+def split_sections(text: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Split resume text into the header lines and the lines under each known heading.
+    
+    Args:
+        text: Extracted resume text
+    
+    Returns:
+        Tuple of (lines before the first heading, section name -> lines)
+    """
+    header: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        heading = SECTION_HEADINGS.get(line.rstrip(":").strip().lower())
+        if heading:
+            current = heading
+            sections.setdefault(current, [])
+        elif current is None:
+            header.append(line)
+        else:
+            sections[current].append(line)
+    return header, sections
+
+def _group_entries(lines: List[str], starts_entry) -> List[Dict[str, Any]]:
+    """
+    Group section lines into entries of header lines and bullet points.
+    
+    Bullet continuation lines are joined onto the bullet they wrap from.
+    """
+    entries = []
+    for line in lines:
+        is_bullet = bool(BULLET_PATTERN.match(line))
+        if not is_bullet and (not entries or starts_entry(line, entries[-1])):
+            entries.append({"lines": [line], "bullets": []})
+        elif is_bullet:
+            if not entries:
+                entries.append({"lines": [], "bullets": []})
+            entries[-1]["bullets"].append(BULLET_PATTERN.sub("", line))
+        elif entries[-1]["bullets"]:
+            entries[-1]["bullets"][-1] += f" {line}"
+        else:
+            entries[-1]["lines"].append(line)
+    return entries
+
+def _split_heading(text: str, last: bool = False) -> Tuple[str, str]:
+    """Split 'Title, Organization' (or 'Title at Organization' / 'Title | Organization')."""
+    for separator in (" at ", " | ", " — ", " – "):
+        if separator in text:
+            first, _, second = text.partition(separator)
+            return first.strip(), second.strip()
+    if "," in text:
+        first, _, second = text.rpartition(",") if last else text.partition(",")
+        return first.strip(), second.strip()
+    return text.strip(), ""
+
+def _dated_entry_starts(line: str, entry: Dict) -> bool:
+    """A line with a date range starts a new entry once the current one has bullets or a date."""
+    return bool(DATE_RANGE_PATTERN.search(line)) and (
+        entry["bullets"] or any(DATE_RANGE_PATTERN.search(previous) for previous in entry["lines"])
+    )
+
+def _dated_fields(entry: Dict) -> Tuple[str, str, List[str]]:
+    """Pull the heading, date range and remaining detail columns out of an entry's lines."""
+    heading, duration, details = "", "", []
+    for line in entry["lines"]:
+        for column in COLUMN_GAP.split(line):
+            match = DATE_RANGE_PATTERN.search(column)
+            if match and not duration:
+                duration = f"{match.group(1)} - {match.group(2)}"
+                column = (column[:match.start()] + column[match.end():]).strip(" ,—–-")
+            if not column:
+                continue
+            if not heading:
+                heading = column
+            else:
+                details.append(column)
+    return heading, duration, details
+
+def parse_experience(lines: List[str]) -> List[Dict[str, Any]]:
+    """Parse the experience section into title, company, duration, location and highlights."""
+    experience = []
+    for entry in _group_entries(lines, _dated_entry_starts):
+        heading, duration, details = _dated_fields(entry)
+        title, company = _split_heading(heading)
+        experience.append({
+            "title": title,
+            "company": company,
+            "duration": duration,
+            "location": details[0] if details else "",
+            "highlights": entry["bullets"],
+        })
+    return experience
+
+def parse_education(lines: List[str]) -> List[Dict[str, Any]]:
+    """Parse the education section into degree, institution, duration, location and GPA."""
+    education = []
+    for entry in _group_entries(lines, _dated_entry_starts):
+        heading, duration, details = _dated_fields(entry)
+        degree, institution = _split_heading(heading, last=True)
+        gpa, location, notes = "", "", []
+        for detail in details:
+            match = GPA_PATTERN.search(detail)
+            if match and not gpa:
+                gpa = match.group(1).replace(" ", "")
+                detail = (detail[:match.start()] + detail[match.end():]).strip(" ,|")
+            if detail and not location:
+                location = detail
+            elif detail:
+                notes.append(detail)
+        education.append({
+            "degree": degree,
+            "institution": institution,
+            "duration": duration,
+            "graduation_year": duration[-4:] if duration[-4:].isdigit() else "",
+            "location": location,
+            "gpa": gpa,
+            "details": notes + entry["bullets"],
+        })
+    return education
+
+def _split_list(text: str) -> List[str]:
+    """Split a comma-separated list, ignoring commas inside parentheses."""
+    items, depth, current = [], 0, ""
+    for char in text:
+        depth += (char == "(") - (char == ")")
+        if char == "," and depth == 0:
+            items.append(current.strip())
+            current = ""
+        else:
+            current += char
+    items.append(current.strip())
+    return [item for item in items if item]
+
+def parse_skills(lines: List[str]) -> Dict[str, List[str]]:
+    """Parse the skills section into skill lists by category ('Other' when uncategorized)."""
+    skills: Dict[str, List[str]] = {}
+    for line in lines:
+        line = BULLET_PATTERN.sub("", line)
+        category, items = "Other", line
+        if ":" in line:
+            category, _, items = line.partition(":")
+        elif COLUMN_GAP.search(line):
+            category, items = COLUMN_GAP.split(line, maxsplit=1)
+        else:
+            for known in SKILL_CATEGORIES:
+                if line.lower().startswith(known.lower()) and len(line) > len(known):
+                    category, items = line[:len(known)], line[len(known):]
+                    break
+        skills.setdefault(category.strip(), []).extend(_split_list(items))
+    return skills
+
+def parse_projects(lines: List[str]) -> List[Dict[str, Any]]:
+    """Parse the projects section into project names and highlights."""
+    # After a project's bullets, a capitalized line names the next project; anything else wraps a bullet
+    entries = _group_entries(lines, lambda line, entry: bool(entry["bullets"]) and line[:1].isupper())
+    return [
+        {"name": " ".join(COLUMN_GAP.sub(" ", line) for line in entry["lines"]), "highlights": entry["bullets"]}
+        for entry in entries
+    ]
+
+def parse_contact(header: List[str]) -> Dict[str, Any]:
+    """Pull the name, email, phone and profile links out of the resume header."""
+    text = "\n".join(header)
+    email = EMAIL_PATTERN.search(text)
+    phone = PHONE_PATTERN.search(text)
+    return {
+        "name": header[0] if header else "",
+        "email": email.group(0) if email else "",
+        "phone": phone.group(0).strip() if phone else "",
+        "links": URL_PATTERN.findall(text),
+    }
+
+def parse_resume_text(text: str) -> Dict[str, Any]:
+    """
+    Parse resume text into structured sections.
+    
+    Args:
+        text: Extracted resume text
+    
+    Returns:
+        Dictionary with contact, summary, experience, education, skills,
+        projects, achievements and certifications
+    """
+    header, sections = split_sections(text)
+    return {
+        "contact": parse_contact(header),
+        "summary": " ".join(sections.get("summary", [])),
+        "experience": parse_experience(sections.get("experience", [])),
+        "education": parse_education(sections.get("education", [])),
+        "skills": parse_skills(sections.get("skills", [])),
+        "projects": parse_projects(sections.get("projects", [])),
+        "achievements": [BULLET_PATTERN.sub("", line) for line in sections.get("achievements", [])],
+        "certifications": [BULLET_PATTERN.sub("", line) for line in sections.get("certifications", [])],
+    }
+
+class ResumeCache:
+    """Parsed resumes saved to disk, keyed by the SHA-256 of the resume file."""
+    
+    def __init__(self, cache_file: Optional[Path] = None, max_entries: int = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_file: JSON file backing the cache (defaults to Config.RESUME_CACHE_FILE)
+            max_entries: Maximum number of parsed resumes kept (defaults to Config.RESUME_CACHE_MAX_ENTRIES)
+        """
+        self.cache_file = Path(cache_file or Config.RESUME_CACHE_FILE)
+        self.max_entries = max_entries or Config.RESUME_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        # path -> (mtime, size, sha256), so unchanged files are not re-hashed
+        self._hashes: Dict[str, Tuple[float, int, str]] = {}
+    
+    def _load(self) -> "OrderedDict[str, Dict]":
+        """Load cached resumes, least recently parsed first."""
+        if not self.cache_file.exists():
+            return OrderedDict()
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return OrderedDict(json.load(f))
+        except Exception as e:
+            logger.error(f"Error loading resume cache: {e}")
+            return OrderedDict()
+    
+    def save(self):
+        """Write the cache to disk atomically."""
+        try:
+            with self._lock:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix(".json.tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.error(f"Error saving resume cache: {e}")
+    
+    def _file_hash(self, path: Path) -> str:
+        stat = path.stat()
+        cached = self._hashes.get(str(path))
+        if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+            return cached[2]
+        digest = file_sha256(path)
+        self._hashes[str(path)] = (stat.st_mtime, stat.st_size, digest)
+        return digest
+    
+    def get(self, path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Return the parsed resume at a path, parsing it only if its contents changed.
+        
+        Args:
+            path: Resume file
+        
+        Returns:
+            Parsed resume (see parse_resume_text) with 'sha256', 'source' and
+            'parsed_at' added, or None if the file is missing or unreadable
+        """
+        if not path.is_file():
+            return None
+        digest = self._file_hash(path)
+        with self._lock:
+            if digest in self._entries:
+                return self._entries[digest]
+        
+        try:
+            text = extract_text(path)
+        except Exception as e:
+            logger.error(f"Could not read resume {path}: {e}")
+            return None
+        if not text:
+            return None
+        
+        parsed = parse_resume_text(text)
+        parsed.update({"sha256": digest, "source": str(path), "parsed_at": datetime.now().isoformat()})
+        with self._lock:
+            self._entries[digest] = parsed
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self.save()
+        logger.info(
+            f"Parsed resume {path.name}: {len(parsed['experience'])} positions, "
+            f"{sum(len(items) for items in parsed['skills'].values())} skills, "
+            f"{len(parsed['education'])} education entries"
+        )
+        return parsed
+
+_resume_cache: Optional[ResumeCache] = None
+
+def get_resume_cache() -> ResumeCache:
+    """Get the shared resume cache."""
+    global _resume_cache
+    if _resume_cache is None:
+        _resume_cache = ResumeCache()
+    return _resume_cache
+
+def get_resume_profile(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """
+    Get the structured resume, parsed once per version of the file.
+    
+    Args:
+        path: Resume file (defaults to USER_DETAILS['resume_path'])
+    
+    Returns:
+        Parsed resume, or None if parsing is disabled or the resume is unavailable
+    """
+    if not Config.RESUME_PARSING_ENABLED:
+        return None
+    path = path or USER_DETAILS.get("resume_path")
+    if not path:
+        return None
+    return get_resume_cache().get(Path(path))
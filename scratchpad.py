@@ -0,0 +1,210 @@
+"""
+Bounded agent scratchpad for long applications.
+Keeps the most recent steps verbatim and folds older ones into a short summary of the form state.
+"""
+
+import threading
+from typing import Optional, Dict, List, Tuple, Any
+from snapshot_compressor import compress_steps
+from page_snapshot import URL_PATTERN, TITLE_PATTERN
+from form_filler import NAVIGATE_TOOL, TYPE_TOOL, SELECT_TOOL, CLICK_TOOL
+from token_counter import estimate_tokens, estimate_tokens_for_object
+from config import Config
+
+# Longest value quoted for a field in the summary
+MAX_SUMMARY_VALUE_CHARS = 60
+
+def _clip(value: Any) -> str:
+    text = ", ".join(map(str, value)) if isinstance(value, (list, tuple)) else str(value)
+    return text if len(text) <= MAX_SUMMARY_VALUE_CHARS else text[:MAX_SUMMARY_VALUE_CHARS - 3] + "..."
+
+def summarize_steps(steps: List[Tuple[Any, Any]]) -> str:
+    """
+    Summarize agent steps as the form state they produced.
+    
+    Lists the pages visited, the latest value entered in each field, the
+    buttons clicked, uploads and tool errors, without any page snapshots.
+    
+    Args:
+        steps: (AgentAction, observation) pairs, oldest first
+    
+    Returns:
+        Summary text for the agent
+    """
+    pages: List[str] = []
+    values: Dict[str, str] = {}
+    clicked: List[str] = []
+    uploads: List[str] = []
+    errors: List[str] = []
+    for action, observation in steps:
+        text = str(observation)
+        args = action.tool_input if isinstance(action.tool_input, dict) else {}
+        
+        url = URL_PATTERN.search(text)
+        title = TITLE_PATTERN.search(text)
+        if url:
+            page = f"{title.group(1).strip()} ({url.group(1).strip()})" if title else url.group(1).strip()
+            if not pages or pages[-1] != page:
+                pages.append(page)
+        
+        first_line = text.strip().splitlines()[0] if text.strip() else ""
+        if first_line.lower().startswith("error"):
+            errors.append(f"{action.tool}: {_clip(first_line)}")
+        elif action.tool == TYPE_TOOL and args.get("element"):
+            values[args["element"]] = _clip(args.get("text", ""))
+        elif action.tool == SELECT_TOOL and args.get("element"):
+            values[args["element"]] = _clip(args.get("values", ""))
+        elif action.tool == CLICK_TOOL and args.get("element"):
+            clicked.append(args["element"])
+        elif action.tool == Config.BROWSER_UPLOAD_TOOL:
+            uploads.append(_clip(args.get("paths", "")))
+        elif action.tool == NAVIGATE_TOOL and args.get("url") and not url:
+            pages.append(args["url"])
+    
+    lines = [f"Summary of the {len(steps)} earlier steps (their page snapshots are omitted):"]
+    if pages:
+        lines.append("- Pages visited: " + " -> ".join(pages))
+    if values:
+        lines.append("- Fields filled: " + "; ".join(f'"{label}" = "{value}"' for label, value in values.items()))
+    if clicked:
+        lines.append("- Clicked: " + ", ".join(f'"{label}"' for label in clicked))
+    if uploads:
+        lines.append("- Uploaded: " + ", ".join(uploads))
+    if errors:
+        lines.append("- Errors: " + "; ".join(errors))
+    lines.append("The steps after this summary show the current page.")
+    return "\n".join(lines)
+
+def message_group_starts(steps: List[Tuple[Any, Any]]) -> List[int]:
+    """
+    Indices of the steps that begin a new model message.
+    
+    Parallel tool calls of one AIMessage become several steps sharing its
+    message_log, and the model API rejects a tool call sent without its
+    result, so steps are only ever cut at these indices.
+    
+    Args:
+        steps: (AgentAction, observation) pairs, oldest first
+    
+    Returns:
+        Ascending step indices, starting with 0 when there are steps
+    """
+    starts = []
+    previous = None
+    for index, (action, _observation) in enumerate(steps):
+        message_log = getattr(action, "message_log", None)
+        if not message_log or message_log != previous:
+            starts.append(index)
+        previous = message_log
+    return starts
+
+def estimate_steps_tokens(steps: List[Tuple[Any, Any]]) -> int:
+    """Estimate the tokens the steps take up in the prompt (tool inputs and results)."""
+    return sum(
+        estimate_tokens_for_object(action.tool_input) + estimate_tokens(str(observation))
+        for action, observation in steps
+    )
+
+class ScratchpadStats:
+    """Running totals of scratchpad tokens before and after windowing."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.summarized_turns = 0
+        self.full_tokens = 0
+        self.sent_tokens = 0
+        self.max_sent_tokens = 0
+    
+    def record(self, full_tokens: int, sent_tokens: int, summarized: bool):
+        """Add one turn's scratchpad."""
+        with self._lock:
+            self.turns += 1
+            self.summarized_turns += summarized
+            self.full_tokens += full_tokens
+            self.sent_tokens += sent_tokens
+            self.max_sent_tokens = max(self.max_sent_tokens, sent_tokens)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return turn counts and estimated token savings."""
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "summarized_turns": self.summarized_turns,
+                "tokens_saved": self.full_tokens - self.sent_tokens,
+                "max_sent_tokens": self.max_sent_tokens,
+            }
+
+scratchpad_stats = ScratchpadStats()
+
+def window_steps(
+    steps: List[Tuple[Any, Any]],
+    window: Optional[int] = None,
+    max_tokens: Optional[int] = None
+) -> Tuple[Optional[str], List[Tuple[Any, Any]]]:
+    """
+    Split steps into a summary of older steps and a compressed recent window.
+    
+    The window starts with the last `window` steps and gives up its oldest
+    steps to the summary until summary and window fit in `max_tokens`. It
+    only starts at a model message (see message_group_starts), so parallel
+    tool calls are kept or summarized together, and the most recent message
+    is always kept. The window is compressed on its own, so
+    its first snapshot is sent in full rather than as a diff against a
+    summarized one.
+    
+    Args:
+        steps: All (AgentAction, observation) pairs of the run
+        window: Most recent steps kept verbatim (defaults to Config.SCRATCHPAD_WINDOW_STEPS)
+        max_tokens: Token ceiling for the scratchpad (defaults to Config.SCRATCHPAD_MAX_TOKENS)
+    
+    Returns:
+        Tuple of (summary text or None, compressed recent steps)
+    """
+    window = window or Config.SCRATCHPAD_WINDOW_STEPS
+    max_tokens = max_tokens or Config.SCRATCHPAD_MAX_TOKENS
+    
+    starts = message_group_starts(steps) or [0]
+    position = max(i for i, start in enumerate(starts) if start <= max(0, len(steps) - window))
+    while True:
+        split = starts[position]
+        summary = summarize_steps(steps[:split]) if split else None
+        recent = compress_steps(steps[split:], record=False)
+        tokens = estimate_steps_tokens(recent) + estimate_tokens(summary or "")
+        if tokens <= max_tokens or position == len(starts) - 1:
+            break
+        position += 1
+    
+    recent = compress_steps(steps[split:])
+    scratchpad_stats.record(estimate_steps_tokens(compress_steps(steps, record=False)), tokens, bool(split))
+    return summary, recent
+
+def build_scratchpad(steps: List[Tuple[Any, Any]]) -> List:
+    """
+    Format the agent's steps into scratchpad messages.
+    
+    Replaces format_to_tool_messages(compress_steps(steps)) in the agent
+    pipeline. With windowing on, older steps become one summary message
+    ahead of the recent tool calls and results.
+    
+    Args:
+        steps: All (AgentAction, observation) pairs of the run
+    
+    Returns:
+        Messages for the agent_scratchpad placeholder
+    """
+    from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+    from langchain_core.messages import HumanMessage
+    
+    if not Config.SCRATCHPAD_WINDOWING_ENABLED:
+        return format_to_tool_messages(compress_steps(steps))
+    
+    summary, recent = window_steps(steps)
+    messages = format_to_tool_messages(recent)
+    if summary:
+        messages.insert(0, HumanMessage(content=summary))
+    return messages
+
+def get_scratchpad_stats() -> Dict[str, Any]:
+    """Get scratchpad windowing totals for this process."""
+    return scratchpad_stats.get_stats()
@@ -0,0 +1,259 @@
+"""
+Batched answers to screening questions.
+Answers every open question on a page in one structured LLM call and fills the answers as one sequence of browser actions.
+"""
+
+import json
+import threading
+from typing import Optional, Dict, List, Tuple, Any
+from page_snapshot import PageSnapshot, PageElement, is_snapshot, parse_snapshot
+from form_filler import SNAPSHOT_TOOL, SELECT_ROLES, call_tool, fill_fields, get_user_value
+from playbooks import unmapped_fields
+from answer_cache import plan_cached_answers, remember_answers, match_option, format_answer
+from resume_parser import get_resume_profile
+from user_context import USER_DETAILS
+from logger_setup import get_application_logger
+from config import Config
+
+logger = get_application_logger()
+
+# Name of the agent tool that answers the questions on the current page
+SCREENING_TOOL = "answer_screening_questions"
+
+# Line that starts the question list in the model's input
+QUESTIONS_HEADER = "Questions (JSON):"
+
+ANSWERS_SCHEMA = {
+    "title": "screening_answers",
+    "description": "Answers to the screening questions of a job application page.",
+    "type": "object",
+    "properties": {
+        "answers": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer", "description": "Number of the question"},
+                    "answer": {
+                        "type": "string",
+                        "description": "The answer; for questions with options, one option exactly as written. "
+                                       "Empty if the candidate's details do not answer it.",
+                    },
+                },
+                "required": ["id", "answer"],
+            },
+        },
+    },
+    "required": ["answers"],
+}
+
+SCREENING_INSTRUCTIONS = """You answer screening questions on a job application for the candidate described below.
+Answer every question truthfully from the candidate's details only. For questions with options, reply with one of the options exactly as written. Keep free-text answers to one or two sentences in the first person. Leave the answer empty when the details do not support one; never invent facts."""
+
+# Work history fields sent to the model (descriptions are left out to keep the call small)
+EXPERIENCE_FIELDS = ("title", "company", "duration", "location")
+
+def candidate_background() -> Dict[str, Any]:
+    """
+    Collect the user details that ground screening answers.
+    
+    Returns:
+        Screening answers, work experience (falling back to the parsed resume)
+        and skills, as JSON-safe data
+    """
+    experience = USER_DETAILS.get("work_experience") or (get_resume_profile() or {}).get("experience") or []
+    return {
+        "screening_answers": {
+            key: format_answer(value) for key, value in USER_DETAILS.get("screening_answers", {}).items()
+        },
+        "work_experience": [
+            {field: entry[field] for field in EXPERIENCE_FIELDS if entry.get(field)} for entry in experience
+        ],
+        "skills": get_user_value("skills"),
+        "location": get_user_value("location"),
+        "notice_period": get_user_value("notice_period"),
+    }
+
+def build_screening_messages(snapshot: PageSnapshot, questions: List[PageElement]) -> List:
+    """
+    Build the single model call that answers a page's questions.
+    
+    Args:
+        snapshot: Snapshot the questions come from (for dropdown options)
+        questions: Question fields to answer
+    
+    Returns:
+        System and human messages
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
+    
+    items = []
+    for number, field in enumerate(questions, start=1):
+        item = {"id": number, "question": field.label}
+        options = snapshot.options_for(field) if field.role in SELECT_ROLES else []
+        if options:
+            item["options"] = options
+        items.append(item)
+    background = json.dumps(candidate_background(), ensure_ascii=False)
+    return [
+        SystemMessage(content=f"{SCREENING_INSTRUCTIONS}\n\nCandidate details (JSON):\n{background}"),
+        HumanMessage(content=f"{QUESTIONS_HEADER}\n{json.dumps(items, ensure_ascii=False)}"),
+    ]
+
+class ScreeningStats:
+    """Running totals of batched screening calls."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.questions = 0
+        self.answered = 0
+        self.failed_batches = 0
+    
+    def record(self, questions: int, answered: int, failed: bool = False):
+        """Add one batched call."""
+        with self._lock:
+            self.batches += 1
+            self.questions += questions
+            self.answered += answered
+            self.failed_batches += failed
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Return batch, question and answer counts."""
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "questions": self.questions,
+                "answered": self.answered,
+                "failed_batches": self.failed_batches,
+            }
+
+screening_stats = ScreeningStats()
+
+async def plan_batched_answers(
+    llm,
+    snapshot: PageSnapshot,
+    questions: List[PageElement]
+) -> Tuple[List[Tuple[PageElement, str]], List[PageElement]]:
+    """
+    Answer question fields with one structured LLM call.
+    
+    Dropdown answers must name one of the field's options; answers that do
+    not, and empty answers, leave the field to the agent.
+    
+    Args:
+        llm: Chat model that supports structured output
+        snapshot: Snapshot the questions come from
+        questions: Question fields to answer
+    
+    Returns:
+        Tuple of ((field, answer) pairs, fields left unanswered)
+    """
+    questions, overflow = questions[:Config.SCREENING_BATCH_MAX_QUESTIONS], questions[Config.SCREENING_BATCH_MAX_QUESTIONS:]
+    if not questions:
+        return [], []
+    try:
+        structured = llm.with_structured_output(ANSWERS_SCHEMA)
+        result = await structured.ainvoke(build_screening_messages(snapshot, questions))
+    except Exception as e:
+        logger.warning(f"Batched screening call failed, leaving {len(questions)} questions to the agent: {e}")
+        screening_stats.record(len(questions), 0, failed=True)
+        return [], questions + overflow
+    
+    answers = {}
+    for item in (result or {}).get("answers", []):
+        if isinstance(item, dict) and str(item.get("answer", "")).strip():
+            answers[item.get("id")] = str(item["answer"]).strip()
+    
+    plan, leftover = [], []
+    for number, field in enumerate(questions, start=1):
+        answer = answers.get(number)
+        options = snapshot.options_for(field) if field.role in SELECT_ROLES else []
+        if answer and options:
+            answer = match_option(answer, options)
+        if answer:
+            plan.append((field, answer))
+        else:
+            leftover.append(field)
+    screening_stats.record(len(questions), len(plan))
+    logger.info(f"Answered {len(plan)} of {len(questions)} screening questions in one call")
+    return plan, leftover + overflow
+
+async def answer_page_questions(
+    tools: List,
+    llm,
+    snapshot: PageSnapshot,
+    fields: Optional[List[PageElement]] = None
+) -> Tuple[List[PageElement], List[PageElement]]:
+    """
+    Answer and fill the open screening questions of the current page.
+    
+    Questions with a confident answer cache match are answered from the
+    cache; the rest go to the model in one batch. All answers are then
+    filled in one pass, and the model's answers are staged for the answer
+    cache (see answer_cache.staged_answers).
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        llm: Chat model for the batched call
+        snapshot: Current page snapshot
+        fields: Candidate fields (defaults to the page's fields without a standard mapping)
+    
+    Returns:
+        Tuple of (fields that were filled, question fields left unanswered)
+    """
+    questions = unmapped_fields(snapshot.form_fields if fields is None else fields)
+    plan = []
+    if Config.ANSWER_CACHE_ENABLED and questions:
+        plan, questions = plan_cached_answers(snapshot, questions)
+    batch_plan, unanswered = await plan_batched_answers(llm, snapshot, questions)
+    filled = await fill_fields(tools, plan + batch_plan)
+    filled_refs = {field.ref for field in filled}
+    if Config.ANSWER_CACHE_ENABLED:
+        remember_answers((field, answer) for field, answer in batch_plan if field.ref in filled_refs)
+    failed = [field for field, _ in plan + batch_plan if field.ref not in filled_refs]
+    return filled, unanswered + failed
+
+def create_screening_tool(tools: List, llm):
+    """
+    Build the agent tool that answers every open question on the current page.
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        llm: Chat model for the batched call
+    
+    Returns:
+        LangChain tool named SCREENING_TOOL
+    """
+    from langchain_core.tools import StructuredTool
+    
+    async def answer_screening_questions() -> str:
+        text = await call_tool(tools, SNAPSHOT_TOOL, {})
+        if not is_snapshot(text):
+            return "Error: could not read the current page."
+        filled, unanswered = await answer_page_questions(tools, llm, parse_snapshot(text))
+        parts = []
+        if filled:
+            parts.append("Filled: " + ", ".join(f'"{field.label or field.role}"' for field in filled) + ".")
+        if unanswered:
+            parts.append(
+                "Still unanswered, fill these yourself: "
+                + ", ".join(f'"{field.label or field.role}"' for field in unanswered) + "."
+            )
+        if not parts:
+            return "No open screening questions on this page."
+        # The page after filling, so the next turn does not need a separate snapshot
+        return " ".join(parts) + "\n" + await call_tool(tools, SNAPSHOT_TOOL, {})
+    
+    return StructuredTool.from_function(
+        coroutine=answer_screening_questions,
+        name=SCREENING_TOOL,
+        description=(
+            "Answer all open screening questions on the current page at once from the candidate's "
+            "details, and fill them in. Returns the fields filled, any left unanswered, and a new snapshot."
+        ),
+    )
+
+def get_screening_stats() -> Dict[str, int]:
+    """Get batched screening totals for this process."""
+    return screening_stats.get_stats()
@@ -0,0 +1,247 @@
+"""
+Tool-result compression for the agent scratchpad.
+Prunes page snapshots to form-relevant nodes and diffs them against the previous snapshot.
+"""
+
+import re
+import threading
+from typing import Optional, Dict, List, Tuple, Any
+from page_snapshot import ELEMENT_PATTERN, REF_PATTERN, URL_PATTERN, FORM_FIELD_ROLES, is_snapshot
+from token_counter import estimate_tokens
+from config import Config
+
+# Roles kept anywhere on the page
+KEPT_ROLES = FORM_FIELD_ROLES | {"button", "option", "alert", "alertdialog", "dialog", "heading", "iframe"}
+
+# Containers whose subtree is kept in full
+FORM_CONTAINER_ROLES = {"form", "dialog", "alertdialog"}
+
+# Wrapper roles that carry no information on their own
+WRAPPER_ROLES = {"generic", "none", "presentation", "group", "list", "listitem", "region", "section"}
+
+# Links worth keeping outside forms
+KEY_LINK_PATTERN = re.compile(r"apply|submit|next|continue|upload|attach|sign in|log ?in|review", re.I)
+
+# Text that must never be pruned (errors, confirmations, blockers)
+KEY_TEXT_PATTERN = re.compile(
+    r"captcha|error|required|invalid|success|thank you|submitted|received|sign in|log ?in|verify",
+    re.I
+)
+
+# Browser MCP refs carry the snapshot generation, e.g. 's3e14'
+GENERATION_REF_PATTERN = re.compile(r"^s(\d+)(e\d+)$")
+
+def _element_key(line: str) -> Tuple[str, str]:
+    """Identify an element line independently of its snapshot generation."""
+    ref_match = REF_PATTERN.search(line)
+    ref = ref_match.group(1) if ref_match else ""
+    generation_match = GENERATION_REF_PATTERN.match(ref)
+    return REF_PATTERN.sub("", line).rstrip(), generation_match.group(2) if generation_match else ref
+
+def _generation(text: str) -> Optional[str]:
+    """Return the snapshot generation prefix of the refs in a snapshot, e.g. 's3'."""
+    for ref in REF_PATTERN.findall(text):
+        match = GENERATION_REF_PATTERN.match(ref)
+        if match:
+            return f"s{match.group(1)}"
+    return None
+
+def prune_snapshot(text: str) -> str:
+    """
+    Reduce a page snapshot to the nodes needed to fill and submit a form.
+    
+    Everything inside form and dialog containers is kept except empty
+    wrappers. Elsewhere only form fields, buttons, headings, alerts and
+    apply/submit links survive, plus any text mentioning errors, CAPTCHAs or
+    confirmations. Pages without form fields keep all labelled links so the
+    agent can still find its way to the form. Lines that are not elements
+    (page URL, title, tool messages) are always kept.
+    
+    Args:
+        text: Raw snapshot tool output
+    
+    Returns:
+        Pruned snapshot text
+    """
+    lines = text.splitlines()
+    has_fields = any(
+        (match := ELEMENT_PATTERN.match(line)) and match.group("role") in FORM_FIELD_ROLES
+        for line in lines
+    )
+    
+    kept = []
+    container_depth = None
+    for line in lines:
+        match = ELEMENT_PATTERN.match(line)
+        if not match:
+            if line.strip():
+                kept.append(line)
+            continue
+        
+        role = match.group("role")
+        label = match.group("label") or ""
+        value = (match.group("value") or "").strip()
+        depth = len(match.group("indent"))
+        
+        if container_depth is not None and depth <= container_depth:
+            container_depth = None
+        if role in FORM_CONTAINER_ROLES and container_depth is None:
+            container_depth = depth
+            kept.append(line)
+            continue
+        
+        if container_depth is not None:
+            keep = role not in WRAPPER_ROLES or bool(label)
+        elif role in KEPT_ROLES:
+            keep = True
+        elif role == "link":
+            keep = bool(KEY_LINK_PATTERN.search(label)) or (not has_fields and bool(label))
+        else:
+            keep = bool(KEY_TEXT_PATTERN.search(f"{label} {value}"))
+        
+        if keep:
+            kept.append(line)
+    
+    return "\n".join(kept)
+
+def diff_snapshot(text: str, previous: str) -> Optional[str]:
+    """
+    Describe a snapshot as changes against the previous snapshot of the same page.
+    
+    Elements count as unchanged when their line is identical apart from the
+    snapshot generation in their ref, so the agent can keep using the same
+    ref numbers with the new prefix.
+    
+    Args:
+        text: Pruned snapshot
+        previous: Pruned previous snapshot
+    
+    Returns:
+        Diff text, or None when the page changed too much (or to a different URL)
+        for a diff to be useful
+    """
+    url = URL_PATTERN.search(text)
+    previous_url = URL_PATTERN.search(previous)
+    if not url or not previous_url or url.group(1).strip() != previous_url.group(1).strip():
+        return None
+    
+    previous_keys = {_element_key(line) for line in previous.splitlines() if ELEMENT_PATTERN.match(line)}
+    header, changed, unchanged_keys = [], [], set()
+    for line in text.splitlines():
+        if not ELEMENT_PATTERN.match(line):
+            header.append(line)
+        elif _element_key(line) in previous_keys:
+            unchanged_keys.add(_element_key(line))
+        else:
+            changed.append(line)
+    
+    if not unchanged_keys or len(changed) > len(unchanged_keys):
+        return None
+    
+    # An element whose ref number survives but whose line differs was changed, not removed
+    changed_refs = {_element_key(line)[1] for line in changed} - {""}
+    removed = [
+        line for line, ref in previous_keys - unchanged_keys
+        if ref not in changed_refs
+    ]
+    generation = _generation(text)
+    previous_generation = _generation(previous)
+    ref_note = (
+        f"unchanged elements keep their ref numbers with the new prefix {generation} "
+        f"(e.g. {previous_generation}e14 is now {generation}e14)"
+        if generation and previous_generation else "unchanged elements keep their refs"
+    )
+    
+    parts = [line for line in header if not line.startswith("```")]
+    parts.append(
+        f"[Snapshot diff: {len(unchanged_keys)} elements unchanged since the previous snapshot; {ref_note}.]"
+    )
+    if changed:
+        parts.append("Changed or new elements:")
+        parts.extend(changed)
+    if removed:
+        parts.append("Removed elements:")
+        parts.extend(sorted(line.strip() for line in removed))
+    if not changed and not removed:
+        parts.append("No changes.")
+    return "\n".join(parts)
+
+def truncate_observation(text: str, limit: int) -> str:
+    """Cap an observation at a number of characters, cutting at a line boundary."""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    cut = cut if cut > 0 else limit
+    omitted = text[cut:].count("\n") + 1
+    return f"{text[:cut]}\n[... {omitted} more lines omitted]"
+
+class CompressionStats:
+    """Running totals of tool-result characters received vs. sent to the LLM."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.raw_chars = 0
+        self.sent_chars = 0
+        self.raw_tokens = 0
+        self.sent_tokens = 0
+    
+    def record(self, raw: str, sent: str):
+        """Add one observation as it appears in a prompt."""
+        with self._lock:
+            self.raw_chars += len(raw)
+            self.sent_chars += len(sent)
+            self.raw_tokens += estimate_tokens(raw)
+            self.sent_tokens += estimate_tokens(sent)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return totals and savings in characters and estimated tokens."""
+        with self._lock:
+            return {
+                "raw_chars": self.raw_chars,
+                "sent_chars": self.sent_chars,
+                "chars_saved": self.raw_chars - self.sent_chars,
+                "tokens_saved": self.raw_tokens - self.sent_tokens,
+                "ratio": round(self.sent_chars / self.raw_chars, 3) if self.raw_chars else 1.0,
+            }
+
+compression_stats = CompressionStats()
+
+def compress_steps(intermediate_steps: List[Tuple[Any, Any]], record: bool = True) -> List[Tuple[Any, Any]]:
+    """
+    Compress snapshot observations before the steps are formatted into the prompt.
+    
+    The first snapshot of a page is pruned; later snapshots of the same page
+    are sent as diffs against the previous one. Every observation is capped
+    at Config.SNAPSHOT_MAX_CHARS. Non-snapshot observations pass through.
+    
+    Args:
+        intermediate_steps: (AgentAction, observation) pairs from the executor
+        record: Whether to count the observations in the compression stats
+            (off for trial compressions that are not sent)
+    
+    Returns:
+        Steps with compressed observations, in the same order
+    """
+    if not Config.SNAPSHOT_PRUNING_ENABLED:
+        return intermediate_steps
+    
+    compressed = []
+    previous = None
+    for action, observation in intermediate_steps:
+        if not isinstance(observation, str) or not is_snapshot(observation):
+            compressed.append((action, observation))
+            continue
+        
+        pruned = prune_snapshot(observation)
+        sent = (diff_snapshot(pruned, previous) if Config.SNAPSHOT_DIFF_ENABLED and previous else None) or pruned
+        sent = truncate_observation(sent, Config.SNAPSHOT_MAX_CHARS)
+        previous = pruned
+        
+        if record:
+            compression_stats.record(observation, sent)
+        compressed.append((action, sent))
+    return compressed
+
+def get_compression_stats() -> Dict[str, Any]:
+    """Get tool-result compression totals for this process."""
+    return compression_stats.get_stats()
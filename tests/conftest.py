@@ -0,0 +1,9 @@
+"""
+Shared pytest setup.
+Makes the top-level modules importable when pytest is run from any directory.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,103 @@
+"""
+Tests for dropdown option matching and cached screening answers.
+"""
+
+import pytest
+
+import answer_cache
+from answer_cache import AnswerCache, match_option
+from page_snapshot import PageElement
+
+YEARS = ["Less than 1 year", "1-2 years", "3-5 years", "6+ years"]
+
+@pytest.mark.parametrize("answer, options, expected", [
+    ("Yes", ["Yes", "No"], "Yes"),
+    ("no", ["Yes", "No"], "No"),
+    ("Yes", ["Yes, I am authorized", "No, I am not"], "Yes, I am authorized"),
+    ("Yes", ["Maybe", "Not sure"], None),
+    ("0.5", YEARS, "Less than 1 year"),
+    ("2", YEARS, "1-2 years"),
+    ("4", YEARS, "3-5 years"),
+    ("8", YEARS, "6+ years"),
+    ("10", ["5 or more", "Under 5"], "5 or more"),
+    ("Negotiable", ["Yes", "No"], None),
+])
+def test_match_option(answer, options, expected):
+    assert match_option(answer, options) == expected
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setitem(answer_cache.USER_DETAILS, "screening_answers", {
+        "authorized_to_work_us": True,
+        "require_visa_sponsorship_us": False,
+        "years_of_python_experience": 4,
+        "willing_to_relocate": True,
+    })
+    return AnswerCache(tmp_path / "screening_answers.json", threshold=0.75)
+
+def test_lookup_matches_a_reworded_question(cache):
+    hit = cache.lookup("Are you legally authorized to work in the United States?")
+    assert hit["answer"] == "Yes"
+    assert hit["source"] == "user_details"
+
+def test_lookup_answers_with_a_field_option(cache):
+    hit = cache.lookup("How many years of Python experience do you have?", ["0-1 years", "2-3 years", "4-5 years"])
+    assert hit["answer"] == "4-5 years"
+
+def test_lookup_skips_answers_of_the_wrong_type(cache):
+    # A Yes/No answer never answers a 'how many years' question
+    assert cache.lookup("How many years have you been willing to relocate?") is None
+
+def test_lookup_misses_unrelated_questions(cache):
+    assert cache.lookup("What is your favourite colour?") is None
+    assert cache.get_stats()["misses"] == 1
+
+def test_added_answers_are_saved_and_reloaded(cache, tmp_path):
+    cache.add("What is your expected salary?", "Negotiable")
+    assert cache.lookup("Expected salary?")["answer"] == "Negotiable"
+    
+    reloaded = AnswerCache(tmp_path / "screening_answers.json", threshold=0.75)
+    assert reloaded.lookup("What is your expected salary?")["source"] == "approved"
+
+def test_learned_answer_never_overrides_an_approved_one(cache):
+    cache.add("What is your expected salary?", "Negotiable")
+    cache.add("What is your expected salary?", "100k", confidence=0.5, source="learned")
+    assert cache.lookup("What is your expected salary?")["answer"] == "Negotiable"
+
+def test_learned_answer_never_competes_with_a_seed_answer(cache):
+    cache.add("How many years of Python experience do you have?", "3", confidence=0.9, source="learned")
+    cache.add("How many years of python experience do you have", "3", confidence=0.9, source="learned")
+    hit = cache.lookup("How many years of Python experience do you have?")
+    assert hit["answer"] == "4"
+    assert hit["source"] == "user_details"
+
+def test_candidates_are_ranked_by_confidence_weighted_score(cache):
+    # The exact but low-confidence match must not hide the approved near match
+    cache.threshold = 0.7
+    cache.add("What is your expected salary?", "Negotiable", confidence=0.5, source="learned")
+    cache.add("What is your expected salary in USD?", "100k")
+    assert cache.lookup("What is your expected salary?")["answer"] == "100k"
+
+def test_model_answers_are_stored_only_when_the_application_completes(cache, monkeypatch):
+    monkeypatch.setattr(answer_cache, "_answer_cache", cache)
+    monkeypatch.setattr(answer_cache, "build_value_index", lambda: {})
+    field = PageElement(ref="e1", role="textbox", label="What is your notice period?")
+    
+    with answer_cache.staged_answers("app-1"):
+        assert answer_cache.remember_answers([(field, "2 weeks")]) == 1
+    assert cache.get_stats()["pending"] == 1
+    assert answer_cache.settle_answers("app-1", completed=False) == 0
+    assert cache.lookup("What is your notice period?") is None
+    
+    with answer_cache.staged_answers("app-2"):
+        answer_cache.remember_answers([(field, "2 weeks")])
+    assert answer_cache.settle_answers("app-2", completed=True) == 1
+    hit = cache.lookup("What is your notice period?")
+    assert hit["answer"] == "2 weeks"
+    assert hit["source"] == "learned"
+
+def test_answers_outside_an_application_are_dropped(cache, monkeypatch):
+    monkeypatch.setattr(answer_cache, "_answer_cache", cache)
+    field = PageElement(ref="e1", role="textbox", label="What is your notice period?")
+    assert answer_cache.remember_answers([(field, "2 weeks")]) == 0
+    assert cache.get_stats()["pending"] == 0
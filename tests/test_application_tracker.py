@@ -0,0 +1,59 @@
+"""
+Tests for the tracker's running statistics.
+"""
+
+from datetime import datetime
+
+import pytest
+
+import application_tracker
+from application_tracker import ApplicationStatus, ApplicationTracker
+from tracker_storage import create_backend
+
+@pytest.mark.parametrize("kind", ["json", "sqlite"])
+def test_statistics_survive_a_reload(kind, tmp_path):
+    def open_tracker():
+        storage = create_backend(kind, tmp_path / "applications.json", tmp_path / "applications.db")
+        return ApplicationTracker(tmp_path / "applications.json", storage=storage)
+    
+    tracker = open_tracker()
+    for index in range(6):
+        url = f"https://boards.greenhouse.io/acme/jobs/{1000 + index}"
+        app_id = tracker.add_application(url, f"Acme {index % 2}", "Engineer")
+        tracker.increment_attempts(app_id)
+        if index % 3 == 0:
+            tracker.update_status(app_id, ApplicationStatus.COMPLETED)
+    expected = tracker.get_statistics()
+    tracker.save()
+    tracker.close()
+    
+    reloaded = open_tracker()
+    assert reloaded.get_statistics() == expected
+    assert expected["by_status"]["completed"] == 2
+    assert expected["by_company"] == {"Acme 0": 3, "Acme 1": 3}
+    assert expected["mean_attempts"] == 1.0
+    reloaded.close()
+
+@pytest.mark.parametrize("kind", ["json", "sqlite"])
+def test_completion_day_is_kept_by_later_updates(kind, tmp_path, monkeypatch):
+    class Clock(datetime):
+        today = datetime(2026, 3, 1, 23, 50)
+        
+        @classmethod
+        def now(cls, tz=None):
+            return cls.today
+    
+    monkeypatch.setattr(application_tracker, "datetime", Clock)
+    storage = create_backend(kind, tmp_path / "applications.json", tmp_path / "applications.db")
+    tracker = ApplicationTracker(tmp_path / "applications.json", storage=storage)
+    app_id = tracker.add_application("https://boards.greenhouse.io/acme/jobs/1", "Acme", "Engineer")
+    tracker.update_status(app_id, ApplicationStatus.COMPLETED)
+    
+    # The profile is written after midnight
+    Clock.today = datetime(2026, 3, 2, 0, 5)
+    tracker.update_metadata(app_id, {"profile": {"turns": 4}})
+    tracker.increment_attempts(app_id)
+    
+    assert tracker.get_statistics()["completed_by_day"] == {"2026-03-01": 1}
+    assert storage.aggregate(ApplicationStatus.COMPLETED.value)["completed_by_day"] == {"2026-03-01": 1}
+    tracker.close()
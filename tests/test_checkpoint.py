@@ -0,0 +1,110 @@
+"""
+Tests for step checkpoints.
+"""
+
+import pytest
+from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+from langchain.agents.output_parsers.tools import ToolAgentAction
+from langchain_core.agents import AgentAction
+from langchain_core.messages import AIMessage, ToolMessage
+
+from application_tracker import ApplicationTracker
+from checkpoint import Checkpointer, describe_resume, load_checkpoint, restore_steps, save_checkpoint
+from config import Config
+from tracker_storage import JsonJournalBackend
+
+def snapshot_step(url: str, field: str = "First Name"):
+    observation = f'- Page URL: {url}\n- Page Snapshot\n- textbox "{field}" [ref=s1e1]'
+    return AgentAction(tool="browser_snapshot", tool_input={}, log=""), observation
+
+def type_step(field: str):
+    action = AgentAction(tool="browser_type", tool_input={"element": field, "text": "Ada"}, log="")
+    return action, f"Typed into {field}"
+
+def parallel_steps(*fields):
+    """Steps for one model message typing into several fields at once."""
+    calls = [
+        {"name": "browser_type", "args": {"element": field, "text": "Ada"}, "id": f"call-{field}"}
+        for field in fields
+    ]
+    message = AIMessage(content="", tool_calls=calls)
+    return [
+        (ToolAgentAction(
+            tool=call["name"], tool_input=call["args"], log="", message_log=[message], tool_call_id=call["id"]
+        ), f"Typed into {call['args']['element']}")
+        for call in calls
+    ]
+
+@pytest.fixture
+def tracker(tmp_path):
+    history_file = tmp_path / "applications.json"
+    return ApplicationTracker(history_file, storage=JsonJournalBackend(history_file))
+
+@pytest.fixture
+def app_id(tracker):
+    return tracker.add_application("https://boards.greenhouse.io/acme/jobs/1", "Acme", "Engineer")
+
+def test_only_the_latest_snapshot_is_kept_in_full(tracker, app_id):
+    steps = [
+        snapshot_step("https://acme.com/apply"),
+        type_step("First Name"),
+        snapshot_step("https://acme.com/apply/2"),
+    ]
+    save_checkpoint(tracker, app_id, steps, attempt=1)
+    
+    checkpoint = load_checkpoint(tracker, app_id)
+    observations = [step["observation"] for step in checkpoint["steps"]]
+    assert observations[0] == "[Snapshot of https://acme.com/apply omitted from the checkpoint]"
+    assert "[ref=s1e1]" in observations[2]
+    assert checkpoint["page_url"] == "https://acme.com/apply/2"
+    assert checkpoint["filled_fields"] == ["First Name"]
+
+def test_restored_steps_resume_the_conversation(tracker, app_id):
+    steps = [snapshot_step("https://acme.com/apply"), type_step("Email")]
+    save_checkpoint(tracker, app_id, steps, attempt=2)
+    
+    checkpoint = load_checkpoint(tracker, app_id)
+    restored = restore_steps(checkpoint)
+    assert [action.tool for action, _ in restored] == ["browser_snapshot", "browser_type"]
+    assert "https://acme.com/apply" in describe_resume(checkpoint)
+
+def test_parallel_tool_calls_survive_truncation_and_resume(tracker, app_id, monkeypatch):
+    monkeypatch.setattr(Config, "CHECKPOINT_MAX_STEPS", 3)
+    steps = [snapshot_step("https://acme.com/apply")] + parallel_steps("First Name", "Last Name", "Email")
+    steps.append(type_step("Phone"))
+    save_checkpoint(tracker, app_id, steps, attempt=1)
+    
+    # Keeping the last 3 steps would split the message, so it is dropped whole
+    restored = restore_steps(load_checkpoint(tracker, app_id))
+    assert [action.tool_input["element"] for action, _ in restored] == ["Phone"]
+    
+    monkeypatch.setattr(Config, "CHECKPOINT_MAX_STEPS", 4)
+    save_checkpoint(tracker, app_id, steps, attempt=1)
+    restored = restore_steps(load_checkpoint(tracker, app_id))
+    assert len(restored) == 4
+    messages = format_to_tool_messages(restored)
+    requested = [call["id"] for message in messages if isinstance(message, AIMessage) for call in message.tool_calls]
+    answered = [message.tool_call_id for message in messages if isinstance(message, ToolMessage)]
+    assert requested == answered == ["call-First Name", "call-Last Name", "call-Email"]
+
+def test_checkpointer_writes_on_new_pages_and_every_interval(tracker, app_id, monkeypatch):
+    monkeypatch.setattr(Config, "CHECKPOINT_SAVE_INTERVAL", 3)
+    writes = []
+    monkeypatch.setattr("checkpoint.save_checkpoint", lambda *args: writes.append(len(args[2])))
+    checkpointer = Checkpointer(tracker, app_id, [], attempt=1)
+    
+    steps = [snapshot_step("https://acme.com/apply")]
+    checkpointer.on_step(steps)
+    assert writes == [1]
+    
+    for field in ("First Name", "Last Name", "Email"):
+        steps.append(type_step(field))
+        checkpointer.on_step(steps)
+    assert writes == [1, 4]
+    
+    steps.append(type_step("Phone"))
+    checkpointer.on_step(steps)
+    checkpointer.flush()
+    assert writes == [1, 4, 5]
+    checkpointer.flush()
+    assert writes == [1, 4, 5]
@@ -0,0 +1,147 @@
+"""
+Tests for async retries and per-domain circuit breakers.
+"""
+
+import asyncio
+
+import pytest
+
+import error_handler
+from error_handler import (
+    CircuitBreaker, CircuitOpenError, FormValidationError, NetworkError, TimeoutError, retry_async
+)
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(error_handler, "_circuit_breakers", {})
+
+def flaky(failures: int, error: Exception):
+    """Coroutine factory that fails a number of times before succeeding."""
+    calls = []
+    
+    async def call():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error
+        return "ok"
+    
+    return call, calls
+
+def test_retries_until_success():
+    call, calls = flaky(2, NetworkError("reset"))
+    waits = []
+    
+    result = asyncio.run(retry_async(call, max_attempts=3, initial_delay=0.001, on_wait=waits.append))
+    assert result == "ok"
+    assert len(calls) == 3
+    assert len(waits) == 2
+
+def test_normalizes_builtin_errors_and_gives_up():
+    call, calls = flaky(5, ConnectionResetError("reset"))
+    
+    with pytest.raises(NetworkError):
+        asyncio.run(retry_async(call, max_attempts=2, initial_delay=0.001))
+    assert len(calls) == 2
+
+def test_does_not_retry_validation_errors():
+    call, calls = flaky(5, FormValidationError("email is required"))
+    
+    with pytest.raises(FormValidationError):
+        asyncio.run(retry_async(call, max_attempts=3, initial_delay=0.001))
+    assert len(calls) == 1
+
+def test_time_budget_cuts_off_a_slow_attempt():
+    async def slow():
+        await asyncio.sleep(1)
+    
+    with pytest.raises(TimeoutError):
+        asyncio.run(retry_async(slow, max_attempts=1, time_budget=0.05))
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker("acme.com", failure_threshold=2, reset_timeout=60)
+    breaker.before_call()
+    breaker.record_failure(NetworkError("reset"))
+    breaker.before_call()
+    breaker.record_failure(NetworkError("reset"))
+    
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_breaker_ignores_errors_that_are_not_network_failures():
+    breaker = CircuitBreaker("acme.com", failure_threshold=1, reset_timeout=60)
+    breaker.before_call()
+    breaker.record_failure(FormValidationError("email is required"))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_breaker_lets_one_trial_through(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(error_handler.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("acme.com", failure_threshold=1, reset_timeout=30)
+    breaker.before_call()
+    breaker.record_failure(NetworkError("reset"))
+    
+    now[0] += 31
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+    breaker.before_call()
+
+def test_failed_trial_reopens_the_circuit(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(error_handler.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("acme.com", failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure(NetworkError("reset"))
+    
+    now[0] += 31
+    breaker.before_call()
+    breaker.record_failure(NetworkError("still down"))
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_concurrent_callers_wait_for_the_trial():
+    async def scenario():
+        breaker = error_handler.get_circuit_breaker("acme.com")
+        breaker.state = CircuitBreaker.OPEN
+        breaker.opened_at = 0.0
+        
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "ok"
+        
+        return await asyncio.gather(
+            *(retry_async(slow, max_attempts=1, domain="acme.com") for _ in range(3)),
+            return_exceptions=True
+        )
+    
+    results = asyncio.run(scenario())
+    assert results[0] == "ok"
+    assert all(isinstance(result, CircuitOpenError) for result in results[1:])
+    assert error_handler.get_circuit_breaker("acme.com").state == CircuitBreaker.CLOSED
+
+def test_cancelled_trial_frees_the_slot():
+    async def scenario():
+        breaker = error_handler.get_circuit_breaker("acme.com")
+        breaker.state = CircuitBreaker.OPEN
+        breaker.opened_at = 0.0
+        
+        async def hang():
+            await asyncio.sleep(10)
+        
+        task = asyncio.create_task(retry_async(hang, max_attempts=1, domain="acme.com"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return breaker
+    
+    breaker = asyncio.run(scenario())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
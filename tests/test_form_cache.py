@@ -0,0 +1,76 @@
+"""
+Tests for form fingerprints and the form mapping cache.
+"""
+
+import pytest
+from langchain_core.agents import AgentAction
+
+import form_cache
+from form_cache import FormMappingCache, fingerprint_form, learn_mapping, plan_from_mapping
+from page_snapshot import parse_snapshot
+
+def form(*elements: str):
+    lines = ["- Page URL: https://boards.greenhouse.io/acme/jobs/1"]
+    lines += [f"- {element} [ref=s{index}e{index}]" for index, element in enumerate(elements, start=1)]
+    return parse_snapshot("\n".join(lines)).form_fields
+
+FIELDS = form('textbox "First Name *"', 'textbox "Email"', 'combobox "Country"')
+
+def test_fingerprint_ignores_refs_values_and_label_noise():
+    same = form('textbox "first name"', 'textbox "Email"', 'combobox "Country:"')
+    same[1].value = "ada@example.com"
+    assert fingerprint_form(FIELDS, "greenhouse") == fingerprint_form(same, "greenhouse")
+
+@pytest.mark.parametrize("other", [
+    form('textbox "First Name"', 'textbox "Email"'),
+    form('textbox "First Name"', 'textbox "Email"', 'textbox "Country"'),
+    form('textbox "Email"', 'textbox "First Name"', 'combobox "Country"'),
+])
+def test_fingerprint_changes_with_the_layout(other):
+    assert fingerprint_form(FIELDS, "greenhouse") != fingerprint_form(other, "greenhouse")
+
+def test_fingerprint_includes_the_platform():
+    assert fingerprint_form(FIELDS, "greenhouse") != fingerprint_form(FIELDS, "lever")
+
+def test_least_recently_used_layout_is_evicted(tmp_path):
+    cache = FormMappingCache(tmp_path / "form_mappings.json", max_entries=2)
+    cache.put("a", {"first name": "first_name"})
+    cache.put("b", {"email": "email"})
+    assert cache.get("a") is not None
+    cache.put("c", {"country": "country"})
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == {"first name": "first_name"}
+    assert cache.get_stats()["entries"] == 2
+
+def test_recency_survives_a_reload(tmp_path):
+    cache = FormMappingCache(tmp_path / "form_mappings.json", max_entries=2)
+    cache.put("a", {"first name": "first_name"})
+    cache.put("b", {"email": "email"})
+    cache.get("a")
+    cache.save()
+    
+    reloaded = FormMappingCache(tmp_path / "form_mappings.json", max_entries=2)
+    reloaded.put("c", {"country": "country"})
+    assert reloaded.get("b") is None
+    assert reloaded.get("a") is not None
+
+def test_put_extends_an_existing_mapping(tmp_path):
+    cache = FormMappingCache(tmp_path / "form_mappings.json")
+    cache.put("a", {"first name": "first_name"})
+    cache.put("a", {"email": "email"})
+    assert cache.get("a") == {"first name": "first_name", "email": "email"}
+
+def test_learned_mapping_is_replayed(monkeypatch):
+    values = {"first_name": "Ada", "email": "ada@example.com"}
+    monkeypatch.setattr(form_cache, "build_value_index", lambda: {value.lower(): key for key, value in values.items()})
+    monkeypatch.setattr(form_cache, "get_user_value", values.get)
+    steps = [
+        (AgentAction(tool="browser_type", tool_input={"ref": "s9e1", "text": "Ada"}, log=""), "Typed"),
+        (AgentAction(tool="browser_type", tool_input={"ref": "s9e2", "text": "ada@example.com"}, log=""), "Typed"),
+    ]
+    mapping = learn_mapping(FIELDS, steps)
+    assert mapping == {"first name": "first_name", "email": "email"}
+    assert [(field.label, value) for field, value in plan_from_mapping(FIELDS, mapping)] == [
+        ("First Name *", "Ada"), ("Email", "ada@example.com"),
+    ]
@@ -0,0 +1,85 @@
+"""
+Tests for canonical job keys.
+"""
+
+import pytest
+
+from job_identity import canonicalize_job_url, detect_platform, infer_job_details, normalize_url
+
+@pytest.mark.parametrize("urls, key", [
+    (
+        [
+            "https://boards.greenhouse.io/acme/jobs/4012345",
+            "https://boards.greenhouse.io/acme/jobs/4012345?gh_src=abc123&utm_source=linkedin",
+            "https://boards.greenhouse.io/embed/job_app?for=acme&token=4012345",
+            "https://careers.acme.com/open-roles?gh_jid=4012345",
+        ],
+        "greenhouse:4012345",
+    ),
+    (
+        [
+            "https://jobs.lever.co/acme/5AC3F1D2-8B8E-4E1A-9C39-2E5D0B7F6A11",
+            "https://jobs.lever.co/acme/5ac3f1d2-8b8e-4e1a-9c39-2e5d0b7f6a11/apply?lever-source=LinkedIn",
+        ],
+        "lever:5ac3f1d2-8b8e-4e1a-9c39-2e5d0b7f6a11",
+    ),
+    (
+        [
+            "https://acme.wd1.myworkdayjobs.com/en-US/careers/job/Remote/Software-Engineer_R12345",
+            "https://acme.wd1.myworkdayjobs.com/careers/job/Remote/Software-Engineer_R12345/apply",
+            "https://acme.wd1.myworkdayjobs.com/de-DE/careers/details/Software-Engineer_R12345?source=indeed",
+        ],
+        "workday:acme:r12345",
+    ),
+    (
+        [
+            "https://www.linkedin.com/jobs/view/3791234567/",
+            "https://www.linkedin.com/jobs/view/software-engineer-at-acme-3791234567?trk=public_jobs",
+            "https://www.linkedin.com/jobs/search/?currentJobId=3791234567&geoId=103644278",
+        ],
+        "linkedin:3791234567",
+    ),
+])
+def test_url_variants_share_one_key(urls, key):
+    assert {canonicalize_job_url(url) for url in urls} == {key}
+
+def test_different_jobs_get_different_keys():
+    assert canonicalize_job_url("https://boards.greenhouse.io/acme/jobs/4012345") != \
+        canonicalize_job_url("https://boards.greenhouse.io/acme/jobs/4012346")
+    assert canonicalize_job_url("https://acme.wd1.myworkdayjobs.com/careers/job/Remote/Engineer_R1") != \
+        canonicalize_job_url("https://globex.wd1.myworkdayjobs.com/careers/job/Remote/Engineer_R1")
+
+def test_unknown_sites_fall_back_to_the_normalized_url():
+    key = canonicalize_job_url("https://www.acme.com//careers/engineer/?utm_campaign=x&id=7&ref=home#apply")
+    assert key == "url:acme.com/careers/engineer?id=7"
+    assert canonicalize_job_url("http://acme.com/careers/engineer?id=7") == key
+
+def test_normalize_url_sorts_the_remaining_parameters():
+    assert normalize_url("https://acme.com/jobs?b=2&a=1&fbclid=x") == "acme.com/jobs?a=1&b=2"
+
+@pytest.mark.parametrize("url, platform", [
+    ("https://boards.greenhouse.io/acme/jobs/1", "greenhouse"),
+    ("https://jobs.lever.co/acme/x", "lever"),
+    ("https://acme.wd5.myworkdayjobs.com/x", "workday"),
+    ("https://acme.taleo.net/careersection/jobdetail.ftl?job=123", "taleo"),
+    ("https://careers-acme.icims.com/jobs/1234/engineer/job", "icims"),
+    ("https://careers.acme.com/jobs/1", "custom"),
+])
+def test_detect_platform(url, platform):
+    assert detect_platform(url) == platform
+
+@pytest.mark.parametrize("title, url, details", [
+    ("Software Engineer at Acme Robotics", "https://boards.greenhouse.io/acme/jobs/1",
+     ("Acme Robotics", "Software Engineer")),
+    ("Job Application for Backend Engineer at Acme", "https://boards.greenhouse.io/acme/jobs/1",
+     ("Acme", "Backend Engineer")),
+    ("Acme hiring Data Scientist in London | LinkedIn", "https://www.linkedin.com/jobs/view/1",
+     ("Acme", "Data Scientist")),
+    # 'A - B' is ambiguous; the company in the URL decides which side it is
+    ("Platform Engineer - Acme Robotics", "https://jobs.lever.co/acme-robotics/abc",
+     ("Acme Robotics", "Platform Engineer")),
+    ("Senior Engineer | Careers", "https://careers.acme.com/roles/1", ("Acme", "Senior Engineer")),
+    ("", "https://example.org/jobs/1", ("Example", None)),
+])
+def test_infer_job_details(title, url, details):
+    assert infer_job_details(title, url) == details
@@ -0,0 +1,65 @@
+"""
+Tests for JSONL job parsing, duplicate policies and result lines.
+"""
+
+import json
+
+import pytest
+
+from application_tracker import ApplicationStatus, ApplicationTracker
+from job_queue import ResultWriter, check_duplicate, iter_jsonl_jobs
+from tracker_storage import JsonJournalBackend
+
+def test_jobs_are_parsed_line_by_line(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text("\n".join([
+        "# weekly batch",
+        '{"url": " https://boards.greenhouse.io/acme/jobs/1 ", "company": "Acme", "position": "Engineer"}',
+        "",
+        '"https://jobs.lever.co/globex/abc"',
+        "{not json",
+        '{"company": "No URL"}',
+        '{"url": 42}',
+        '{"url": "https://acme.wd1.myworkdayjobs.com/careers/job/R1", "company": ""}',
+    ]), encoding="utf-8")
+    
+    assert list(iter_jsonl_jobs(path)) == [
+        {"url": "https://boards.greenhouse.io/acme/jobs/1", "company": "Acme", "position": "Engineer", "line": 2},
+        {"url": "https://jobs.lever.co/globex/abc", "company": None, "position": None, "line": 4},
+        {"url": "https://acme.wd1.myworkdayjobs.com/careers/job/R1", "company": None, "position": None, "line": 8},
+    ]
+
+@pytest.fixture
+def tracker(tmp_path):
+    history_file = tmp_path / "applications.json"
+    return ApplicationTracker(history_file, storage=JsonJournalBackend(history_file))
+
+@pytest.mark.parametrize("status, policy, apply", [
+    (ApplicationStatus.COMPLETED, "skip", False),
+    (ApplicationStatus.FAILED, "skip", False),
+    (ApplicationStatus.COMPLETED, "retry-failed", False),
+    (ApplicationStatus.FAILED, "retry-failed", True),
+    (ApplicationStatus.COMPLETED, "reapply", True),
+])
+def test_duplicate_policies(tracker, status, policy, apply):
+    app_id = tracker.add_application("https://boards.greenhouse.io/acme/jobs/1", "Acme", "Engineer")
+    tracker.update_status(app_id, status)
+    
+    # Tracking parameters do not hide the duplicate
+    should_apply, existing = check_duplicate(tracker, "https://boards.greenhouse.io/acme/jobs/1?gh_src=li", policy)
+    assert should_apply is apply
+    assert existing["id"] == app_id
+
+def test_new_jobs_are_always_applied_to(tracker):
+    assert check_duplicate(tracker, "https://boards.greenhouse.io/acme/jobs/2", "skip") == (True, None)
+
+def test_results_are_appended_one_line_per_job(tmp_path):
+    path = tmp_path / "results.jsonl"
+    with ResultWriter(path) as writer:
+        writer.write({"url": "https://boards.greenhouse.io/acme/jobs/1", "status": "completed"})
+    with ResultWriter(path) as writer:
+        writer.write({"url": "https://jobs.lever.co/globex/abc", "status": "skipped"})
+    
+    results = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [result["status"] for result in results] == ["completed", "skipped"]
+    assert all("finished_at" in result for result in results)
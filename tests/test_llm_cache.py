@@ -0,0 +1,68 @@
+"""
+Tests for the LLM response cache.
+"""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from config import Config
+from llm_cache import LLMResponseCache, cache_key
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / "llm_cache.json"
+
+def ask(model, text: str) -> str:
+    return asyncio.run(model.ainvoke(text)).content
+
+def test_identical_calls_are_replayed(cache_file):
+    cache = LLMResponseCache(cache_file)
+    model = FakeListChatModel(responses=["first", "second"], cache=cache)
+    
+    assert ask(model, "Fill the form") == "first"
+    assert ask(model, "Fill the form") == "first"
+    assert cache.get_stats()["hits"] == 1
+
+def test_retries_replay_all_but_the_failing_turn(cache_file):
+    cache = LLMResponseCache(cache_file)
+    model = FakeListChatModel(responses=["open", "submit", "fill", "submit again"], cache=cache)
+    
+    async def attempt(fail: bool):
+        with cache.track_turns():
+            replies = [(await model.ainvoke(turn)).content for turn in ("Open the form", "Next step")]
+            if fail:
+                raise RuntimeError("Submit button not found")
+            return replies
+    
+    with pytest.raises(RuntimeError):
+        asyncio.run(attempt(fail=True))
+    # The first turn is replayed; the turn that led to the error asks the model again
+    assert asyncio.run(attempt(fail=False)) == ["open", "fill"]
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["evicted"] == 1
+
+def test_saves_in_batches_and_on_flush(cache_file, monkeypatch):
+    monkeypatch.setattr(Config, "LLM_CACHE_SAVE_INTERVAL", 3)
+    cache = LLMResponseCache(cache_file)
+    model = FakeListChatModel(responses=[str(index) for index in range(5)], cache=cache)
+    
+    for index in range(4):
+        ask(model, f"question {index}")
+    assert len(json.loads(cache_file.read_text(encoding="utf-8"))) == 3
+    
+    cache.flush()
+    assert len(json.loads(cache_file.read_text(encoding="utf-8"))) == 4
+    assert LLMResponseCache(cache_file).get_stats()["entries"] == 4
+
+def test_key_ignores_run_metadata():
+    prompt = '[{"kwargs": {"content": "hi", "id": "run-1", "usage_metadata": {"input_tokens": 3}}}]'
+    same = '[{"kwargs": {"content": "hi", "id": "run-2"}}]'
+    other = '[{"kwargs": {"content": "hello", "id": "run-1"}}]'
+    
+    assert cache_key(prompt, "model") == cache_key(same, "model")
+    assert cache_key(prompt, "model") != cache_key(other, "model")
+    assert cache_key(prompt, "model") != cache_key(prompt, "other model")
@@ -0,0 +1,64 @@
+"""
+Tests for log record truncation.
+"""
+
+import json
+import logging
+import sys
+
+import logger_setup
+from config import Config
+from logger_setup import JsonLinesFormatter, TruncatingQueueHandler, setup_logger
+
+def failing_record(message: str) -> logging.LogRecord:
+    def fail(depth: int):
+        if depth:
+            fail(depth - 1)
+        raise ValueError("the real error")
+    
+    try:
+        fail(40)
+    except ValueError:
+        exc_info = sys.exc_info()
+    return logging.LogRecord("test", logging.ERROR, __file__, 1, "%s", (message,), exc_info)
+
+def test_long_message_is_truncated_but_traceback_keeps_the_error(monkeypatch):
+    monkeypatch.setattr(Config, "LOG_MAX_MESSAGE_CHARS", 300)
+    handler = TruncatingQueueHandler(None)
+    
+    record = handler.prepare(failing_record("x" * 1000))
+    assert record.getMessage().startswith("x" * 300)
+    assert "[truncated 700 chars]" in record.getMessage()
+    assert record.exc_info is None
+    assert record.exc_text.startswith("[truncated ")
+    assert record.exc_text.endswith("ValueError: the real error")
+
+def test_formatters_render_the_kept_traceback(monkeypatch):
+    monkeypatch.setattr(Config, "LOG_MAX_MESSAGE_CHARS", 300)
+    record = TruncatingQueueHandler(None).prepare(failing_record("failed"))
+    
+    text = logging.Formatter("%(message)s").format(record)
+    assert text.startswith("failed\n")
+    assert text.endswith("ValueError: the real error")
+    
+    entry = json.loads(JsonLinesFormatter().format(record))
+    assert entry["msg"] == "failed"
+    assert entry["exc"].endswith("ValueError: the real error")
+
+def test_short_records_pass_through(monkeypatch):
+    monkeypatch.setattr(Config, "LOG_MAX_MESSAGE_CHARS", 300)
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "applied to %s", ("Acme",), None)
+    
+    prepared = TruncatingQueueHandler(None).prepare(record)
+    assert prepared.getMessage() == "applied to Acme"
+    assert prepared.exc_text is None
+
+def test_log_directory_is_created_on_the_first_record(tmp_path):
+    log_file = tmp_path / "logs" / "test.log"
+    logger = setup_logger("test_lazy_directory", log_file)
+    assert not log_file.parent.exists()
+    
+    logger.info("started")
+    listener = logger_setup._listeners.pop()
+    listener.stop()
+    assert "started" in log_file.read_text(encoding="utf-8")
@@ -0,0 +1,93 @@
+"""
+Tests for model tier routing and per-model usage accounting.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from langchain_core.agents import AgentAction
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+import model_router
+from model_router import (
+    FAST, RECOVERY, ROUTINE, SCREENING, STRONG, UNMAPPED_FIELDS,
+    ModelUsageCallbackHandler, RoutingStats, choose_tier,
+)
+
+def snapshot(*elements: str) -> str:
+    lines = ["- Page URL: https://acme.com/apply", "- Page Snapshot"]
+    lines += [f"- {element} [ref=s1e{index}]" for index, element in enumerate(elements, start=1)]
+    return "\n".join(lines)
+
+def step(tool: str, observation: str, **tool_input):
+    return AgentAction(tool=tool, tool_input=tool_input, log=""), observation
+
+STANDARD_FORM = snapshot('textbox "First Name"', 'textbox "Email"')
+CUSTOM_FORM = snapshot('textbox "First Name"', 'textbox "Why do you want to work at Acme?"')
+
+@pytest.mark.parametrize("phase, steps, expected", [
+    ("discovery", [], (FAST, ROUTINE)),
+    ("filling", [step("browser_snapshot", STANDARD_FORM)], (FAST, ROUTINE)),
+    ("filling", [step("browser_snapshot", CUSTOM_FORM)], (STRONG, UNMAPPED_FIELDS)),
+    ("screening", [step("browser_snapshot", CUSTOM_FORM)], (STRONG, SCREENING)),
+    ("filling", [step("browser_click", "Error: element not found", element="Next")], (STRONG, RECOVERY)),
+    ("submit", [
+        step("browser_click", "Clicked", element="Next"),
+        step("browser_click", "Clicked", element="Next"),
+    ], (STRONG, RECOVERY)),
+    ("submit", [
+        step("browser_click", "Clicked", element="Next"),
+        step("browser_click", "Clicked", element="Submit"),
+    ], (FAST, ROUTINE)),
+])
+def test_choose_tier(phase, steps, expected):
+    assert choose_tier(phase, steps) == expected
+
+@pytest.fixture
+def stats(monkeypatch):
+    stats = RoutingStats()
+    monkeypatch.setattr(model_router, "routing_stats", stats)
+    return stats
+
+def call(handler, response=None, error=None):
+    async def run():
+        run_id = uuid4()
+        await handler.on_chat_model_start({}, [[HumanMessage(content="Fill the form")]], run_id=run_id)
+        if error is not None:
+            await handler.on_llm_error(error, run_id=run_id)
+        else:
+            await handler.on_llm_end(response, run_id=run_id)
+    asyncio.run(run())
+
+def test_cost_uses_reported_usage_and_prices(stats):
+    handler = ModelUsageCallbackHandler(STRONG, "big-model", input_price=3.0, output_price=15.0)
+    usage = {"input_tokens": 2000, "output_tokens": 100, "total_tokens": 2100}
+    message = AIMessage(content="done", usage_metadata=usage)
+    call(handler, LLMResult(generations=[[ChatGeneration(message=message)]]))
+    call(handler, LLMResult(generations=[[ChatGeneration(message=message)]]))
+    
+    totals = stats.get_stats()["models"][STRONG]
+    assert totals["model"] == "big-model"
+    assert totals["calls"] == 2
+    assert totals["input_tokens"] == 4000
+    assert totals["output_tokens"] == 200
+    # (2000 x $3 + 100 x $15) per million tokens, twice
+    assert totals["cost"] == pytest.approx(2 * (2000 * 3.0 + 100 * 15.0) / 1_000_000)
+
+def test_failed_calls_cost_their_prompt(stats, monkeypatch):
+    monkeypatch.setattr(model_router, "estimate_prompt_tokens", lambda messages: 500)
+    handler = ModelUsageCallbackHandler(FAST, "small-model", input_price=0.2, output_price=0.8)
+    call(handler, error=TimeoutError("model timed out"))
+    
+    totals = stats.get_stats()["models"][FAST]
+    assert totals["input_tokens"] == 500
+    assert totals["output_tokens"] == 0
+    assert totals["cost"] == pytest.approx(500 * 0.2 / 1_000_000)
+
+def test_decisions_are_counted_per_tier_and_reason(stats):
+    stats.record_decision(STRONG, SCREENING)
+    stats.record_decision(STRONG, SCREENING)
+    stats.record_decision(FAST, ROUTINE)
+    assert stats.get_stats()["decisions"] == {"strong/screening": 2, "fast/routine": 1}
@@ -0,0 +1,64 @@
+"""
+Tests for confirmation, CAPTCHA and sign-in detection.
+"""
+
+import pytest
+from langchain_core.agents import AgentAction
+
+from error_handler import CaptchaError
+from outcome_detector import CAPTCHA, LOGIN_REQUIRED, SUBMITTED, OutcomeDetector, check_page, classify_page
+from page_snapshot import parse_snapshot
+
+def page(title: str, *elements: str) -> str:
+    lines = ["- Page URL: https://acme.com/apply", f"- Page Title: {title}"]
+    lines += [f"- {element} [ref=s1e{index}]" for index, element in enumerate(elements, start=1)]
+    return "\n".join(lines)
+
+CONFIRMATION = page("Acme Careers", 'heading "Thank you for applying!"', 'textbox "Email for job alerts"')
+LOGIN_WALL = page("Sign in", 'heading "Please sign in to continue"', 'textbox "Email"', 'textbox "Password"')
+CAPTCHA_INTERSTITIAL = page("Just a moment...", 'heading "Checking your browser before accessing acme.com"')
+CAPTCHA_IN_FORM = page(
+    "Apply",
+    'textbox "First Name"', 'textbox "Email"', 'checkbox "I\'m not a robot"', 'button "Submit application"',
+)
+CAPTCHA_ONLY_CHECKBOX = page("Security check", 'checkbox "I\'m not a robot"', 'button "Continue"')
+PASSIVE_BADGE = page("Apply", 'textbox "First Name"', 'text "This site is protected by reCAPTCHA"')
+THANK_YOU_WITH_FORM = page(
+    "Apply", 'text "Thank you for applying to Acme"', 'textbox "First Name"', 'textbox "Last Name"', 'textbox "Email"'
+)
+
+@pytest.mark.parametrize("observation, after_submit, outcome", [
+    (CONFIRMATION, False, SUBMITTED),
+    (LOGIN_WALL, False, LOGIN_REQUIRED),
+    (CAPTCHA_INTERSTITIAL, False, CAPTCHA),
+    (CAPTCHA_ONLY_CHECKBOX, False, CAPTCHA),
+    # A challenge checkbox next to fields still to fill does not stop the agent...
+    (CAPTCHA_IN_FORM, False, None),
+    # ...but it does when it is still there after the submit click
+    (CAPTCHA_IN_FORM, True, CAPTCHA),
+    (PASSIVE_BADGE, False, None),
+    (THANK_YOU_WITH_FORM, False, None),
+])
+def test_classify_page(observation, after_submit, outcome):
+    assert classify_page(parse_snapshot(observation), after_submit=after_submit) == outcome
+
+def test_detector_treats_a_submit_click_as_after_submit():
+    fill = AgentAction(tool="browser_type", tool_input={"element": "First Name", "text": "Ada"}, log="")
+    submit = AgentAction(tool="browser_click", tool_input={"element": "Submit application"}, log="")
+    
+    detector = OutcomeDetector()
+    assert detector.check(CAPTCHA_IN_FORM, fill) is None
+    assert detector.check(CAPTCHA_IN_FORM, submit) == CAPTCHA
+    assert isinstance(detector.error(), CaptchaError)
+
+def test_detector_keeps_the_first_outcome():
+    detector = OutcomeDetector()
+    assert detector.check("Typed into First Name") is None
+    assert detector.check(CONFIRMATION) == SUBMITTED
+    assert detector.check(LOGIN_WALL) == SUBMITTED
+    assert detector.describe().startswith("Application submitted")
+
+def test_prefill_check_only_raises_for_blocking_pages():
+    check_page(parse_snapshot(CAPTCHA_IN_FORM))
+    with pytest.raises(CaptchaError):
+        check_page(parse_snapshot(CAPTCHA_INTERSTITIAL))
@@ -0,0 +1,65 @@
+"""
+Tests for application phase detection.
+"""
+
+import pytest
+
+from phase_detector import detect_phase
+
+def page(*elements: str) -> str:
+    lines = ["- Page URL: https://acme.com/apply", "- Page Snapshot"]
+    lines += [f"- {element} [ref=s1e{index}]" for index, element in enumerate(elements, start=1)]
+    return "\n".join(lines)
+
+JOB_PAGE = page('heading "Software Engineer"', 'link "Apply for this job"')
+FORM_PAGE = page('textbox "First Name"', 'textbox "Last Name"', 'textbox "Email"', 'combobox "Are you over 18?"')
+SCREENING_PAGE = page(
+    'combobox "Are you authorized to work in the US?"',
+    'combobox "Will you require sponsorship?"',
+    'textbox "Notes"',
+)
+REVIEW_PAGE = page('heading "Review your application"', 'checkbox "I agree to the terms"', 'button "Submit"')
+
+@pytest.mark.parametrize("observation, phase", [
+    (JOB_PAGE, "discovery"),
+    (FORM_PAGE, "filling"),
+    (SCREENING_PAGE, "screening"),
+    (REVIEW_PAGE, "submit"),
+])
+def test_phase_of_the_latest_snapshot(observation, phase):
+    assert detect_phase([("browser_snapshot", observation)]) == phase
+
+def test_no_snapshot_yet_means_discovery():
+    assert detect_phase([]) == "discovery"
+    assert detect_phase([("browser_navigate", "Navigated")]) == "discovery"
+
+def test_later_tool_results_do_not_hide_the_last_snapshot():
+    steps = [
+        ("browser_snapshot", JOB_PAGE),
+        ("browser_click", FORM_PAGE),
+        ("browser_type", "Typed 'Ada' into First Name"),
+    ]
+    assert detect_phase(steps) == "filling"
+
+def test_review_page_with_many_fields_is_still_filling():
+    observation = page(
+        'heading "Review and submit"', 'textbox "First Name"', 'textbox "Last Name"', 'textbox "Email"'
+    )
+    assert detect_phase([("browser_snapshot", observation)]) == "filling"
+
+def test_radio_groups_count_once_as_questions():
+    observation = "\n".join([
+        "- Page URL: https://acme.com/apply",
+        '- radiogroup "Are you authorized to work in the US?" [ref=s1e1]',
+        '  - radio "Yes" [ref=s1e2]',
+        '  - radio "No" [ref=s1e3]',
+        '- radiogroup "Will you require sponsorship?" [ref=s1e4]',
+        '  - radio "Yes" [ref=s1e5]',
+        '  - radio "No" [ref=s1e6]',
+        '- textbox "Notes" [ref=s1e7]',
+    ])
+    assert detect_phase([("browser_snapshot", observation)]) == "screening"
+
+def test_radio_buttons_outside_a_group_are_fields():
+    observation = page('radio "Full-time"', 'radio "Part-time"', 'textbox "Start date?"')
+    assert detect_phase([("browser_snapshot", observation)]) == "filling"
@@ -0,0 +1,88 @@
+"""
+Tests for ATS playbook field mapping.
+"""
+
+import pytest
+
+import playbooks
+from page_snapshot import parse_snapshot
+from playbooks import get_playbook, unmapped_fields
+
+USER_VALUES = {
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+    "full_name": "Ada Lovelace",
+    "email": "ada@example.com",
+    "phone": "+1 555 0100",
+    "linkedin_url": "https://linkedin.com/in/ada",
+    "location": "London",
+    "school": "University of London",
+    "current_company": "Analytical Engines",
+}
+
+@pytest.fixture(autouse=True)
+def user_values(monkeypatch):
+    monkeypatch.setattr(playbooks, "get_user_value", lambda key: USER_VALUES.get(key, ""))
+
+def form(*elements: str):
+    lines = ["- Page URL: https://boards.greenhouse.io/acme/jobs/1"]
+    lines += [f"- {element} [ref=s1e{index}]" for index, element in enumerate(elements, start=1)]
+    return parse_snapshot("\n".join(lines)).form_fields
+
+def planned(platform: str, fields):
+    assignments, leftover = get_playbook(platform).plan(fields)
+    return {field.label: value for field, value in assignments}, [field.label for field in leftover]
+
+def test_greenhouse_maps_standard_fields():
+    fields = form(
+        'textbox "First Name *"', 'textbox "Last Name *"', 'textbox "Email *"', 'textbox "Phone"',
+        'textbox "LinkedIn Profile"', 'textbox "Location (City)"', 'combobox "School"',
+        'textbox "Why do you want to join Acme?"',
+    )
+    assignments, leftover = planned("greenhouse", fields)
+    assert assignments == {
+        "First Name *": "Ada",
+        "Last Name *": "Lovelace",
+        "Email *": "ada@example.com",
+        "Phone": "+1 555 0100",
+        "LinkedIn Profile": "https://linkedin.com/in/ada",
+        "Location (City)": "London",
+        "School": "University of London",
+    }
+    assert leftover == ["Why do you want to join Acme?"]
+
+def test_lever_maps_a_single_name_field_and_current_company():
+    assignments, leftover = planned("lever", form(
+        'textbox "Full name"', 'textbox "Email"', 'textbox "Current company"', 'textbox "Current location"',
+    ))
+    assert assignments == {
+        "Full name": "Ada Lovelace",
+        "Email": "ada@example.com",
+        "Current company": "Analytical Engines",
+        "Current location": "London",
+    }
+    assert leftover == []
+
+def test_fields_without_a_user_value_are_left_for_the_agent():
+    assignments, leftover = planned("greenhouse", form('textbox "GitHub"', 'textbox "Degree"'))
+    assert assignments == {}
+    assert leftover == ["GitHub", "Degree"]
+
+def test_filled_fields_are_skipped():
+    fields = form('textbox "First Name"', 'textbox "Email"')
+    fields[0].value = "Ada"
+    assignments, leftover = planned("greenhouse", fields)
+    assert assignments == {"Email": "ada@example.com"}
+    assert leftover == []
+
+def test_unknown_platforms_have_no_playbook():
+    assert get_playbook("workday") is None
+
+def test_unmapped_fields_are_the_open_questions():
+    fields = form(
+        'textbox "First Name"', 'combobox "Will you require sponsorship?"', 'checkbox "I agree"',
+        'textbox "Salary expectations"',
+    )
+    assert [field.label for field in unmapped_fields(fields)] == [
+        "Will you require sponsorship?", "Salary expectations",
+    ]
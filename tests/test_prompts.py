@@ -0,0 +1,46 @@
+"""
+Tests for per-platform and per-phase prompt assembly.
+"""
+
+import pytest
+
+import prompts
+from prompts import (
+    PHASES, SUBMIT_SECTION, SENSITIVE_QUESTIONS_SECTION, FIELD_MAPPING_SECTION, get_system_prompt
+)
+
+@pytest.fixture(autouse=True)
+def no_resume(monkeypatch):
+    monkeypatch.setattr(prompts, "build_resume_section", lambda: "")
+    prompts._assemble_prompt.cache_clear()
+    yield
+    prompts._assemble_prompt.cache_clear()
+
+@pytest.mark.parametrize("platform", [None, "greenhouse", "lever", "workday", "unknown"])
+@pytest.mark.parametrize("phase", PHASES + [None])
+def test_confirmation_rule_is_in_every_prompt(platform, phase):
+    # Single-page forms are submitted without ever reaching the submit phase
+    assert get_system_prompt(platform=platform, phase=phase).count(SUBMIT_SECTION) == 1
+
+@pytest.mark.parametrize("phase", PHASES + [None])
+def test_sensitive_question_rules_are_in_every_prompt(phase):
+    # Salary, work authorization and diversity questions can show up on any page
+    prompt = get_system_prompt(platform="greenhouse", phase=phase)
+    assert prompt.count(SENSITIVE_QUESTIONS_SECTION) == 1
+    assert "Salary Expectations" in prompt
+
+@pytest.mark.parametrize("phase", ["filling", "screening"])
+def test_question_phases_get_field_mapping_and_resume(phase, monkeypatch):
+    monkeypatch.setattr(prompts, "build_resume_section", lambda: "## Resume Highlights")
+    prompt = get_system_prompt(phase=phase)
+    assert FIELD_MAPPING_SECTION in prompt
+    assert "## Resume Highlights" in prompt
+    assert "## Answering Screening Questions" in prompt
+
+def test_phase_prompts_are_smaller_than_the_full_prompt():
+    full = get_system_prompt()
+    for phase in PHASES:
+        assert len(get_system_prompt(phase=phase)) < len(full)
+
+def test_navigation_mode_ignores_platform_and_phase():
+    assert get_system_prompt(mode="navigation", platform="lever", phase="submit") == prompts.NAVIGATION_PROMPT
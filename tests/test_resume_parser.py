@@ -0,0 +1,125 @@
+"""
+Tests for resume section parsing.
+"""
+
+import pytest
+
+from resume_parser import parse_education, parse_experience, parse_resume_text, parse_skills, split_sections
+
+RESUME = """Ada Lovelace
+London, UK | ada@example.com | +44 20 7946 0958
+linkedin.com/in/ada | github.com/ada
+
+Summary
+Engineer who writes programs for analytical engines.
+
+Experience
+Senior Engineer, Analytical Engines    Jan 2020 - Present
+London, UK
+• Built the first published algorithm
+for the engine
+• Led a team of four
+Engineer at Difference Co    Mar 2017 – Dec 2019
+- Wrote tables
+
+Education
+B.Sc. Mathematics, University of London    2013 - 2017
+London    GPA: 3.8 / 4.0
+
+Skills
+Languages: Python, C (C99, C11), Rust
+
+Projects
+Engine Notes
+• Annotated the translation
+Certifications:
+AWS Solutions Architect
+"""
+
+def test_lines_are_split_under_known_headings():
+    header, sections = split_sections(RESUME)
+    assert header[0] == "Ada Lovelace"
+    assert len(header) == 3
+    assert list(sections) == ["summary", "experience", "education", "skills", "projects", "certifications"]
+    assert sections["certifications"] == ["AWS Solutions Architect"]
+
+def test_heading_aliases_share_a_section():
+    _, sections = split_sections("Work History\nEngineer\nTechnical Skills:\nPython\nCORE COMPETENCIES\nSQL")
+    assert sections == {"experience": ["Engineer"], "skills": ["Python", "SQL"]}
+
+def test_experience_entries_start_at_each_date_range():
+    _, sections = split_sections(RESUME)
+    assert parse_experience(sections["experience"]) == [
+        {
+            "title": "Senior Engineer",
+            "company": "Analytical Engines",
+            "duration": "Jan 2020 - Present",
+            "location": "London, UK",
+            # The wrapped bullet line is joined onto the bullet it continues
+            "highlights": ["Built the first published algorithm for the engine", "Led a team of four"],
+        },
+        {
+            "title": "Engineer",
+            "company": "Difference Co",
+            "duration": "Mar 2017 - Dec 2019",
+            "location": "",
+            "highlights": ["Wrote tables"],
+        },
+    ]
+
+@pytest.mark.parametrize("line, gpa", [
+    ("London    GPA: 3.8 / 4.0", "3.8/4.0"),
+    ("London    CGPA 9.1", "9.1"),
+    ("London    CPI: 8.7/10", "8.7/10"),
+])
+def test_education_pulls_out_the_gpa(line, gpa):
+    education = parse_education(["B.Sc. Mathematics, University of London    2013 - 2017", line])
+    assert education == [{
+        "degree": "B.Sc. Mathematics",
+        "institution": "University of London",
+        "duration": "2013 - 2017",
+        "graduation_year": "2017",
+        "location": "London",
+        "gpa": gpa,
+        "details": [],
+    }]
+
+def test_education_without_an_end_year():
+    education = parse_education(["M.Sc. Physics, Imperial College    Sep 2023 - Present"])
+    assert education[0]["graduation_year"] == ""
+    assert education[0]["gpa"] == ""
+
+def test_skills_are_grouped_by_category():
+    assert parse_skills([
+        "Languages: Python, C (C99, C11), Rust",
+        "Cloud    AWS, GCP",
+        "FrameworksDjango, Flask",
+        "• Git, Docker",
+    ]) == {
+        "Languages": ["Python", "C (C99, C11)", "Rust"],
+        "Cloud": ["AWS", "GCP"],
+        "Frameworks": ["Django", "Flask"],
+        "Other": ["Git", "Docker"],
+    }
+
+def test_resume_text_is_parsed_into_every_section():
+    profile = parse_resume_text(RESUME)
+    assert profile["contact"] == {
+        "name": "Ada Lovelace",
+        "email": "ada@example.com",
+        "phone": "+44 20 7946 0958",
+        "links": ["linkedin.com/in/ada", "github.com/ada"],
+    }
+    assert profile["summary"] == "Engineer who writes programs for analytical engines."
+    assert [job["company"] for job in profile["experience"]] == ["Analytical Engines", "Difference Co"]
+    assert profile["education"][0]["gpa"] == "3.8/4.0"
+    assert profile["skills"] == {"Languages": ["Python", "C (C99, C11)", "Rust"]}
+    assert profile["projects"] == [{"name": "Engine Notes", "highlights": ["Annotated the translation"]}]
+    assert profile["achievements"] == []
+    assert profile["certifications"] == ["AWS Solutions Architect"]
+
+def test_text_without_headings_is_all_header():
+    profile = parse_resume_text("Ada Lovelace\nada@example.com")
+    assert profile["contact"]["email"] == "ada@example.com"
+    assert profile["experience"] == []
+    assert profile["skills"] == {}
@@ -0,0 +1,64 @@
+"""
+Tests for the windowed agent scratchpad.
+"""
+
+import itertools
+
+from langchain.agents.output_parsers.tools import ToolAgentAction
+from langchain_core.messages import AIMessage, ToolMessage
+
+from scratchpad import build_scratchpad, message_group_starts, summarize_steps, window_steps
+
+call_ids = itertools.count()
+
+def model_turn(*calls):
+    """Steps for one model message making the given (tool, args) calls in parallel."""
+    tool_calls = [
+        {"name": tool, "args": args, "id": f"call-{next(call_ids)}"}
+        for tool, args in calls
+    ]
+    message = AIMessage(content="", tool_calls=tool_calls)
+    return [
+        (ToolAgentAction(
+            tool=call["name"], tool_input=call["args"], log="", message_log=[message], tool_call_id=call["id"]
+        ), f"Done: {call['name']}")
+        for call in tool_calls
+    ]
+
+def typing(*labels):
+    return model_turn(*[("browser_type", {"element": label, "text": "Ada"}) for label in labels])
+
+def test_parallel_calls_form_one_group():
+    steps = typing("First Name") + typing("Last Name", "Email", "Phone") + typing("City")
+    assert message_group_starts(steps) == [0, 1, 4]
+
+def test_window_never_starts_inside_a_message():
+    steps = typing("First Name") + typing("Last Name", "Email", "Phone") + typing("City")
+    summary, recent = window_steps(steps, window=2, max_tokens=100000)
+    # A two-step window would split the parallel calls, so the whole message is kept
+    assert len(recent) == 4
+    assert "First Name" in summary
+
+def test_token_ceiling_keeps_the_latest_message_whole():
+    steps = typing("First Name") + typing("Last Name", "Email", "Phone")
+    summary, recent = window_steps(steps, window=10, max_tokens=1)
+    assert [action.tool_input["element"] for action, _ in recent] == ["Last Name", "Email", "Phone"]
+    assert summary.startswith("Summary of the 1 earlier steps")
+
+def test_every_tool_call_in_the_scratchpad_has_its_result(monkeypatch):
+    monkeypatch.setattr("config.Config.SCRATCHPAD_WINDOW_STEPS", 3)
+    steps = typing("First Name") + typing("Last Name", "Email", "Phone") + typing("City", "State")
+    messages = build_scratchpad(steps)
+    
+    requested = [call["id"] for message in messages if isinstance(message, AIMessage) for call in message.tool_calls]
+    answered = [message.tool_call_id for message in messages if isinstance(message, ToolMessage)]
+    assert requested == answered
+
+def test_summary_lists_filled_fields_and_errors():
+    steps = typing("First Name") + [(
+        ToolAgentAction(tool="browser_click", tool_input={"element": "Submit"}, log="", message_log=[], tool_call_id="x"),
+        "Error: element not found"
+    )]
+    summary = summarize_steps(steps)
+    assert '"First Name" = "Ada"' in summary
+    assert "browser_click: Error: element not found" in summary
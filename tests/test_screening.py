@@ -0,0 +1,121 @@
+"""
+Tests for batched screening answers.
+"""
+
+import asyncio
+
+import pytest
+
+import form_filler
+import screening
+from config import Config
+from page_snapshot import parse_snapshot
+from screening import QUESTIONS_HEADER, answer_page_questions, plan_batched_answers
+
+SNAPSHOT = parse_snapshot("\n".join([
+    "- Page URL: https://acme.com/apply",
+    '- combobox "Are you authorized to work in the US?" [ref=s1e1]',
+    '  - option "Yes, I am authorized"',
+    '  - option "No"',
+    '- combobox "Years of Python experience" [ref=s1e2]',
+    '  - option "0-2 years"',
+    '  - option "3-5 years"',
+    '  - option "6+ years"',
+    '- textbox "Why Acme?" [ref=s1e3]',
+    '- textbox "Security clearance level" [ref=s1e4]',
+]))
+QUESTIONS = SNAPSHOT.form_fields
+
+class StructuredModel:
+    """Chat model stand-in returning a fixed structured result."""
+    
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.messages = None
+    
+    def with_structured_output(self, schema):
+        return self
+    
+    async def ainvoke(self, messages):
+        self.messages = messages
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+def plan(llm, questions=QUESTIONS):
+    return asyncio.run(plan_batched_answers(llm, SNAPSHOT, questions))
+
+def labels(fields):
+    return [field.label for field in fields]
+
+def test_answers_are_mapped_by_question_number_and_options():
+    llm = StructuredModel({"answers": [
+        {"id": 1, "answer": "Yes"},
+        {"id": 2, "answer": "4"},
+        {"id": 3, "answer": "  I use Acme's products every day.  "},
+        {"id": 4, "answer": ""},
+    ]})
+    answered, leftover = plan(llm)
+    
+    assert [(field.label, answer) for field, answer in answered] == [
+        ("Are you authorized to work in the US?", "Yes, I am authorized"),
+        ("Years of Python experience", "3-5 years"),
+        ("Why Acme?", "I use Acme's products every day."),
+    ]
+    assert labels(leftover) == ["Security clearance level"]
+    # Dropdown options are sent with their question
+    assert '"options": ["0-2 years", "3-5 years", "6+ years"]' in llm.messages[1].content
+    assert llm.messages[1].content.startswith(QUESTIONS_HEADER)
+
+def test_answers_matching_no_option_are_left_to_the_agent():
+    llm = StructuredModel({"answers": [{"id": 1, "answer": "Maybe"}, {"id": 2, "answer": "lots"}]})
+    answered, leftover = plan(llm, QUESTIONS[:2])
+    assert answered == []
+    assert labels(leftover) == labels(QUESTIONS[:2])
+
+@pytest.mark.parametrize("result", [
+    None,
+    {},
+    {"answers": [{"id": 9, "answer": "Yes"}, "Yes", {"id": 1}]},
+])
+def test_malformed_results_leave_every_question(result):
+    answered, leftover = plan(StructuredModel(result))
+    assert answered == []
+    assert labels(leftover) == labels(QUESTIONS)
+
+def test_failed_call_leaves_every_question():
+    answered, leftover = plan(StructuredModel(error=ValueError("invalid JSON")))
+    assert answered == []
+    assert labels(leftover) == labels(QUESTIONS)
+
+def test_questions_beyond_the_batch_limit_are_not_sent(monkeypatch):
+    monkeypatch.setattr(Config, "SCREENING_BATCH_MAX_QUESTIONS", 2)
+    llm = StructuredModel({"answers": [{"id": 1, "answer": "No"}, {"id": 3, "answer": "Because"}]})
+    answered, leftover = plan(llm)
+    
+    assert [(field.label, answer) for field, answer in answered] == [("Are you authorized to work in the US?", "No")]
+    assert labels(leftover) == ["Years of Python experience", "Why Acme?", "Security clearance level"]
+
+def test_fill_results_are_tracked_by_ref_when_labels_repeat(monkeypatch):
+    # One question per past job, each with the same label
+    snapshot = parse_snapshot("\n".join([
+        "- Page URL: https://acme.com/apply",
+        '- textbox "Reason for leaving" [ref=s1e1]',
+        '- textbox "Reason for leaving" [ref=s1e2]',
+    ]))
+    remembered = []
+    
+    async def fill_field(tools, field, value):
+        return field.ref == "s1e1"
+    
+    monkeypatch.setattr(Config, "ANSWER_CACHE_ENABLED", True)
+    monkeypatch.setattr(form_filler, "fill_field", fill_field)
+    monkeypatch.setattr(screening, "plan_cached_answers", lambda snapshot, questions: ([], questions))
+    monkeypatch.setattr(screening, "remember_answers", lambda pairs: remembered.extend(pairs))
+    llm = StructuredModel({"answers": [{"id": 1, "answer": "Relocation"}, {"id": 2, "answer": "Layoffs"}]})
+    filled, unanswered = asyncio.run(answer_page_questions([], llm, snapshot))
+    
+    assert [field.ref for field in filled] == ["s1e1"]
+    assert [(field.ref, answer) for field, answer in remembered] == [("s1e1", "Relocation")]
+    assert [field.ref for field in unanswered] == ["s1e2"]
@@ -0,0 +1,96 @@
+"""
+Tests for snapshot pruning and diffing.
+"""
+
+from config import Config
+from snapshot_compressor import compress_steps, diff_snapshot, prune_snapshot, truncate_observation
+
+def snapshot(generation: int, first_name: str = "", extra: str = "") -> str:
+    s = f"s{generation}"
+    return "\n".join([
+        "- Page URL: https://acme.com/apply",
+        "- Page Title: Apply - Acme",
+        "- Page Snapshot",
+        "```yaml",
+        f"- generic [ref={s}e1]:",
+        f"  - navigation [ref={s}e2]:",
+        f'    - link "About us" [ref={s}e3]',
+        f'    - link "Apply now" [ref={s}e4]',
+        f'  - paragraph [ref={s}e5]: We are a great place to work',
+        f'  - paragraph [ref={s}e6]: This field is required',
+        f"  - form [ref={s}e7]:",
+        f"    - generic [ref={s}e8]:",
+        f'      - textbox "First Name" [ref={s}e9]: {first_name}'.rstrip(),
+        f'      - textbox "Email" [ref={s}e10]',
+        f'      - button "Submit application" [ref={s}e11]',
+        *([extra] if extra else []),
+        "```",
+    ])
+
+def test_prune_keeps_form_and_key_nodes():
+    pruned = prune_snapshot(snapshot(1))
+    
+    for kept in ("Page URL", 'link "Apply now"', "This field is required", 'textbox "First Name"',
+                 'button "Submit application"', "form [ref=s1e7]"):
+        assert kept in pruned
+    for dropped in ('link "About us"', "great place to work", "generic [ref=s1e8]", "navigation"):
+        assert dropped not in pruned
+
+def test_prune_keeps_labelled_links_on_pages_without_fields():
+    text = "\n".join([
+        "- Page URL: https://acme.com/jobs/1",
+        '- link "Engineering jobs" [ref=s1e1]',
+        "- paragraph [ref=s1e2]: Benefits",
+    ])
+    pruned = prune_snapshot(text)
+    assert 'link "Engineering jobs"' in pruned
+    assert "Benefits" not in pruned
+
+def test_diff_lists_only_changed_elements():
+    previous = prune_snapshot(snapshot(1))
+    current = prune_snapshot(snapshot(2, first_name="Ada"))
+    
+    diff = diff_snapshot(current, previous)
+    assert diff is not None
+    assert 'textbox "First Name" [ref=s2e9]: Ada' in diff
+    assert 'textbox "Email"' not in diff
+    assert "s1e14 is now s2e14" in diff
+    # The edited field is reported as changed, not as removed
+    assert "Removed elements" not in diff
+
+def test_diff_reports_removed_elements():
+    previous = prune_snapshot(snapshot(1, extra='      - alert "Email is invalid" [ref=s1e12]'))
+    current = prune_snapshot(snapshot(2))
+    
+    diff = diff_snapshot(current, previous)
+    assert "Removed elements:" in diff
+    assert 'alert "Email is invalid"' in diff
+
+def test_diff_refuses_a_different_page():
+    previous = prune_snapshot(snapshot(1))
+    current = prune_snapshot(snapshot(2)).replace("https://acme.com/apply", "https://acme.com/apply/step-2")
+    assert diff_snapshot(current, previous) is None
+
+def test_truncate_cuts_at_a_line_boundary():
+    text = "\n".join(f"line {i}" for i in range(100))
+    truncated = truncate_observation(text, 50)
+    
+    assert truncated.splitlines()[-1].startswith("[... ")
+    assert all(line.startswith("line ") for line in truncated.splitlines()[:-1])
+    assert truncate_observation("short", 50) == "short"
+
+def test_compress_steps_diffs_repeated_snapshots(monkeypatch):
+    monkeypatch.setattr(Config, "SNAPSHOT_PRUNING_ENABLED", True)
+    monkeypatch.setattr(Config, "SNAPSHOT_DIFF_ENABLED", True)
+    steps = [("snapshot", snapshot(1)), ("type", "Typed Ada"), ("snapshot", snapshot(2, first_name="Ada"))]
+    
+    compressed = compress_steps(steps, record=False)
+    assert [action for action, _ in compressed] == ["snapshot", "type", "snapshot"]
+    assert compressed[0][1] == prune_snapshot(snapshot(1))
+    assert compressed[1][1] == "Typed Ada"
+    assert compressed[2][1].count("[Snapshot diff:") == 1
+
+def test_compress_steps_is_a_no_op_when_disabled(monkeypatch):
+    monkeypatch.setattr(Config, "SNAPSHOT_PRUNING_ENABLED", False)
+    steps = [("snapshot", snapshot(1))]
+    assert compress_steps(steps, record=False) is steps
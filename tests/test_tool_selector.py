@@ -0,0 +1,61 @@
+"""
+Tests for phase-aware tool subsets.
+"""
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+from config import Config
+from prompts import PHASES
+from tool_selector import PHASE_TOOLS, ToolSelector, tools_for_phase
+
+def browser_tool(name: str) -> StructuredTool:
+    def run(element: str = "") -> str:
+        return name
+    return StructuredTool.from_function(run, name=name, description=f"Browser tool {name}")
+
+TOOLS = [browser_tool(name) for name in (
+    "browser_navigate", "browser_go_back", "browser_snapshot", "browser_click", "browser_type",
+    "browser_select_option", "browser_press_key", "browser_wait", "browser_file_upload", "custom_lookup",
+)]
+
+class FakeModel:
+    """Records the tool names each bind_tools call receives."""
+    
+    def bind_tools(self, tools):
+        return [tool.name for tool in tools]
+
+def names(tools):
+    return {tool.name for tool in tools}
+
+@pytest.mark.parametrize("phase", PHASES)
+def test_every_phase_keeps_core_and_unknown_tools(phase):
+    subset = names(tools_for_phase(TOOLS, phase))
+    assert {"browser_snapshot", "browser_click", "browser_wait", "custom_lookup"} <= subset
+
+def test_submit_phase_can_still_type():
+    # Review pages ask for e-signatures and corrections
+    assert "browser_type" in PHASE_TOOLS["submit"]
+    assert "browser_type" in names(tools_for_phase(TOOLS, "submit"))
+
+def test_phase_subsets():
+    assert "browser_navigate" in names(tools_for_phase(TOOLS, "discovery"))
+    assert "browser_type" not in names(tools_for_phase(TOOLS, "discovery"))
+    assert "browser_file_upload" in names(tools_for_phase(TOOLS, "filling"))
+    assert "browser_file_upload" not in names(tools_for_phase(TOOLS, "screening"))
+
+def test_unknown_phase_gets_every_tool():
+    assert tools_for_phase(TOOLS, "checkout") == TOOLS
+
+def test_selector_binds_the_phase_subset(monkeypatch):
+    monkeypatch.setattr(Config, "TOOL_SUBSETS_ENABLED", True)
+    selector = ToolSelector(FakeModel(), TOOLS)
+    
+    assert selector.model_for("submit") == [tool.name for tool in tools_for_phase(TOOLS, "submit")]
+    assert selector.model_for(None) == [tool.name for tool in TOOLS]
+    assert selector._tokens["discovery"] < selector.full_tokens
+
+def test_selector_binds_every_tool_when_subsets_are_off(monkeypatch):
+    monkeypatch.setattr(Config, "TOOL_SUBSETS_ENABLED", False)
+    selector = ToolSelector(FakeModel(), TOOLS)
+    assert selector.model_for("discovery") == [tool.name for tool in TOOLS]
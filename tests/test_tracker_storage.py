@@ -0,0 +1,149 @@
+"""
+Tests for the tracker storage backends.
+"""
+
+import json
+
+import pytest
+
+from config import Config
+from job_identity import canonicalize_job_url
+from tracker_storage import JsonJournalBackend, SQLiteBackend, migrate_json_to_sqlite
+
+def make_app(index: int, status: str = "pending") -> dict:
+    return {
+        "id": f"app{index}",
+        "url": f"https://boards.greenhouse.io/acme/jobs/{1000 + index}",
+        "company": "Acme",
+        "position": "Engineer",
+        "status": status,
+        "attempts": 0,
+        "metadata": {},
+        "errors": [],
+    }
+
+@pytest.fixture
+def history_file(tmp_path):
+    return tmp_path / "applications.json"
+
+@pytest.fixture(autouse=True)
+def no_early_compaction(monkeypatch):
+    monkeypatch.setattr(Config, "JOURNAL_COMPACTION_THRESHOLD", 1000)
+
+def journal_lines(history_file) -> list:
+    return history_file.with_suffix(".journal").read_text(encoding="utf-8").splitlines()
+
+def test_put_appends_one_journal_line(history_file):
+    backend = JsonJournalBackend(history_file)
+    backend.put(make_app(1))
+    backend.put(make_app(1, "completed"))
+    
+    lines = journal_lines(history_file)
+    assert len(lines) == 2
+    assert json.loads(lines[-1])["app"]["status"] == "completed"
+    assert not history_file.exists()
+
+def test_journal_replayed_over_snapshot(history_file):
+    backend = JsonJournalBackend(history_file)
+    backend.put(make_app(1))
+    backend.put(make_app(2))
+    backend.flush()
+    backend.put(make_app(2, "failed"))
+    backend.put(make_app(3))
+    
+    reloaded = JsonJournalBackend(history_file)
+    assert reloaded.count() == 3
+    assert reloaded.get("app2")["status"] == "failed"
+    assert reloaded.count_by_status() == {"pending": 2, "failed": 1}
+
+def test_torn_journal_line_is_skipped_and_compacted(history_file):
+    backend = JsonJournalBackend(history_file)
+    backend.put(make_app(1))
+    with open(history_file.with_suffix(".journal"), "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "app": {"id": "app2"')
+    
+    reloaded = JsonJournalBackend(history_file)
+    assert reloaded.count() == 1
+    # The damaged journal is folded into the snapshot before anything is appended to it
+    assert not history_file.with_suffix(".journal").exists()
+    assert set(json.loads(history_file.read_text(encoding="utf-8"))) == {"app1"}
+
+def test_compaction_after_threshold(history_file, monkeypatch):
+    monkeypatch.setattr(Config, "JOURNAL_COMPACTION_THRESHOLD", 3)
+    backend = JsonJournalBackend(history_file)
+    for index in range(3):
+        backend.put(make_app(index))
+    
+    assert not history_file.with_suffix(".journal").exists()
+    assert len(json.loads(history_file.read_text(encoding="utf-8"))) == 3
+    
+    backend.put(make_app(3))
+    assert len(journal_lines(history_file)) == 1
+
+def test_find_by_job_key_uses_canonical_url(history_file):
+    backend = JsonJournalBackend(history_file)
+    backend.put(make_app(1))
+    
+    variant = "https://boards.greenhouse.io/acme/jobs/1001?gh_src=abc&utm_source=linkedin"
+    app = backend.find_by_job_key(canonicalize_job_url(variant))
+    assert app is not None and app["id"] == "app1"
+
+def test_migration_imports_snapshot_and_journal(history_file, tmp_path):
+    backend = JsonJournalBackend(history_file)
+    backend.put(make_app(1))
+    backend.put(make_app(2))
+    backend.flush()
+    backend.put(make_app(2, "completed"))
+    
+    db = SQLiteBackend(tmp_path / "applications.db", migrate_from=history_file)
+    assert db.count() == 2
+    assert db.get("app2")["status"] == "completed"
+    assert db.count_by_status() == {"pending": 1, "completed": 1}
+    db.close()
+
+def test_migration_keeps_legacy_files_as_backup(history_file, tmp_path):
+    backend = JsonJournalBackend(history_file)
+    backend.put(make_app(1))
+    backend.flush()
+    backend.put(make_app(2))
+    
+    db = SQLiteBackend(tmp_path / "applications.db")
+    assert migrate_json_to_sqlite(history_file, db) == 2
+    
+    assert not history_file.exists()
+    assert not history_file.with_suffix(".journal").exists()
+    assert (tmp_path / "applications.json.migrated").exists()
+    assert (tmp_path / "applications.journal.migrated").exists()
+    db.close()
+
+def test_migration_never_compacts_a_damaged_journal(history_file, tmp_path, monkeypatch):
+    backend = JsonJournalBackend(history_file)
+    backend.put(make_app(1))
+    with open(history_file.with_suffix(".journal"), "a", encoding="utf-8") as f:
+        f.write('{"torn"')
+    
+    def fail_import(apps):
+        raise RuntimeError("disk full")
+    
+    db = SQLiteBackend(tmp_path / "applications.db")
+    monkeypatch.setattr(db, "put_many", fail_import)
+    with pytest.raises(RuntimeError):
+        migrate_json_to_sqlite(history_file, db)
+    
+    # A failed import leaves the JSON history exactly as it was
+    assert len(journal_lines(history_file)) == 2
+    assert not history_file.exists()
+    db.close()
+
+def test_migration_runs_only_into_an_empty_database(history_file, tmp_path):
+    backend = JsonJournalBackend(history_file)
+    backend.put(make_app(1))
+    
+    db_file = tmp_path / "applications.db"
+    SQLiteBackend(db_file, migrate_from=history_file).close()
+    backend = JsonJournalBackend(history_file)
+    backend.put(make_app(2))
+    
+    db = SQLiteBackend(db_file, migrate_from=history_file)
+    assert db.count() == 1
+    db.close()
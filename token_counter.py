@@ -0,0 +1,30 @@
+"""
+Token estimation helpers for prompt budgeting and reporting.
+Uses a character-based heuristic so no tokenizer download is required.
+"""
+
+import json
+from typing import Any
+
+# Average characters per token for English prose and JSON with common tokenizers
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a piece of text.
+    
+    Args:
+        text: Text to measure
+    
+    Returns:
+        Approximate token count
+    """
+    if not text:
+        return 0
+    return max(1, round(len(text) / CHARS_PER_TOKEN))
+
+def estimate_tokens_for_object(value: Any) -> int:
+    """Estimate the tokens needed to send a JSON-serializable value."""
+    if isinstance(value, str):
+        return estimate_tokens(value)
+    return estimate_tokens(json.dumps(value, ensure_ascii=False, default=str))
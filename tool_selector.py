@@ -0,0 +1,136 @@
+"""
+Phase-aware tool subsets for the agent's LLM calls.
+Binds only the browser tools the current application phase needs, so fewer tool schemas are sent on every turn.
+"""
+
+import threading
+from typing import Optional, Dict, List, Any
+from form_filler import NAVIGATE_TOOL, SNAPSHOT_TOOL, TYPE_TOOL, SELECT_TOOL, CLICK_TOOL
+from screening import SCREENING_TOOL
+from prompts import PHASES
+from token_counter import estimate_tokens_for_object
+from logger_setup import get_system_logger
+from config import Config
+
+logger = get_system_logger()
+
+GO_BACK_TOOL = "browser_go_back"
+PRESS_KEY_TOOL = "browser_press_key"
+WAIT_TOOL = "browser_wait"
+
+# Browser MCP tools bound in each phase; snapshot, click and wait are always available.
+# Submit keeps typing, since review pages often ask for an e-signature or flag a field to correct.
+CORE_TOOLS = {SNAPSHOT_TOOL, CLICK_TOOL, WAIT_TOOL}
+PHASE_TOOLS = {
+    "discovery": CORE_TOOLS | {NAVIGATE_TOOL, GO_BACK_TOOL},
+    "filling": CORE_TOOLS | {TYPE_TOOL, SELECT_TOOL, PRESS_KEY_TOOL, Config.BROWSER_UPLOAD_TOOL, SCREENING_TOOL},
+    "screening": CORE_TOOLS | {TYPE_TOOL, SELECT_TOOL, PRESS_KEY_TOOL, SCREENING_TOOL},
+    "submit": CORE_TOOLS | {NAVIGATE_TOOL, TYPE_TOOL},
+}
+
+# Every tool the subsets know about (Browser MCP tools plus the agent's own); others are bound in every phase
+KNOWN_TOOLS = {
+    NAVIGATE_TOOL, GO_BACK_TOOL, "browser_go_forward", SNAPSHOT_TOOL, CLICK_TOOL, "browser_hover",
+    TYPE_TOOL, SELECT_TOOL, PRESS_KEY_TOOL, WAIT_TOOL, "browser_get_console_logs",
+    "browser_screenshot", Config.BROWSER_UPLOAD_TOOL, SCREENING_TOOL,
+}
+
+def tools_for_phase(tools: List, phase: str) -> List:
+    """
+    Pick the tools to bind for an application phase.
+    
+    Tools this module does not know (e.g. from a different MCP server) are
+    kept in every phase, and an unknown phase gets every tool.
+    
+    Args:
+        tools: Tools loaded from the MCP session
+        phase: Phase from phase_detector.detect_phase
+    
+    Returns:
+        The subset of tools, in their original order
+    """
+    names = PHASE_TOOLS.get(phase)
+    if names is None:
+        return list(tools)
+    return [tool for tool in tools if tool.name in names or tool.name not in KNOWN_TOOLS]
+
+def schema_tokens(tools: List) -> int:
+    """Estimate the tokens the tools' JSON schemas add to a model call."""
+    from langchain_core.utils.function_calling import convert_to_openai_tool
+    
+    return sum(estimate_tokens_for_object(convert_to_openai_tool(tool)) for tool in tools)
+
+class ToolSubsetStats:
+    """Running totals of tool schema tokens per phase, with and without subsetting."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phases: Dict[str, Dict[str, int]] = {}
+    
+    def record(self, phase: str, full_tokens: int, sent_tokens: int):
+        """Add one turn's tool schemas."""
+        with self._lock:
+            totals = self.phases.setdefault(phase, {"turns": 0, "full_tokens": 0, "sent_tokens": 0})
+            totals["turns"] += 1
+            totals["full_tokens"] += full_tokens
+            totals["sent_tokens"] += sent_tokens
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return turns and estimated tokens saved, in total and per phase."""
+        with self._lock:
+            phases = {
+                phase: {"turns": totals["turns"], "tokens_saved": totals["full_tokens"] - totals["sent_tokens"]}
+                for phase, totals in self.phases.items()
+            }
+        return {
+            "turns": sum(totals["turns"] for totals in phases.values()),
+            "tokens_saved": sum(totals["tokens_saved"] for totals in phases.values()),
+            "phases": phases,
+        }
+
+tool_subset_stats = ToolSubsetStats()
+
+class ToolSelector:
+    """Chat model bound to each phase's tool subset, chosen per turn."""
+    
+    def __init__(self, llm, tools: List):
+        """
+        Bind the model once per phase.
+        
+        Args:
+            llm: Chat model that supports tool binding
+            tools: Tools loaded from the MCP session
+        """
+        self.tools = list(tools)
+        self.full_tokens = schema_tokens(self.tools)
+        self._all = llm.bind_tools(self.tools)
+        self._models = {}
+        self._tokens = {}
+        for phase in PHASES:
+            subset = tools_for_phase(self.tools, phase)
+            self._models[phase] = llm.bind_tools(subset)
+            self._tokens[phase] = schema_tokens(subset)
+    
+    def model_for(self, phase: Optional[str]):
+        """
+        Return the model bound to the tools of a phase.
+        
+        With Config.TOOL_SUBSETS_ENABLED off, or for an unknown phase, the
+        model is bound to every tool.
+        
+        Args:
+            phase: Phase of the next turn
+        
+        Returns:
+            Tool-bound chat model
+        """
+        if not Config.TOOL_SUBSETS_ENABLED or phase not in self._models:
+            return self._all
+        sent_tokens = self._tokens[phase]
+        tool_subset_stats.record(phase, self.full_tokens, sent_tokens)
+        logger.debug(f"Binding {phase} tools: ~{sent_tokens} of ~{self.full_tokens} schema tokens")
+        return self._models[phase]
+
+def get_tool_subset_stats() -> Dict[str, Any]:
+    """Get tool subset totals for this process."""
+    return tool_subset_stats.get_stats()
@@ -0,0 +1,521 @@
+"""
+Storage backends for the application tracker.
+Provides a JSON snapshot + journal backend and an indexed SQLite backend.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple, Iterator
+from pathlib import Path
+from logger_setup import get_application_logger
+from config import Config
+from job_identity import canonicalize_job_url
+
+logger = get_application_logger()
+
+def record_job_key(app: Dict) -> str:
+    """Return a record's canonical job key, deriving it from the URL for older records."""
+    return app.get("job_key") or canonicalize_job_url(app["url"])
+
+def completion_day(app: Dict) -> str:
+    """Day (YYYY-MM-DD) a completed record was completed; records from before completed_at use updated_at."""
+    return (app.get("completed_at") or app.get("updated_at") or "")[:10]
+
+class StorageBackend:
+    """Interface implemented by application record stores."""
+    
+    def get(self, app_id: str) -> Optional[Dict]:
+        """Return the record for an application ID, if any."""
+        raise NotImplementedError
+    
+    def put(self, app: Dict):
+        """Insert or replace a record (keyed by its 'id')."""
+        raise NotImplementedError
+    
+    def exists(self, app_id: str) -> bool:
+        """Check whether a record exists."""
+        return self.get(app_id) is not None
+    
+    def find_by_job_key(self, job_key: str) -> Optional[Dict]:
+        """Return the most recent record for a canonical job key, if any."""
+        raise NotImplementedError
+    
+    def find_by_status(self, status: str) -> List[Dict]:
+        """Return all records with the given status value."""
+        raise NotImplementedError
+    
+    def count(self) -> int:
+        """Return the total number of records."""
+        raise NotImplementedError
+    
+    def count_by_status(self) -> Dict[str, int]:
+        """Return the number of records per status value."""
+        raise NotImplementedError
+    
+    def iter_all(self) -> Iterator[Dict]:
+        """Iterate over every record."""
+        raise NotImplementedError
+    
+    def aggregate(self, completed_status: str) -> Dict:
+        """
+        Compute the tracker's running aggregates with one pass over every record.
+        
+        Args:
+            completed_status: Status value of completed applications
+        
+        Returns:
+            Dictionary with 'by_status', 'by_company', 'started_by_day' and
+            'completed_by_day' counts, and 'total_attempts'
+        """
+        totals = {"by_status": {}, "by_company": {}, "started_by_day": {}, "completed_by_day": {}, "total_attempts": 0}
+        
+        def add(key: str, value: str):
+            totals[key][value] = totals[key].get(value, 0) + 1
+        
+        for app in self.iter_all():
+            add("by_status", app["status"])
+            add("by_company", app.get("company", ""))
+            add("started_by_day", (app.get("created_at") or "")[:10])
+            if app["status"] == completed_status:
+                add("completed_by_day", completion_day(app))
+            totals["total_attempts"] += app.get("attempts", 0)
+        return totals
+    
+    def flush(self):
+        """Persist any buffered state."""
+    
+    def close(self):
+        """Release resources held by the backend."""
+
+def read_json_history(history_file: Path) -> Tuple[Dict, int, bool]:
+    """
+    Load a JSON history snapshot and replay its journal on top of it.
+    
+    Each journal line holds a full application record, so replaying is
+    idempotent and a torn final line from a crash is simply skipped.
+    Neither file is modified.
+    
+    Args:
+        history_file: Path to the JSON snapshot file
+    
+    Returns:
+        Tuple of (records by ID, journal entries replayed, whether any
+        journal line was corrupt)
+    """
+    data = {}
+    if history_file.exists():
+        try:
+            with open(history_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                logger.info(f"Loaded {len(data)} applications from history")
+        except Exception as e:
+            logger.error(f"Error loading history: {e}")
+            data = {}
+    
+    journal_file = history_file.with_suffix(".journal")
+    if not journal_file.exists():
+        return data, 0, False
+    
+    replayed = 0
+    damaged = False
+    with open(journal_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                app = entry["app"]
+                data[app["id"]] = app
+                replayed += 1
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                damaged = True
+                logger.warning(f"Skipping corrupt journal entry at line {line_number}: {e}")
+    
+    if replayed:
+        logger.info(f"Replayed {replayed} journal entries")
+    return data, replayed, damaged
+
+class JsonJournalBackend(StorageBackend):
+    """
+    In-memory store persisted as a JSON snapshot plus an append-only journal.
+    
+    Every mutation appends one full record to the journal. The journal is
+    folded into the snapshot after Config.JOURNAL_COMPACTION_THRESHOLD entries
+    or on flush(), and replayed on load.
+    """
+    
+    def __init__(self, history_file: Path, auto_save: bool = True):
+        """
+        Initialize the backend.
+        
+        Args:
+            history_file: Path to the JSON snapshot file
+            auto_save: Journal each mutation as it happens
+        """
+        self.history_file = Path(history_file)
+        # Mutations are appended here and folded into history_file on compaction
+        self.journal_file = self.history_file.with_suffix(".journal")
+        self.auto_save = auto_save
+        self._journal_entries = 0
+        self._journal_damaged = False
+        self._lock = threading.RLock()
+        self.applications = self._load_history()
+        # Canonical job key -> application ID
+        self._job_index = {}
+        for app in self.applications.values():
+            self._job_index[record_job_key(app)] = app["id"]
+        
+        # Appending after a torn line would corrupt the next entry, so fold it away now
+        if self._journal_damaged:
+            self.flush()
+    
+    def _load_history(self) -> Dict:
+        """Load the history snapshot and replay the journal on top of it."""
+        data, self._journal_entries, self._journal_damaged = read_json_history(self.history_file)
+        return data
+    
+    def _append_journal(self, app: Dict):
+        """Append the current state of one application to the journal."""
+        entry = {
+            "op": "put",
+            "ts": datetime.now().isoformat(),
+            "app": app
+        }
+        try:
+            with self._lock:
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    f.flush()
+                    if Config.JOURNAL_FSYNC:
+                        os.fsync(f.fileno())
+                self._journal_entries += 1
+                
+                if self._journal_entries >= Config.JOURNAL_COMPACTION_THRESHOLD:
+                    self.flush()
+        except Exception as e:
+            logger.error(f"Error writing journal: {e}")
+    
+    def get(self, app_id: str) -> Optional[Dict]:
+        return self.applications.get(app_id)
+    
+    def put(self, app: Dict):
+        with self._lock:
+            self.applications[app["id"]] = app
+            self._job_index[record_job_key(app)] = app["id"]
+            if self.auto_save:
+                self._append_journal(app)
+    
+    def exists(self, app_id: str) -> bool:
+        return app_id in self.applications
+    
+    def find_by_job_key(self, job_key: str) -> Optional[Dict]:
+        app_id = self._job_index.get(job_key)
+        return self.applications.get(app_id) if app_id else None
+    
+    def find_by_status(self, status: str) -> List[Dict]:
+        return [
+            app for app in self.applications.values()
+            if app["status"] == status
+        ]
+    
+    def count(self) -> int:
+        return len(self.applications)
+    
+    def count_by_status(self) -> Dict[str, int]:
+        counts = {}
+        for app in self.applications.values():
+            counts[app["status"]] = counts.get(app["status"], 0) + 1
+        return counts
+    
+    def iter_all(self) -> Iterator[Dict]:
+        return iter(list(self.applications.values()))
+    
+    def flush(self):
+        """Compact the journal into a fresh history snapshot."""
+        try:
+            with self._lock:
+                # Write to a temp file and swap so a crash never leaves a partial snapshot
+                tmp_file = self.history_file.with_suffix(".json.tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.applications, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.history_file)
+                
+                # Journal entries are now covered by the snapshot
+                if self.journal_file.exists():
+                    self.journal_file.unlink()
+                self._journal_entries = 0
+            logger.info(f"Saved {len(self.applications)} applications to history")
+        except Exception as e:
+            logger.error(f"Error saving history: {e}")
+
+class SQLiteBackend(StorageBackend):
+    """
+    SQLite store that keeps records on disk and answers queries through indexes.
+    
+    Only the rows a query needs are loaded, so memory use and lookup time do
+    not grow with the size of the history.
+    """
+    
+    # Columns stored as JSON text
+    JSON_COLUMNS = ("metadata", "errors")
+    COLUMNS = (
+        "id", "url", "job_key", "company", "position", "status",
+        "created_at", "updated_at", "completed_at", "attempts", "metadata", "errors"
+    )
+    
+    def __init__(
+        self,
+        db_file: Path,
+        auto_save: bool = True,
+        migrate_from: Optional[Path] = None
+    ):
+        """
+        Initialize the backend.
+        
+        Args:
+            db_file: Path to the SQLite database file
+            auto_save: Commit after every mutation
+            migrate_from: JSON history file imported when the database is empty
+        """
+        self.db_file = Path(db_file)
+        self.auto_save = auto_save
+        self._lock = threading.RLock()
+        # Batch workers may share one tracker, so allow use across threads under our lock
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        
+        if migrate_from is not None and self.count() == 0:
+            migrate_json_to_sqlite(Path(migrate_from), self)
+    
+    def _create_schema(self):
+        """Create the applications table and its indexes."""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS applications (
+                    id TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    job_key TEXT,
+                    company TEXT,
+                    position TEXT,
+                    status TEXT NOT NULL,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    completed_at TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    metadata TEXT NOT NULL DEFAULT '{}',
+                    errors TEXT NOT NULL DEFAULT '[]'
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_url ON applications(url)")
+            self._upgrade_schema()
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_job_key ON applications(job_key)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_company ON applications(company)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_created_at ON applications(created_at)")
+    
+    def _upgrade_schema(self):
+        """Add the job_key and completed_at columns to databases created before they existed."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(applications)")}
+        if "completed_at" not in columns:
+            self._conn.execute("ALTER TABLE applications ADD COLUMN completed_at TEXT")
+        if "job_key" in columns:
+            return
+        
+        self._conn.execute("ALTER TABLE applications ADD COLUMN job_key TEXT")
+        rows = self._conn.execute("SELECT id, url FROM applications").fetchall()
+        self._conn.executemany(
+            "UPDATE applications SET job_key = ? WHERE id = ?",
+            [(canonicalize_job_url(row["url"]), row["id"]) for row in rows]
+        )
+        logger.info(f"Added job keys to {len(rows)} existing applications")
+    
+    def _row_to_app(self, row: sqlite3.Row) -> Dict:
+        """Convert a database row into an application record."""
+        app = dict(row)
+        for column in self.JSON_COLUMNS:
+            app[column] = json.loads(app[column]) if app[column] else ({} if column == "metadata" else [])
+        return app
+    
+    def _commit(self):
+        """Commit the pending transaction if auto-save is enabled."""
+        if self.auto_save:
+            self._conn.commit()
+    
+    def get(self, app_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM applications WHERE id = ?", (app_id,)
+            ).fetchone()
+        return self._row_to_app(row) if row else None
+    
+    def put(self, app: Dict):
+        self.put_many([app])
+    
+    def put_many(self, apps: List[Dict]):
+        """Insert or replace several records in one transaction."""
+        rows = []
+        for app in apps:
+            row = [app.get(column) for column in self.COLUMNS]
+            row[self.COLUMNS.index("metadata")] = json.dumps(app.get("metadata") or {}, ensure_ascii=False)
+            row[self.COLUMNS.index("errors")] = json.dumps(app.get("errors") or [], ensure_ascii=False)
+            row[self.COLUMNS.index("attempts")] = app.get("attempts") or 0
+            row[self.COLUMNS.index("job_key")] = record_job_key(app)
+            rows.append(row)
+        
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO applications ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+            self._commit()
+    
+    def exists(self, app_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM applications WHERE id = ?", (app_id,)
+            ).fetchone()
+        return row is not None
+    
+    def find_by_job_key(self, job_key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM applications WHERE job_key = ? ORDER BY created_at DESC LIMIT 1",
+                (job_key,)
+            ).fetchone()
+        return self._row_to_app(row) if row else None
+    
+    def find_by_status(self, status: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM applications WHERE status = ? ORDER BY created_at", (status,)
+            ).fetchall()
+        return [self._row_to_app(row) for row in rows]
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+    
+    def count_by_status(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM applications GROUP BY status"
+            ).fetchall()
+        return {row[0]: row[1] for row in rows}
+    
+    def aggregate(self, completed_status: str) -> Dict:
+        # Grouped in SQL so startup does not load every record
+        def grouped(expression: str, where: str = "", params: tuple = ()) -> Dict[str, int]:
+            rows = self._conn.execute(
+                f"SELECT {expression}, COUNT(*) FROM applications {where} GROUP BY 1", params
+            ).fetchall()
+            return {row[0]: row[1] for row in rows}
+        
+        with self._lock:
+            return {
+                "by_status": self.count_by_status(),
+                "by_company": grouped("company"),
+                "started_by_day": grouped("substr(COALESCE(created_at, ''), 1, 10)"),
+                "completed_by_day": grouped(
+                    "substr(COALESCE(completed_at, updated_at, ''), 1, 10)", "WHERE status = ?", (completed_status,)
+                ),
+                "total_attempts": self._conn.execute(
+                    "SELECT COALESCE(SUM(attempts), 0) FROM applications"
+                ).fetchone()[0],
+            }
+    
+    def iter_all(self) -> Iterator[Dict]:
+        # Fetch in pages so large histories are never materialized at once
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, * FROM applications WHERE rowid > ? ORDER BY rowid LIMIT 500",
+                    (last_rowid,)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                last_rowid = row["rowid"]
+                app = self._row_to_app(row)
+                app.pop("rowid", None)
+                yield app
+    
+    def flush(self):
+        with self._lock:
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+def migrate_json_to_sqlite(history_file: Path, backend: SQLiteBackend) -> int:
+    """
+    Import a JSON history (including any pending journal) into SQLite.
+    
+    The JSON files are only read during the import. Once it has been
+    committed they are renamed with a '.migrated' suffix, so they are kept
+    as a backup but never imported again.
+    
+    Args:
+        history_file: Path to the JSON snapshot file
+        backend: Target SQLite backend
+    
+    Returns:
+        Number of applications imported
+    """
+    journal_file = history_file.with_suffix(".journal")
+    if not history_file.exists() and not journal_file.exists():
+        return 0
+    
+    data, _replayed, _damaged = read_json_history(history_file)
+    apps = list(data.values())
+    if apps:
+        backend.put_many(apps)
+        backend.flush()
+    logger.info(f"Migrated {len(apps)} applications from {history_file} to {backend.db_file}")
+    
+    for legacy_file in (history_file, journal_file):
+        if legacy_file.exists():
+            os.replace(legacy_file, legacy_file.with_name(legacy_file.name + ".migrated"))
+    return len(apps)
+
+def create_backend(
+    kind: Optional[str] = None,
+    history_file: Optional[Path] = None,
+    db_file: Optional[Path] = None
+) -> StorageBackend:
+    """
+    Create the storage backend selected in the configuration.
+    
+    Args:
+        kind: 'json' or 'sqlite' (defaults to Config.TRACKER_BACKEND)
+        history_file: JSON history file (defaults to Config.APPLICATION_HISTORY_FILE)
+        db_file: SQLite database file (defaults to Config.APPLICATION_DB_FILE)
+    
+    Returns:
+        Storage backend instance
+    """
+    kind = (kind or Config.TRACKER_BACKEND).lower()
+    history_file = Path(history_file or Config.APPLICATION_HISTORY_FILE)
+    
+    if kind == "sqlite":
+        return SQLiteBackend(
+            db_file or Config.APPLICATION_DB_FILE,
+            auto_save=Config.AUTO_SAVE_PROGRESS,
+            migrate_from=history_file
+        )
+    if kind == "json":
+        return JsonJournalBackend(history_file, auto_save=Config.AUTO_SAVE_PROGRESS)
+    
+    raise ValueError(f"Unknown tracker backend: {kind}")
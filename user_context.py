@@ -219,6 +219,5 @@ def validate_user_details():
     
     return len(missing_fields) == 0
 
-# Validate on import
-if __name__ != "__main__":
+if __name__ == "__main__":
     validate_user_details()